@@ -1,7 +1,10 @@
+from node.behaviors import ArrayStorage
 from node.behaviors import AsAttrAccess
 from node.behaviors import Attributes
 from node.behaviors import DefaultInit
 from node.behaviors import DictStorage
+from node.behaviors import HAMTStorage
+from node.behaviors import Immutable
 from node.behaviors import ListStorage
 from node.behaviors import MappingAdopt
 from node.behaviors import MappingConstraints
@@ -62,6 +65,124 @@ class ListNode(object):
 
     Uses ``list`` as sequence implementation.
     """
+    batch_extend = True
+
+
+@plumbing(
+    DefaultInit,
+    SequenceNode,
+    ArrayStorage)
+class ArrayNode(object):
+    """Sequence node for primitive numeric values.
+
+    Uses ``array.array`` as sequence implementation.
+    """
+
+
+@plumbing(
+    Immutable,
+    DefaultInit,
+    MappingNode,
+    HAMTStorage)
+class ImmutableNode(object):
+    """Immutable node, not ordered.
+
+    Uses ``node.behaviors.HAMT`` as mapping implementation.
+    """
+
+
+###############################################################################
+# Slotted nodes
+###############################################################################
+
+class NodeSlots(object):
+    """Base class for nodes without instance ``__dict__``.
+
+    Defines ``__slots__`` for the attributes set on node instances by the
+    behaviors of ``BaseNode``, ``OrderedNode`` and ``ListNode``. Plumbed
+    subclasses must define ``__slots__`` for any further instance attribute
+    set by additional behaviors.
+    """
+    __slots__ = ('__name__', '__parent__', '_storage', '__weakref__')
+
+
+class _NodeSlots(NodeSlots):
+    """Additional slots for ``Nodespaces`` and ``MappingReference`` behaviors.
+
+    Slots cannot have class level defaults, thus the defaults these behaviors
+    expect are set on instance creation.
+    """
+    __slots__ = ('_nodespaces', '_index', '_uuid', '_iuuid')
+
+    def __new__(cls, *args, **kw):
+        self = super(_NodeSlots, cls).__new__(cls)
+        self._nodespaces = None
+        self._uuid = None
+        self._iuuid = None
+        return self
+
+
+@plumbing(
+    MappingConstraints,
+    MappingAdopt,
+    AsAttrAccess,
+    DefaultInit,
+    MappingNode,
+    DictStorage)
+class SlottedBaseNode(NodeSlots):
+    """Base node, not ordered, without instance ``__dict__``.
+
+    Uses ``dict`` as mapping implementation.
+    """
+    __slots__ = ()
+
+
+@plumbing(
+    MappingConstraints,
+    MappingAdopt,
+    AsAttrAccess,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class SlottedOrderedNode(NodeSlots):
+    """Ordered node without instance ``__dict__``.
+
+    Uses ``odict`` as mapping implementation.
+    """
+    __slots__ = ()
+
+
+@plumbing(
+    SequenceConstraints,
+    SequenceAdopt,
+    DefaultInit,
+    SequenceNode,
+    ListStorage)
+class SlottedListNode(NodeSlots):
+    """Sequence node without instance ``__dict__``.
+
+    Uses ``list`` as sequence implementation.
+    """
+    batch_extend = True
+    __slots__ = ()
+
+
+@plumbing(
+    MappingConstraints,
+    Nodespaces,
+    MappingAdopt,
+    Attributes,
+    MappingReference,
+    MappingOrder,
+    AsAttrAccess,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class SlottedNode(_NodeSlots):
+    """Node with nodespaces, attributes and references without instance
+    ``__dict__``.
+    """
+    __slots__ = ()
 
 
 ###############################################################################
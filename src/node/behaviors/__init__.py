@@ -3,8 +3,14 @@ from .adopt import SequenceAdopt  # noqa
 from .alias import Alias  # noqa
 from .attributes import Attributes  # noqa
 from .attributes import NodeAttributes  # noqa
+from .attributes import SqliteNodeAttributes  # noqa
 from .cache import Cache  # noqa
+from .cache import cache_report  # noqa
+from .cache import cache_manager  # noqa
+from .cache import CacheManager  # noqa
+from .cache import CacheStats  # noqa
 from .cache import Invalidate  # noqa
+from .cache import LRUCache  # noqa
 from .cache import VolatileStorageInvalidate  # noqa
 from .common import AsAttrAccess  # noqa
 from .common import UnicodeAware  # noqa
@@ -12,6 +18,7 @@ from .common import UUIDAware  # noqa
 from .constraints import MappingConstraints  # noqa
 from .constraints import SequenceConstraints  # noqa
 from .context import BoundContext  # noqa
+from .copyonwrite import CopyOnWrite  # noqa
 from .events import EventAttribute  # noqa
 from .events import Events  # noqa
 from .events import suppress_events  # noqa
@@ -22,6 +29,11 @@ from .factories import WildcardFactory  # noqa
 from .fallback import Fallback  # noqa
 from .filter import MappingFilter  # noqa
 from .filter import SequenceFilter  # noqa
+from .immutable import Immutable  # noqa
+from .indexes import AttributeIndexes  # noqa
+from .indexes import HashIndex  # noqa
+from .indexes import PathIndex  # noqa
+from .indexes import SortedIndex  # noqa
 from .lifecycle import AttributesLifecycle  # noqa
 from .lifecycle import Lifecycle  # noqa
 from .lifecycle import suppress_lifecycle_events  # noqa
@@ -43,11 +55,13 @@ from .node import NodeInit  # noqa
 from .nodespace import Nodespaces  # noqa
 from .order import MappingOrder  # noqa
 from .order import SequenceOrder  # noqa
+from .reference import audit_reference_index  # noqa
 from .reference import IndexViolationError  # noqa
 from .reference import MappingReference  # noqa
 from .reference import NodeIndex  # noqa
 from .reference import NodeReference  # noqa
 from .reference import SequenceReference  # noqa
+from .reference import WeakReferenceIndex  # noqa
 from .schema import Schema  # noqa
 from .schema import SchemaAsAttributes  # noqa
 from .schema import SchemaAttributes  # noqa
@@ -55,11 +69,25 @@ from .schema import SchemaProperties  # noqa
 from .sequence import MutableSequence  # noqa
 from .sequence import Sequence  # noqa
 from .sequence import SequenceNode  # noqa
+from .storage import ArrayStorage  # noqa
+from .storage import ChunkedList  # noqa
+from .storage import ChunkedListStorage  # noqa
 from .storage import DictStorage  # noqa
+from .storage import HAMT  # noqa
+from .storage import HAMTStorage  # noqa
+from .storage import IndexedOdict  # noqa
+from .storage import IndexedOdictStorage  # noqa
 from .storage import ListStorage  # noqa
 from .storage import MappingStorage  # noqa
+from .storage import MMapDict  # noqa
+from .storage import MMapStorage  # noqa
 from .storage import OdictStorage  # noqa
+from .storage import PicklingStorage  # noqa
 from .storage import SequenceStorage  # noqa
+from .storage import SortedDict  # noqa
+from .storage import SortedStorage  # noqa
+from .storage import SqliteDict  # noqa
+from .storage import SqliteStorage  # noqa
 from zope.deferredimport import deprecated
 
 
@@ -5,6 +5,7 @@ from node.interfaces import INode
 from node.interfaces import ISequenceAdopt
 from plumber import Behavior
 from plumber import plumb
+from plumber import plumbifexists
 from zope.interface import implementer
 
 
@@ -30,6 +31,27 @@ def adopt_node(name, parent, value):
         raise
 
 
+@contextmanager
+def adopt_nodes(start, parent, values):
+    """Context manager for setting name and parent on multiple nodes. Names
+    are the string representation of the positions starting at ``start``. If
+    exception occurs, names and parents gets reverted to original values.
+    """
+    adopted = []
+    for position, value in enumerate(values, start):
+        if INode.providedBy(value):
+            adopted.append((value, value.__name__, value.__parent__))
+            value.__name__ = str(position)
+            value.__parent__ = parent
+    try:
+        yield
+    except Exception:
+        for value, old_name, old_parent in adopted:
+            value.__name__ = old_name
+            value.__parent__ = old_parent
+        raise
+
+
 @implementer(IMappingAdopt)
 class MappingAdopt(Behavior):
 
@@ -63,3 +85,9 @@ class SequenceAdopt(Behavior):
     def insert(next_, self, index, value):
         with adopt_node(str(index), self, value):
             next_(self, index, value)
+
+    @plumbifexists
+    def insert_many(next_, self, index, values):
+        values = list(values)
+        with adopt_nodes(int(index), self, values):
+            next_(self, index, values)
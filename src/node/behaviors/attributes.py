@@ -3,6 +3,7 @@ from node.behaviors.adopt import MappingAdopt
 from node.behaviors.constraints import MappingConstraints
 from node.behaviors.mapping import MappingNode
 from node.behaviors.storage import OdictStorage
+from node.behaviors.storage import SqliteStorage
 from node.compat import IS_PY2
 from node.interfaces import IAttributes
 from node.interfaces import INodeAttributes
@@ -41,6 +42,29 @@ class NodeAttributes(object):
         )
 
 
+@plumbing(
+    MappingConstraints,
+    MappingAdopt,
+    MappingNode,
+    SqliteStorage)
+@implementer(INodeAttributes)
+class SqliteNodeAttributes(object):
+    """Node attributes persisted in ``attributes`` table of the SQLite
+    database defined by ``storage_path`` of the parent node.
+    """
+    child_constraints = None
+    storage_table = 'attributes'
+    __repr__ = NodeAttributes.__repr__
+
+    def __init__(self, name=None, parent=None):
+        self.__name__ = name
+        self.__parent__ = parent
+
+    @property
+    def storage_path(self):
+        return self.parent.storage_path
+
+
 @implementer(IAttributes)
 class Attributes(Behavior):
     attribute_access_for_attrs = default(False)
@@ -1,12 +1,22 @@
 from __future__ import absolute_import
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from node.compat import IS_PY2
 from node.interfaces import ICache
 from node.interfaces import IInvalidate
+from node.interfaces import IMappingNode
+from node.interfaces import INode
+from node.interfaces import ISequenceNode
 from node.utils import instance_property
+from node.utils import UNSET
 from plumber import Behavior
 from plumber import default
 from plumber import plumb
 from zope.interface import implementer
+import sys
+import threading
+import time
 
 
 def _keys(obj):
@@ -67,54 +77,560 @@ class VolatileStorageInvalidate(Behavior):
                 del storage[key]
 
 
+class LRUCache(MutableMapping):
+    """Cache container with optional size limit and time to live.
+
+    If ``maxsize`` is given, the least recently used entry gets evicted when
+    the size limit is exceeded. If ``ttl`` is given, entries older than
+    ``ttl`` seconds are treated as missing and get evicted on access.
+
+    Lookups are counted in ``hits`` and ``misses``, removed entries due to
+    size limit or expiration are counted in ``evictions``.
+    """
+
+    def __init__(self, maxsize=None, ttl=None, on_evict=None):
+        """
+        :param maxsize: Maximum number of cached entries or None for no limit.
+        :param ttl: Time to live of an entry in seconds or None for no expiry.
+        :param on_evict: Optional callback which gets called with key and
+            value of evicted entries.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must not be negative')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def __getitem__(self, key):
+        data = self._data
+        try:
+            value, timestamp = data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        if self.ttl is not None and time.monotonic() - timestamp > self.ttl:
+            del data[key]
+            self.misses += 1
+            self._evicted(key, value)
+            raise KeyError(key)
+        data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data[key] = (value, time.monotonic())
+        data.move_to_end(key)
+        maxsize = self.maxsize
+        if maxsize is not None:
+            while len(data) > maxsize:
+                evicted_key, (evicted_value, _) = data.popitem(last=False)
+                self._evicted(evicted_key, evicted_value)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def pop(self, key, *default):
+        # do not count hits and misses or expire entry
+        try:
+            value, _ = self._data.pop(key)
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        return value
+
+    def __contains__(self, key):
+        # do not count hits and misses, touch recent usage or evict expired
+        # entries
+        try:
+            _, timestamp = self._data[key]
+        except KeyError:
+            return False
+        return self.ttl is None or time.monotonic() - timestamp <= self.ttl
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def values(self):
+        return [value for value, _ in self._data.values()]
+
+    def items(self):
+        return [(key, value) for key, (value, _) in self._data.items()]
+
+    def clear(self):
+        self._data.clear()
+
+    def _evicted(self, key, value):
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __sizeof__(self):
+        size = object.__sizeof__(self) + sys.getsizeof(self._data)
+        for entry in self._data.values():
+            size += sys.getsizeof(entry)
+        return size
+
+    def __repr__(self):
+        return '<{} maxsize={} ttl={} entries={}>'.format(
+            self.__class__.__name__,
+            self.maxsize,
+            self.ttl,
+            len(self._data)
+        )
+
+
+class CacheManager(object):
+    """Cache budget shared by all ``ICache`` providing nodes of a tree.
+
+    The manager gets set on the root node of the tree, like
+    ``node.locking.TreeLock`` does with the lock. Children cached by nodes
+    below the root are registered at the manager, and if ``max_entries`` or
+    ``max_bytes`` gets exceeded, the least recently used entries of the whole
+    tree are evicted from the cache of the node holding it.
+
+    The size of an entry is a shallow estimate, see ``estimate_size``.
+    """
+
+    def __init__(self, node, max_entries=None, max_bytes=None):
+        """
+        :param node: Node of the tree to manage. The manager is set on its
+            root.
+        :param max_entries: Maximum number of cached children in the tree or
+            None for no limit.
+        :param max_bytes: Maximum estimated memory in bytes of cached children
+            in the tree or None for no limit.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._node_keys = dict()
+        node.root._cache_manager = self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, node, key, value):
+        """Register cached child of node and evict least recently used
+        entries if budget is exceeded.
+        """
+        entries = self._entries
+        entry_key = (id(node), key)
+        self._remove(entry_key)
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        entries[entry_key] = (node, key, size)
+        self._node_keys.setdefault(entry_key[0], set()).add(key)
+        self.size += size
+        node._registered_cache_manager = self
+        max_entries = self.max_entries
+        max_bytes = self.max_bytes
+        while entries and (
+            (max_entries is not None and len(entries) > max_entries)
+            or (max_bytes is not None and self.size > max_bytes)
+        ):
+            entry_key = next(iter(entries))
+            owner, owner_key, _ = entries[entry_key]
+            self._remove(entry_key)
+            try:
+                value = owner.cache.pop(owner_key)
+            except KeyError:
+                continue
+            self.evictions += 1
+            self.discard_subtree(value)
+
+    def touch(self, node, key):
+        """Mark cached child of node as recently used."""
+        try:
+            self._entries.move_to_end((id(node), key))
+        except KeyError:
+            pass
+
+    def discard(self, node, key=None):
+        """Unregister cached child of node. If key is None, all cached
+        children of node are unregistered.
+        """
+        if key is not None:
+            self._remove((id(node), key))
+            return
+        node_id = id(node)
+        for key in list(self._node_keys.get(node_id, ())):
+            self._remove((node_id, key))
+
+    def discard_subtree(self, node):
+        """Unregister cached children of node and of all ``ICache`` providing
+        nodes cached below it. Called if node gets removed from the cache of
+        its parent.
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not ICache.providedBy(node):
+                continue
+            self.discard(node)
+            stack.extend(node.cache.values())
+
+    def _remove(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self.size -= entry[2]
+        node_id, key = entry_key
+        keys = self._node_keys[node_id]
+        keys.discard(key)
+        if not keys:
+            del self._node_keys[node_id]
+
+
+def cache_manager(node):
+    """Return ``CacheManager`` set on root of node or None."""
+    return getattr(node.root, '_cache_manager', None)
+
+
+class CacheStats(object):
+    """Cache statistics of a node."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.invalidations = 0
+        self.loads = 0
+        self.load_time = 0.
+
+    @property
+    def average_load_time(self):
+        """Average time in seconds spent for reading uncached children."""
+        return self.load_time / self.loads if self.loads else 0.
+
+    def reset(self):
+        self.__init__()
+
+
+def estimate_size(cache):
+    """Return shallow memory estimate of cache in bytes.
+
+    Size of cache container, keys and values is summed up. Objects referred by
+    values are not taken into account.
+    """
+    size = sys.getsizeof(cache)
+    for key, value in cache.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+_report_keys = [
+    'hits',
+    'misses',
+    'negative_hits',
+    'evictions',
+    'invalidations',
+    'loads',
+    'load_time',
+    'entries',
+    'memory',
+]
+
+
+def cache_report(node):
+    """Return aggregated cache statistics of node and it's subtree.
+
+    Only children which are already loaded are taken into account, thus
+    children of ``ICache`` providing nodes are looked up in the cache. The
+    report is a dict containing the sums of the ``cache_info`` values of all
+    nodes providing ``ICache``, the number of these nodes as ``nodes`` and the
+    resulting ``average_load_time`` and ``hit_ratio``.
+    """
+    report = dict([(key, 0) for key in _report_keys])
+    report['load_time'] = 0.
+    report['nodes'] = 0
+    seen = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if ICache.providedBy(node):
+            info = node.cache_info()
+            for key in _report_keys:
+                report[key] += info[key]
+            report['nodes'] += 1
+            children = node.cache.values()
+        elif IMappingNode.providedBy(node):
+            children = node.values()
+        elif ISequenceNode.providedBy(node):
+            children = list(node)
+        else:
+            continue
+        stack.extend([child for child in children if INode.providedBy(child)])
+    loads = report['loads']
+    report['average_load_time'] = report['load_time'] / loads if loads else 0.
+    lookups = report['hits'] + report['misses']
+    report['hit_ratio'] = float(report['hits']) / lookups if lookups else 0.
+    return report
+
+
+class PrefetchContext(threading.local):
+    node = None
+    loaded = None
+
+
+_prefetch_context = PrefetchContext()
+
+
+def _fetch_child(node, key):
+    """Load child of node in prefetch worker thread.
+
+    Returns tuple containing cache key and loaded value or ``UNSET`` if child
+    not exists. Storing the value in the cache happens in the calling thread.
+    """
+    context = _prefetch_context
+    context.node = node
+    context.loaded = None
+    try:
+        node[key]
+    except KeyError:
+        pass
+    finally:
+        context.node = None
+    return context.loaded
+
+
 @implementer(ICache)
 class Cache(Behavior):
+    cache_maxsize = default(None)
+    cache_ttl = default(None)
+    cache_keys = default(False)
+    cache_misses = default(0)
+    cache_loader = default(None)
+    _registered_cache_manager = default(None)
+    _key_cache = default(None)
 
     @default
     @instance_property
     def cache(self):
-        """Default cache is a dict on self."""
-        return dict()
+        """Default cache is a dict on self. If ``cache_maxsize`` or
+        ``cache_ttl`` is set, a ``LRUCache`` is used instead.
+        """
+        if self.cache_maxsize is None and self.cache_ttl is None:
+            return dict()
+        return LRUCache(
+            maxsize=self.cache_maxsize,
+            ttl=self.cache_ttl,
+            on_evict=self._cache_evicted
+        )
+
+    @default
+    def _cache_evicted(self, key, value):
+        manager = self._registered_cache_manager
+        if manager is not None:
+            manager.discard(self, key)
+            manager.discard_subtree(value)
+
+    @default
+    def prefetch(self, keys, workers=None):
+        cache = self.cache
+        keys = [key for key in dict.fromkeys(keys) if key not in cache]
+        if not keys:
+            return
+        if self.cache_loader is None and not workers:
+            for key in keys:
+                try:
+                    self[key]
+                except KeyError:
+                    pass
+            return
+        stats = self.cache_stats
+        start = time.perf_counter()
+        if self.cache_loader is not None:
+            loaded = dict.fromkeys(keys, UNSET)
+            loaded.update(self.cache_loader(keys))
+            loaded = loaded.items()
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                loaded = executor.map(lambda key: _fetch_child(self, key), keys)
+                loaded = [item for item in loaded if item is not None]
+        stats.misses += len(keys)
+        stats.loads += len(keys)
+        stats.load_time += time.perf_counter() - start
+        for key, value in loaded:
+            if value is not UNSET:
+                self._cache_child(key, value)
+            elif self.cache_misses:
+                self.negative_cache[key] = True
+
+    @default
+    def warm(self, depth=1, workers=None):
+        self.prefetch(list(self), workers=workers)
+        if depth > 1:
+            for child in list(self.cache.values()):
+                if ICache.providedBy(child):
+                    child.warm(depth=depth - 1, workers=workers)
+
+    @default
+    def _cache_child(self, key, value):
+        self.cache[key] = value
+        manager = cache_manager(self)
+        if manager is not None:
+            manager.add(self, key, value)
+
+    @default
+    def _uncache(self, key=None):
+        cache = self.cache
+        if self.cache_misses:
+            negative_cache = self.negative_cache
+            if key is None:
+                negative_cache.clear()
+            elif key in negative_cache:
+                del negative_cache[key]
+        if key is None:
+            removed = list(cache.values())
+            cache.clear()
+        else:
+            removed = [cache.pop(key)]
+        manager = self._registered_cache_manager
+        if manager is not None:
+            manager.discard(self, key)
+            for value in removed:
+                manager.discard_subtree(value)
+
+    @default
+    @instance_property
+    def negative_cache(self):
+        """Keys of missing children. Used if ``cache_misses`` is set."""
+        return LRUCache(maxsize=self.cache_misses, ttl=self.cache_ttl)
+
+    @default
+    @instance_property
+    def cache_stats(self):
+        return CacheStats()
+
+    @default
+    def cache_info(self):
+        cache = self.cache
+        stats = self.cache_stats
+        return dict(
+            hits=stats.hits,
+            misses=stats.misses,
+            negative_hits=stats.negative_hits,
+            evictions=getattr(cache, 'evictions', 0),
+            invalidations=stats.invalidations,
+            loads=stats.loads,
+            load_time=stats.load_time,
+            average_load_time=stats.average_load_time,
+            entries=len(cache),
+            memory=estimate_size(cache)
+        )
 
     @plumb
     def invalidate(next_, self, key=None):
-        cache = self.cache
+        stats = self.cache_stats
         if key is not None:
             try:
-                del cache[key]
+                self._uncache(key)
+                stats.invalidations += 1
             except KeyError:
                 pass
         else:
-            for key in _keys(cache):
-                del cache[key]
+            stats.invalidations += len(self.cache)
+            self._uncache()
         next_(self, key=key)
+        # downstream invalidation might have modified keys
+        self._key_cache = None
 
     @plumb
     def __getitem__(next_, self, key):
         cache = self.cache
+        stats = self.cache_stats
+        try:
+            value = cache[key]
+        except KeyError:
+            pass
+        else:
+            stats.hits += 1
+            manager = self._registered_cache_manager
+            if manager is not None:
+                manager.touch(self, key)
+            return value
+        if self.cache_misses:
+            try:
+                self.negative_cache[key]
+            except KeyError:
+                pass
+            else:
+                stats.negative_hits += 1
+                raise KeyError(key)
+        context = _prefetch_context
+        if context.node is self:
+            # called by prefetch worker, only load child
+            context.node = None
+            context.loaded = (key, UNSET)
+            value = next_(self, key)
+            context.loaded = (key, value)
+            return value
+        stats.misses += 1
+        start = time.perf_counter()
         try:
-            return cache[key]
+            value = next_(self, key)
         except KeyError:
-            cache[key] = next_(self, key)
-        return cache[key]
+            if self.cache_misses:
+                self.negative_cache[key] = True
+            raise
+        finally:
+            stats.loads += 1
+            stats.load_time += time.perf_counter() - start
+        self._cache_child(key, value)
+        return value
 
     @plumb
     def __setitem__(next_, self, key, value):
+        keys = self._key_cache
+        if keys is not None and key not in keys:
+            # position of new key depends on storage, reload keys
+            self._key_cache = None
         try:
-            del self.cache[key]
+            self._uncache(key)
         except KeyError:
             pass
         next_(self, key, value)
 
     @plumb
     def __delitem__(next_, self, key):
+        keys = self._key_cache
+        if keys is not None:
+            keys.pop(key, None)
         try:
-            del self.cache[key]
+            self._uncache(key)
         except KeyError:
             pass
         next_(self, key)
 
     @plumb
     def __iter__(next_, self):
-        # do not cache keys on default implementation.
-        return next_(self)
+        # keys are only cached if ``cache_keys`` is set.
+        if not self.cache_keys:
+            return next_(self)
+        keys = self._key_cache
+        if keys is None:
+            keys = self._key_cache = dict.fromkeys(next_(self))
+        return iter(keys)
+
+    @plumb
+    def __len__(next_, self):
+        if not self.cache_keys:
+            return next_(self)
+        if self._key_cache is None:
+            # iterating fills the key cache
+            self.keys()
+        keys = self._key_cache
+        return next_(self) if keys is None else len(keys)
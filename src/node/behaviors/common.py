@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 from node.interfaces import IAsAttrAccess
+from node.interfaces import ICopyOnWrite
 from node.interfaces import IUnicodeAware
 from node.interfaces import IUUIDAware
 from node.utils import AttributeAccess
@@ -64,7 +65,10 @@ class UUIDAware(Behavior):
     @plumb
     def deepcopy(next_, self):
         copied = next_(self)
-        self.set_uuid_for(copied, True, self.overwrite_recursiv_on_copy)
+        # children of copy on write copies get new uuids when cloned
+        recursiv = self.overwrite_recursiv_on_copy \
+            and not ICopyOnWrite.providedBy(copied)
+        self.set_uuid_for(copied, True, recursiv)
         return copied
 
     @default
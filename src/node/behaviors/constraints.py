@@ -6,6 +6,7 @@ from node.interfaces import ISequenceConstraints
 from plumber import Behavior
 from plumber import default
 from plumber import plumb
+from plumber import plumbifexists
 from zope.interface import implementer
 from zope.interface.interfaces import IInterface
 import warnings
@@ -69,3 +70,10 @@ class SequenceConstraints(Constraints):
     def insert(next_, self, index, value):
         check_constraints(self, value)
         next_(self, index, value)
+
+    @plumbifexists
+    def insert_many(next_, self, index, values):
+        values = list(values)
+        for value in values:
+            check_constraints(self, value)
+        next_(self, index, values)
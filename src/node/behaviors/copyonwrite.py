@@ -0,0 +1,305 @@
+from __future__ import absolute_import
+from node.behaviors.reference import _int_uuid
+from node.interfaces import ICopyOnWrite
+from node.interfaces import INode
+from node.interfaces import INodeReference
+from node.interfaces import IUUIDAware
+from node.locking import TreeLock
+from node.utils import ReadOnlyView
+from plumber import Behavior
+from plumber import default
+from plumber import override
+from plumber import plumb
+from plumber import plumbifexists
+from zope.interface import implementer
+import copy
+
+
+# storage is shared and children are owned by this node
+OWNER = 'owner'
+# storage is shared and children are owned by another node
+SHARED = 'shared'
+# values of these types are immutable and shared by copies
+SHAREABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _shareable(value):
+    """Check whether value is immutable, thus can be shared by copies."""
+    if isinstance(value, SHAREABLE_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(_shareable(item) for item in value)
+    return False
+
+
+@implementer(ICopyOnWrite)
+class CopyOnWrite(Behavior):
+    _cow_state = default(None)
+    _cow_pending = default(False)
+    _cow_frozen = default(False)
+    _cow_exposed = default(False)
+
+    @override
+    def deepcopy(self):
+        # copies share the tree lock of the original, which guards copying
+        # of shared storages
+        with TreeLock(self):
+            return self._cow_copy()
+
+    @override
+    def freeze(self):
+        with TreeLock(self):
+            snapshot = self._cow_copy()
+            snapshot._cow_frozen = True
+        return ReadOnlyView(snapshot)
+
+    @plumb
+    def __getitem__(next_, self, key):
+        if self._cow_state is not None:
+            with TreeLock(self):
+                if self._cow_state is not None:
+                    self._cow_materialize()
+        value = next_(self, key)
+        if not self._cow_exposed \
+                and not ICopyOnWrite.providedBy(value) \
+                and not _shareable(value):
+            self._cow_expose()
+        return value
+
+    @plumb
+    def __setitem__(next_, self, key, value):
+        with TreeLock(self):
+            self._cow_prepare()
+            if INodeReference.providedBy(self) \
+                    and INodeReference.providedBy(value):
+                # reference index of pending trees is incomplete, collision
+                # checks need all nodes
+                if ICopyOnWrite.providedBy(value) and value._cow_pending:
+                    value._cow_materialize_tree()
+                self._cow_index_root()._cow_materialize_pending()
+            next_(self, key, value)
+        if not self._cow_exposed \
+                and not ICopyOnWrite.providedBy(value) \
+                and not _shareable(value):
+            self._cow_expose()
+
+    @plumb
+    def __delitem__(next_, self, key):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, key)
+
+    @plumbifexists
+    def swap(next_, self, node_a, node_b):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, node_a, node_b)
+
+    @plumbifexists
+    def movebefore(next_, self, movenode, refnode):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, movenode, refnode)
+
+    @plumbifexists
+    def moveafter(next_, self, movenode, refnode):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, movenode, refnode)
+
+    @plumbifexists
+    def movefirst(next_, self, movenode):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, movenode)
+
+    @plumbifexists
+    def movelast(next_, self, movenode):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, movenode)
+
+    @plumbifexists
+    def reorder(next_, self, keys):
+        with TreeLock(self):
+            self._cow_prepare()
+            next_(self, keys)
+
+    @plumbifexists
+    def apply_order(next_, self, keys):
+        with TreeLock(self):
+            self._cow_prepare()
+            return next_(self, keys)
+
+    @plumbifexists
+    def node(next_, self, uuid):
+        node = next_(self, uuid)
+        if node is None:
+            root = self._cow_index_root()
+            if root._cow_pending:
+                with TreeLock(self):
+                    root._cow_materialize_pending()
+                node = next_(self, uuid)
+        return node
+
+    @default
+    def _cow_copy(self):
+        copied = self._cow_share()
+        self._cow_snapshot_values()
+        copied._cow_frozen = False
+        if INodeReference.providedBy(copied):
+            copied._index = index = copied._create_reference_index()
+            index[_int_uuid(copied)] = copied
+            copied._cow_pending = True
+        return copied
+
+    @default
+    def _cow_share(self):
+        """Return clone of this node sharing the storage."""
+        clone = copy.copy(self)
+        if self._cow_state is None:
+            self._cow_state = OWNER
+        clone._cow_state = SHARED
+        clone._cow_pending = False
+        clone._cow_exposed = False
+        memo = {id(self): clone}
+        for name in ('_nodespaces', '__attrs__'):
+            value = getattr(self, name, None)
+            if value is not None:
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    @default
+    def _cow_expose(self):
+        """Mark this node and its parents as containing mutable values not
+        supporting copy on write, which were handed out or set.
+
+        Writes to these values are not noticed, thus they get snapshots when
+        the tree is copied, see ``_cow_snapshot_values``.
+        """
+        node = self
+        while ICopyOnWrite.providedBy(node) and not node._cow_exposed:
+            node._cow_exposed = True
+            node = node.__parent__
+
+    @default
+    def _cow_snapshot_values(self):
+        """Materialize nodes below this node containing exposed mutable values.
+
+        Only subtrees marked by ``_cow_expose`` are visited. Storages of shared
+        nodes already contain snapshots.
+        """
+        stack = [(self, None)]
+        while stack:
+            entry = stack.pop()
+            node = entry[0]
+            if not node._cow_exposed or node._cow_state == SHARED:
+                continue
+            snapshot = False
+            for value in node.storage.values():
+                if ICopyOnWrite.providedBy(value):
+                    stack.append((value, entry))
+                elif not snapshot and not _shareable(value):
+                    snapshot = True
+            if not snapshot:
+                continue
+            path = []
+            while entry is not None:
+                path.append(entry[0])
+                entry = entry[1]
+            for node in reversed(path):
+                if node._cow_state is not None:
+                    node._cow_materialize()
+
+    @default
+    def _cow_materialize(self):
+        """Copy shared storage.
+
+        If this node owns the children, they are kept and the shared storage
+        gets snapshots of them. Otherwise children are cloned from the shared
+        storage.
+        """
+        storage = self.storage
+        new = copy.copy(storage)
+        owner = self._cow_state == OWNER
+        for key, value in list(storage.items()):
+            if ICopyOnWrite.providedBy(value):
+                snapshot = value._cow_share()
+            elif _shareable(value):
+                snapshot = value
+            else:
+                parent = getattr(value, '__parent__', None)
+                memo = {id(parent): None} if parent is not None else {}
+                snapshot = copy.deepcopy(value, memo)
+            if owner:
+                storage[key] = snapshot
+                continue
+            if INode.providedBy(snapshot):
+                snapshot.__parent__ = self
+                self._cow_adopt(snapshot)
+            new[key] = snapshot
+        self._storage = new
+        self._cow_state = None
+
+    @default
+    def _cow_adopt(self, node):
+        """Set new uuid and reference index on cloned child node."""
+        reference = INodeReference.providedBy(self) \
+            and INodeReference.providedBy(node)
+        if reference:
+            node._index = self._index
+        node._cow_frozen = self._cow_frozen
+        # snapshots keep uuids
+        if not self._cow_frozen \
+                and IUUIDAware.providedBy(self) \
+                and IUUIDAware.providedBy(node) \
+                and self.overwrite_recursiv_on_copy:
+            if ICopyOnWrite.providedBy(node):
+                # children get new uuids when cloned
+                node.uuid = node.uuid_factory()
+            else:
+                self.set_uuid_for(node, True, True)
+        elif reference:
+            self._index[_int_uuid(node)] = node
+
+    @default
+    def _cow_prepare(self):
+        """Copy shared storages of this node and its parents before write."""
+        node = self
+        path = [node]
+        parent = node.__parent__
+        # copies keep parent of original but are not contained in it
+        while ICopyOnWrite.providedBy(parent) \
+                and parent.storage.get(node.__name__) is node:
+            node = parent
+            path.append(node)
+            parent = node.__parent__
+        for node in reversed(path):
+            if node._cow_state is not None:
+                node._cow_materialize()
+
+    @default
+    def _cow_materialize_tree(self):
+        """Clone all pending children of this node recursive."""
+        if self._cow_state == SHARED:
+            self._cow_materialize()
+        for value in self.storage.values():
+            if ICopyOnWrite.providedBy(value):
+                value._cow_materialize_tree()
+        self._cow_pending = False
+
+    @default
+    def _cow_materialize_pending(self):
+        if self._cow_pending:
+            self._cow_materialize_tree()
+
+    @default
+    def _cow_index_root(self):
+        """Return topmost node sharing reference index with this node."""
+        node = self
+        index = getattr(self, '_index', None)
+        while True:
+            parent = node.__parent__
+            if parent is None or getattr(parent, '_index', None) is not index:
+                return node
+            node = parent
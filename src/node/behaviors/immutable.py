@@ -0,0 +1,84 @@
+from __future__ import absolute_import
+from node.compat import STR_TYPE
+from node.interfaces import IImmutable
+from node.interfaces import INode
+from plumber import Behavior
+from plumber import default
+from plumber import override
+from plumber import plumb
+from zope.interface import implementer
+import copy
+
+
+def _path(path):
+    return (path,) if isinstance(path, STR_TYPE) else tuple(path)
+
+
+@implementer(IImmutable)
+class Immutable(Behavior):
+
+    @plumb
+    def __getitem__(next_, self, key):
+        value = next_(self, key)
+        if INode.providedBy(value):
+            # children are shared between versions, bind to this parent
+            value = copy.copy(value)
+            value.__parent__ = self
+        return value
+
+    @override
+    def __setitem__(self, key, value):
+        raise TypeError('Immutable node does not support item assignment')
+
+    @override
+    def __delitem__(self, key):
+        raise TypeError('Immutable node does not support item deletion')
+
+    @default
+    def set(self, path, value):
+        path = _path(path)
+        if not path:
+            raise KeyError('Empty path')
+        key = path[0]
+        if len(path) > 1:
+            value = self.storage[key].set(path[1:], value)
+        elif INode.providedBy(value):
+            if not IImmutable.providedBy(value):
+                raise TypeError('Only immutable nodes can be added')
+            if value.__name__ != key or value.__parent__ is not None:
+                value = copy.copy(value)
+                value.__name__ = key
+                value.__parent__ = None
+        return self._version(self.storage.set(key, value))
+
+    @default
+    def delete(self, path):
+        path = _path(path)
+        if not path:
+            raise KeyError('Empty path')
+        key = path[0]
+        if len(path) > 1:
+            storage = self.storage.set(key, self.storage[key].delete(path[1:]))
+        else:
+            storage = self.storage.delete(key)
+        return self._version(storage)
+
+    @default
+    def diff(self, other):
+        for key, value, other_value in self.storage.diff(other.storage):
+            if IImmutable.providedBy(value) \
+                    and IImmutable.providedBy(other_value):
+                for path, old, new in value.diff(other_value):
+                    yield (key,) + path, old, new
+            else:
+                yield (key,), value, other_value
+
+    @default
+    def _version(self, storage):
+        """Return new version of this node using given storage."""
+        if storage is self.storage:
+            return self
+        node = copy.copy(self)
+        node.__parent__ = None
+        node._storage = storage
+        return node
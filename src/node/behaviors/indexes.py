@@ -0,0 +1,391 @@
+from __future__ import absolute_import
+from node.behaviors.storage import SortedDict
+from node.interfaces import IAttributeIndexes
+from node.interfaces import IAttributes
+from node.interfaces import IMappingNode
+from node.interfaces import IPathIndex
+from node.interfaces import ISequenceNode
+from node.utils import LocationIterator
+from node.utils import UNSET
+from plumber import Behavior
+from plumber import default
+from plumber import override
+from plumber import plumb
+from zope.interface import implementer
+import copy
+
+
+def _attribute_value(name):
+    """Return callable reading value ``name`` from ``node.attrs`` if node
+    provides ``IAttributes``, otherwise from node attribute.
+    """
+    def value(node):
+        if IAttributes.providedBy(node):
+            return node.attrs.get(name, UNSET)
+        return getattr(node, name, UNSET)
+    return value
+
+
+class HashIndex(object):
+    """Secondary index mapping values to the nodes providing them.
+
+    ``key`` is a callable returning the value to index for a node. It defaults
+    to reading ``name`` from the node attributes. Nodes with value ``None``
+    or ``UNSET`` are not indexed. Lookups are ``O(1)``.
+    """
+
+    def __init__(self, name, key=None):
+        self.name = name
+        self.key = key if key is not None else _attribute_value(name)
+        self._values = self._create_values()
+        self._nodes = dict()
+
+    def _create_values(self):
+        return dict()
+
+    def __deepcopy__(self, memo):
+        copied = self.__class__(self.name, key=self.key)
+        for value, entries in self._values.items():
+            for node in entries.values():
+                copied._add(copy.deepcopy(node, memo), value)
+        return copied
+
+    def _add(self, node, value):
+        # drop previous value if node is already indexed
+        self.remove(node)
+        entries = self._values.get(value)
+        if entries is None:
+            entries = self._values[value] = dict()
+        entries[id(node)] = node
+        self._nodes[id(node)] = value
+
+    def add(self, node):
+        """Add node to index."""
+        value = self.key(node)
+        if value is not None and value is not UNSET:
+            self._add(node, value)
+
+    def prepare(self, nodes):
+        """Return list of ``(node, value)`` tuples for adding nodes to index.
+
+        Raise ``TypeError`` if a value cannot be indexed, without changing the
+        index.
+        """
+        entries = []
+        for node in nodes:
+            value = self.key(node)
+            if value is not None and value is not UNSET:
+                hash(value)
+                entries.append((node, value))
+        return entries
+
+    def remove(self, node):
+        """Remove node from index if contained."""
+        value = self._nodes.pop(id(node), UNSET)
+        if value is UNSET:
+            return
+        entries = self._values[value]
+        del entries[id(node)]
+        if not entries:
+            del self._values[value]
+
+    def update(self, node):
+        """Reindex node after its value changed."""
+        self.remove(node)
+        self.add(node)
+
+    def lookup(self, value):
+        """Return list of nodes indexed by value."""
+        entries = self._values.get(value)
+        return list(entries.values()) if entries else []
+
+    def __contains__(self, value):
+        return value in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __repr__(self):
+        return '<{} \'{}\' with {} nodes>'.format(
+            self.__class__.__name__,
+            self.name,
+            len(self)
+        )
+
+
+class SortedIndex(HashIndex):
+    """Secondary index keeping values sorted.
+
+    Values must be comparable with each other. Lookups and range queries are
+    ``O(log n)``.
+    """
+
+    def _create_values(self):
+        return SortedDict()
+
+    def prepare(self, nodes):
+        entries = super(SortedIndex, self).prepare(nodes)
+        values = [value for _, value in entries]
+        if values and self._values:
+            values.append(self._values.key_at(0))
+        # sorting compares neighbouring values, thus fails if values are not
+        # comparable with each other
+        sorted(values)
+        return entries
+
+    def range(self, minimum=None, maximum=None, inclusive=(True, True),
+              reverse=False):
+        """Return list of nodes with values between minimum and maximum,
+        ordered by value.
+        """
+        values = self._values
+        nodes = []
+        for value in values.irange(minimum, maximum, inclusive, reverse):
+            nodes.extend(values[value].values())
+        return nodes
+
+
+@implementer(IAttributeIndexes)
+class AttributeIndexes(Behavior):
+    attribute_indexes = default(None)
+
+    @plumb
+    def __init__(next_, self, *args, **kw):
+        self._tree_indexes = dict()
+        next_(self, *args, **kw)
+
+    @plumb
+    def __setitem__(next_, self, key, value):
+        existing = self.storage.get(key)
+        # fail before value gets added if it cannot be indexed
+        entries = self._prepare_indexes(value)
+        next_(self, key, value)
+        if existing is not None and existing is not value:
+            self._remove_from_indexes(existing)
+        self._add_to_indexes(value, entries)
+
+    @plumb
+    def __delitem__(next_, self, key):
+        # fail immediately if key does not exist
+        value = self[key]
+        next_(self, key)
+        self._remove_from_indexes(value)
+
+    @plumb
+    def detach(next_, self, key):
+        node = next_(self, key)
+        if IAttributeIndexes.providedBy(node) \
+                and node._tree_indexes is self._tree_indexes:
+            # ``__delitem__`` has not been called while detaching
+            self._remove_from_indexes(node)
+        return node
+
+    @override
+    def index_by(self, name, factory=None):
+        indexes = self._tree_indexes
+        index = indexes.get(name)
+        if index is not None:
+            return index
+        if factory is None:
+            declared = self.attribute_indexes or {}
+            factory = declared.get(name, HashIndex)
+        index = factory(name)
+        for node in self._index_root()._indexable_nodes:
+            index.add(node)
+        indexes[name] = index
+        return index
+
+    @override
+    def reindex(self):
+        for index in self._tree_indexes.values():
+            index.update(self)
+
+    @default
+    def _index_root(self):
+        """Return topmost node sharing the indexes of this node."""
+        node = self
+        indexes = self._tree_indexes
+        parent = node.__parent__
+        while IAttributeIndexes.providedBy(parent) \
+                and parent._tree_indexes is indexes:
+            node = parent
+            parent = node.__parent__
+        return node
+
+    @default
+    @property
+    def _indexable_nodes(self):
+        """Iterate this node and all nodes below it providing
+        ``IAttributeIndexes``.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if IMappingNode.providedBy(node):
+                children = node.values()
+            elif ISequenceNode.providedBy(node):
+                children = node
+            else:
+                continue
+            children = [
+                child for child in children
+                if IAttributeIndexes.providedBy(child)
+            ]
+            children.reverse()
+            stack.extend(children)
+
+    @default
+    def _prepare_indexes(self, value):
+        """Return list of ``(index, entries)`` tuples for adding value and its
+        subtree to indexes. See ``HashIndex.prepare``.
+        """
+        indexes = self._tree_indexes
+        if not indexes or not IAttributeIndexes.providedBy(value):
+            return []
+        nodes = list(value._indexable_nodes)
+        return [(index, index.prepare(nodes)) for index in indexes.values()]
+
+    @default
+    def _add_to_indexes(self, value, entries):
+        if not IAttributeIndexes.providedBy(value):
+            return
+        indexes = self._tree_indexes
+        for node in value._indexable_nodes:
+            node._tree_indexes = indexes
+        for index, index_entries in entries:
+            for node, index_value in index_entries:
+                index._add(node, index_value)
+
+    @default
+    def _remove_from_indexes(self, value):
+        if not IAttributeIndexes.providedBy(value):
+            return
+        indexes = self._tree_indexes.values()
+        value_indexes = dict()
+        for node in value._indexable_nodes:
+            node._tree_indexes = value_indexes
+            for index in indexes:
+                index.remove(node)
+
+
+@implementer(IPathIndex)
+class PathIndex(Behavior):
+    _path_tuple = default(None)
+
+    @plumb
+    def __init__(next_, self, *args, **kw):
+        self._path_key = ()
+        self._path_index = {(): self}
+        next_(self, *args, **kw)
+
+    @plumb
+    def __setitem__(next_, self, key, value):
+        existing = self.storage.get(key)
+        next_(self, key, value)
+        if existing is not None and existing is not value:
+            self._remove_from_path_index(existing)
+        self._add_to_path_index(value)
+
+    @plumb
+    def __delitem__(next_, self, key):
+        # fail immediately if key does not exist
+        value = self[key]
+        next_(self, key)
+        self._remove_from_path_index(value)
+
+    @plumb
+    def detach(next_, self, key):
+        node = next_(self, key)
+        if IPathIndex.providedBy(node) \
+                and node._path_index is self._path_index:
+            # ``__delitem__`` has not been called while detaching
+            self._remove_from_path_index(node)
+        return node
+
+    @override
+    @property
+    def path(self):
+        return list(self.path_tuple)
+
+    @override
+    @property
+    def path_tuple(self):
+        # path of index root may change if it gets added to a node not
+        # providing ``IPathIndex``, thus it is checked against cached one
+        prefix = [
+            parent.__name__
+            for parent in LocationIterator(self._path_index[()])
+        ]
+        prefix.reverse()
+        prefix = tuple(prefix)
+        cached = self._path_tuple
+        if cached is not None and cached[0] == prefix:
+            return cached[1]
+        path = prefix + self._path_key
+        self._path_tuple = (prefix, path)
+        return path
+
+    @override
+    def node_by_path(self, path):
+        return self._path_index.get(self._path_key + tuple(path))
+
+    @default
+    def _path_children(self, node, key):
+        if not IMappingNode.providedBy(node):
+            return []
+        return [
+            (child, key + (name,)) for name, child in node.items()
+            if IPathIndex.providedBy(child)
+        ]
+
+    @default
+    def _init_path_index(self):
+        self._index_paths(self, dict(), ())
+
+    @default
+    def _add_to_path_index(self, value):
+        if not IPathIndex.providedBy(value):
+            return
+        self._index_paths(
+            value,
+            self._path_index,
+            self._path_key + (value.__name__,)
+        )
+
+    @default
+    def _index_paths(self, value, index, key):
+        """Add value and its subtree to index, value gets given key."""
+        stack = [(value, key)]
+        while stack:
+            node, key = stack.pop()
+            index[key] = node
+            node._path_index = index
+            node._path_key = key
+            node._path_tuple = None
+            stack.extend(self._path_children(node, key))
+
+    @default
+    def _remove_from_path_index(self, value):
+        if not IPathIndex.providedBy(value):
+            return
+        index = self._path_index
+        value_index = dict()
+        start = len(value._path_key)
+        stack = [value]
+        while stack:
+            node = stack.pop()
+            key = node._path_key
+            if index.get(key) is node:
+                del index[key]
+            key = key[start:]
+            value_index[key] = node
+            node._path_index = value_index
+            node._path_key = key
+            node._path_tuple = None
+            stack.extend([
+                child for child, _ in self._path_children(node, key)
+            ])
@@ -3,6 +3,10 @@ from node.behaviors.node import ContentishNode
 from node.compat import ITER_FUNC
 from node.compat import iteritems
 from node.interfaces import IMappingNode
+from node.interfaces import INodeReference
+from node.interfaces import IPathIndex
+from node.locking import TreeLock
+from node.utils import ReadOnlyView
 from node.utils import UNSET
 from plumber import Behavior
 from plumber import default
@@ -241,6 +245,40 @@ class MappingNode(ContentishNode, FullMapping):
         new.__parent__ = self.__parent__
         return new
 
+    @default
+    def readonly_view(self):
+        return ReadOnlyView(self)
+
+    @default
+    def freeze(self):
+        # memo prevents copying parents, the tree lock and tree wide objects,
+        # which refer to all nodes of the tree. Indexes get rebuilt for the
+        # snapshot.
+        memo = {id(self.__parent__): self.__parent__}
+        for name in ('_index', '_path_index'):
+            value = getattr(self, name, None)
+            if value is not None:
+                memo[id(value)] = None
+        tree_indexes = getattr(self, '_tree_indexes', None)
+        if tree_indexes is not None:
+            memo[id(tree_indexes)] = dict()
+        cache_manager = getattr(self.root, '_cache_manager', None)
+        if cache_manager is not None:
+            memo[id(cache_manager)] = None
+        # respect an existing tree lock, but do not set one on the live tree
+        lock = getattr(self.root, '_treelock', None)
+        if lock is None:
+            snapshot = copy.deepcopy(self, memo)
+        else:
+            memo[id(lock)] = None
+            with TreeLock(self):
+                snapshot = copy.deepcopy(self, memo)
+        if INodeReference.providedBy(snapshot):
+            snapshot._init_reference_index()
+        if IPathIndex.providedBy(snapshot):
+            snapshot._init_path_index()
+        return ReadOnlyView(snapshot)
+
     @override
     def filtereditervalues(self, interface):
         for val in self.itervalues():
@@ -5,6 +5,7 @@ from node.interfaces import ISequenceOrder
 from plumber import Behavior
 from plumber import override
 from zope.interface import implementer
+import bisect
 
 
 @implementer(IMappingOrder)
@@ -39,24 +40,64 @@ class MappingOrder(Behavior):
         self._validateinsertion(newnode)
         newnode_name = newnode.name
         refnode_name = refnode.name if INode.providedBy(refnode) else refnode
-        try:
-            self.storage[refnode_name]
-            self[newnode_name] = newnode
-            self.storage.movebefore(refnode_name, newnode_name)
-        except KeyError:
+        if refnode_name not in self.storage:
             raise ValueError('Given reference node not child of self.')
+        self[newnode_name] = newnode
+        self.storage.movebefore(refnode_name, newnode_name)
 
     @override
     def insertafter(self, newnode, refnode):
         self._validateinsertion(newnode)
         newnode_name = newnode.name
         refnode_name = refnode.name if INode.providedBy(refnode) else refnode
-        try:
-            self.storage[refnode_name]
-            self[newnode_name] = newnode
-            self.storage.moveafter(refnode_name, newnode_name)
-        except KeyError:
+        if refnode_name not in self.storage:
+            raise ValueError('Given reference node not child of self.')
+        self[newnode_name] = newnode
+        self.storage.moveafter(refnode_name, newnode_name)
+
+    @override
+    def insertbefore_many(self, newnodes, refnode):
+        refnode_name, names = self._insert_many(newnodes, refnode)
+        storage = self.storage
+        if hasattr(storage, 'movebefore_many'):
+            storage.movebefore_many(refnode_name, names)
+            return
+        for name in names:
+            storage.movebefore(refnode_name, name)
+
+    @override
+    def insertafter_many(self, newnodes, refnode):
+        refnode_name, names = self._insert_many(newnodes, refnode)
+        storage = self.storage
+        if hasattr(storage, 'moveafter_many'):
+            storage.moveafter_many(refnode_name, names)
+            return
+        for name in names:
+            storage.moveafter(refnode_name, name)
+            refnode_name = name
+
+    @override
+    def _insert_many(self, newnodes, refnode):
+        newnodes = list(newnodes)
+        refnode_name = refnode.name if INode.providedBy(refnode) else refnode
+        if refnode_name not in self.storage:
             raise ValueError('Given reference node not child of self.')
+        names = []
+        for newnode in newnodes:
+            self._validateinsertion(newnode)
+            names.append(newnode.name)
+        if len(set(names)) != len(names):
+            raise KeyError('Given nodes contain duplicate names')
+        inserted = []
+        try:
+            for name, newnode in zip(names, newnodes):
+                self[name] = newnode
+                inserted.append(name)
+        except Exception:
+            for name in inserted:
+                del self[name]
+            raise
+        return refnode_name, names
 
     @override
     def insertfirst(self, newnode):
@@ -94,6 +135,61 @@ class MappingOrder(Behavior):
         movenode_name = movenode.name if INode.providedBy(movenode) else movenode
         self.storage.movelast(movenode_name)
 
+    @override
+    def reorder(self, keys):
+        names = self._order_names(keys)
+        storage = self.storage
+        if hasattr(storage, 'reorder'):
+            storage.reorder(names)
+            return
+        for name in names:
+            storage.movelast(name)
+
+    @override
+    def apply_order(self, keys):
+        names = self._order_names(keys)
+        storage = self.storage
+        positions = dict([(name, index) for index, name in enumerate(storage)])
+        # keep longest increasing subsequence of current positions in place
+        sequence = [positions[name] for name in names]
+        tails = []
+        tail_indices = []
+        predecessors = [None] * len(sequence)
+        for index, position in enumerate(sequence):
+            insert_at = bisect.bisect_left(tails, position)
+            if insert_at:
+                predecessors[index] = tail_indices[insert_at - 1]
+            if insert_at == len(tails):
+                tails.append(position)
+                tail_indices.append(index)
+            else:
+                tails[insert_at] = position
+                tail_indices[insert_at] = index
+        keep = set()
+        index = tail_indices[-1] if tail_indices else None
+        while index is not None:
+            keep.add(names[index])
+            index = predecessors[index]
+        moved = []
+        following = None
+        for name in reversed(names):
+            if name not in keep:
+                if following is None:
+                    storage.movelast(name)
+                else:
+                    storage.movebefore(following, name)
+                moved.append(name)
+            following = name
+        moved.reverse()
+        return moved
+
+    @override
+    def _order_names(self, keys):
+        names = [key.name if INode.providedBy(key) else key for key in keys]
+        if len(names) != len(self.storage) or set(names) != set(self.storage):
+            raise ValueError('Given keys do not match keys of node')
+        return names
+
     @override
     def _validateinsertion(self, node):
         name = node.name
@@ -141,7 +237,8 @@ class SequenceOrder(Behavior):
         index_b = self._lookup_node_index(node_b)
         storage = self.storage
         storage[index_a], storage[index_b] = storage[index_b], storage[index_a]
-        self._update_indices()
+        self._update_indices(index_a, index_a + 1)
+        self._update_indices(index_b, index_b + 1)
 
     @override
     def insertbefore(self, newnode, refnode):
@@ -157,6 +254,28 @@ class SequenceOrder(Behavior):
         ref_index = self._lookup_node_index(refnode)
         self.insert(ref_index + 1, newnode)
 
+    @override
+    def insertbefore_many(self, newnodes, refnode):
+        newnodes = self._validate_many(newnodes)
+        ref_index = self._lookup_node_index(refnode)
+        self.insert_many(ref_index, newnodes)
+
+    @override
+    def insertafter_many(self, newnodes, refnode):
+        newnodes = self._validate_many(newnodes)
+        ref_index = self._lookup_node_index(refnode)
+        self.insert_many(ref_index + 1, newnodes)
+
+    @override
+    def _validate_many(self, newnodes):
+        newnodes = list(newnodes)
+        ids = set([id(child) for child in self.storage])
+        for newnode in newnodes:
+            if id(newnode) in ids:
+                raise ValueError('Given node already child of self.')
+            ids.add(id(newnode))
+        return newnodes
+
     @override
     def insertfirst(self, newnode):
         if newnode in self:
@@ -180,7 +299,10 @@ class SequenceOrder(Behavior):
             del storage[move_index]
         else:
             del storage[move_index + 1]
-        self._update_indices()
+        self._update_indices(
+            min(move_index, ref_index),
+            max(move_index, ref_index) + 1
+        )
 
     @override
     def moveafter(self, movenode, refnode):
@@ -193,7 +315,10 @@ class SequenceOrder(Behavior):
             del storage[move_index]
         else:
             del storage[move_index + 1]
-        self._update_indices()
+        self._update_indices(
+            min(move_index, ref_index),
+            max(move_index, ref_index) + 1
+        )
 
     @override
     def movefirst(self, movenode):
@@ -202,7 +327,7 @@ class SequenceOrder(Behavior):
         move_val = storage[move_index]
         del storage[move_index]
         storage.insert(0, move_val)
-        self._update_indices()
+        self._update_indices(0, move_index + 1)
 
     @override
     def movelast(self, movenode):
@@ -211,7 +336,7 @@ class SequenceOrder(Behavior):
         move_val = storage[move_index]
         del storage[move_index]
         storage.append(move_val)
-        self._update_indices()
+        self._update_indices(move_index)
 
     @override
     def _lookup_node_index(self, node):
@@ -1,4 +1,5 @@
 from __future__ import absolute_import
+from collections.abc import MutableMapping
 from node.interfaces import IMappingNode
 from node.interfaces import IMappingReference
 from node.interfaces import INodeReference
@@ -8,9 +9,23 @@ from plumber import Behavior
 from plumber import default
 from plumber import override
 from plumber import plumb
+from plumber import plumbifexists
 from zope.interface import implementer
 from zope.interface.common.mapping import IReadMapping
 import uuid
+import weakref
+
+
+def _int_uuid(node):
+    """Return integer form of node uuid used as reference index key.
+
+    It is cached as ``_iuuid`` on the node. Nodes pickled before the cache
+    was introduced get it computed on first access.
+    """
+    iuuid = node._iuuid
+    if iuuid is None and node._uuid is not None:
+        iuuid = node._iuuid = int(node._uuid)
+    return iuuid
 
 
 @implementer(IReadMapping)
@@ -29,6 +44,66 @@ class NodeIndex(object):
         return int(key) in self._index
 
 
+class WeakReferenceIndex(MutableMapping):
+    """Reference index holding weak references to the indexed nodes.
+
+    Entries of garbage collected nodes are removed, callables contained in
+    ``callbacks`` get called with the integer uuid of each removed entry.
+    """
+
+    def __init__(self, data=()):
+        self.data = data_ = dict()
+        self.callbacks = callbacks = list()
+
+        # bound to data and callbacks instead of self to avoid reference cycle
+        def remove(ref):
+            if data_.get(ref.key) is ref:
+                del data_[ref.key]
+                for callback in list(callbacks):
+                    callback(ref.key)
+        self._remove = remove
+        self.update(data)
+
+    def __getitem__(self, key):
+        node = self.data[key]()
+        if node is None:
+            raise KeyError(key)
+        return node
+
+    def __setitem__(self, key, value):
+        self.data[key] = weakref.KeyedRef(value, self._remove, key)
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __contains__(self, key):
+        ref = self.data.get(key)
+        return ref is not None and ref() is not None
+
+    def __iter__(self):
+        # iterate snapshot, entries may get removed by garbage collection
+        for key, ref in list(self.data.items()):
+            if ref() is not None:
+                yield key
+
+    def __len__(self):
+        return len(self.data)
+
+    def keys(self):
+        # key view of the underlying dict, used for intersection with other
+        # indexes
+        return self.data.keys()
+
+    def __reduce__(self):
+        return self.__class__, (dict(self.items()),)
+
+    def __repr__(self):
+        return '<{} with {} entries>'.format(
+            self.__class__.__name__,
+            len(self)
+        )
+
+
 class IndexViolationError(ValueError):
 
     def __init__(self, message, colliding=[]):
@@ -46,10 +121,12 @@ class IndexViolationError(ValueError):
 @implementer(INodeReference)
 class NodeReference(Behavior):
     _uuid = default(None)
+    _iuuid = default(None)
+    weak_reference_index = default(False)
 
     @plumb
     def __init__(next_, self, *args, **kw):
-        self._index = dict()
+        self._index = self._create_reference_index()
         self.uuid = uuid.uuid4()
         next_(self, *args, **kw)
 
@@ -67,11 +144,13 @@ class NodeReference(Behavior):
                 'Given uuid was already used for another Node',
                 [iuuid]
             )
-        siuuid = None if self._uuid is None else int(self._uuid)
+        siuuid = _int_uuid(self)
         if siuuid in index:
             del index[siuuid]
         index[iuuid] = self
         self._uuid = uuid
+        # integer form of uuid is used as index key, cache it
+        self._iuuid = iuuid
 
     @override
     @property
@@ -82,6 +161,12 @@ class NodeReference(Behavior):
     def node(self, uuid):
         return self._index.get(int(uuid))
 
+    @default
+    def _create_reference_index(self):
+        if self.weak_reference_index:
+            return WeakReferenceIndex()
+        return dict()
+
     @default
     @property
     def _referencable_child_nodes(self):
@@ -94,50 +179,66 @@ class NodeReference(Behavior):
             if INodeReference.providedBy(child):
                 yield child
 
+    @default
+    @property
+    def _referencable_nodes(self):
+        """Iterate this node and all referencable nodes below it.
+
+        Iterative depth first traversal, thus not limited by tree depth.
+        """
+        stack = [self]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            yield node
+            children = list(node._referencable_child_nodes)
+            children.reverse()
+            extend(children)
+
     @default
     @property
     def _recursiv_reference_keys(self):
-        keys = [int(self.uuid)]
-        for node in self._referencable_child_nodes:
-            keys += node._recursiv_reference_keys
-        return keys
+        return [_int_uuid(node) for node in self._referencable_nodes]
 
     @default
     def _init_reference_index(self):
-        index = self._index = {int(self.uuid): self}
-        def _init_children(node):
-            for child in node._referencable_child_nodes:
-                index[int(child.uuid)] = child
-                child._index = index
-                _init_children(child)
-        _init_children(self)
+        index = self._index = self._create_reference_index()
+        for node in self._referencable_nodes:
+            index[_int_uuid(node)] = node
+            node._index = index
 
     @default
     def _update_reference_index(self, value):
         if INodeReference.providedBy(value):
             index = self._index
-            colliding = set(index).intersection(value._index)
+            value_index = value._index
+            # intersect key views in C, iterates the smaller index
+            colliding = value_index.keys() & index.keys()
             if colliding:
                 raise IndexViolationError(
                     (
                         'Given node or members of it provide uuid(s) '
                         'colliding with own index.'
                     ),
-                    colliding
+                    sorted(colliding)
                 )
-            index.update(value._index)
-            def _set_index(node):
+            index.update(value_index)
+            for node in value._referencable_nodes:
                 node._index = index
-                for child in node._referencable_child_nodes:
-                    _set_index(child)
-            _set_index(value)
 
     @default
     def _reduce_reference_index(self, value):
+        """Move index entries of value and its children from own index to
+        a new index of value.
+        """
         if INodeReference.providedBy(value):
             index = self._index
-            for iuuid in value._recursiv_reference_keys:
-                del index[iuuid]
+            value_index = value._create_reference_index()
+            for node in value._referencable_nodes:
+                iuuid = _int_uuid(node)
+                value_index[iuuid] = index.pop(iuuid)
+                node._index = value_index
 
 
 class ContentishNodeReference(NodeReference):
@@ -153,7 +254,9 @@ class ContentishNodeReference(NodeReference):
     @plumb
     def detach(next_, self, key):
         node = next_(self, key)
-        node._init_reference_index()
+        if INodeReference.providedBy(node) and node._index is self._index:
+            # ``__delitem__`` has not been called while detaching
+            node._init_reference_index()
         return node
 
     @default
@@ -199,3 +302,65 @@ class SequenceReference(ContentishNodeReference):
             raise IndexViolationError('Given node is already member of tree.')
         self._update_reference_index(value)
         next_(self, index, value)
+
+    @plumbifexists
+    def insert_many(next_, self, index, values):
+        values = list(values)
+        for value in values:
+            if INodeReference.providedBy(value) \
+                    and value._index is self._index:
+                raise IndexViolationError(
+                    'Given node is already member of tree.'
+                )
+        updated = []
+        try:
+            for value in values:
+                self._update_reference_index(value)
+                if INodeReference.providedBy(value):
+                    updated.append(value)
+        except IndexViolationError:
+            # reducing sets a new index on value
+            for value in updated:
+                self._reduce_reference_index(value)
+            raise
+        next_(self, index, values)
+
+
+def audit_reference_index(node):
+    """Return consistency report of the reference index of the tree node is
+    member of.
+
+    The report is a dict containing the number of referencable ``nodes`` of
+    the tree, the number of index ``entries`` and sorted lists of uuids of
+    ``stale`` entries referring nodes not contained in the tree, of tree nodes
+    ``missing`` in the index and of ``unbound`` tree nodes not sharing the
+    tree index. ``consistent`` is True if all of these lists are empty.
+    """
+    index = node._index
+    parent = node.parent
+    while INodeReference.providedBy(parent) and parent._index is index:
+        node = parent
+        parent = node.parent
+    members = dict()
+    missing = []
+    unbound = []
+    for member in node._referencable_nodes:
+        iuuid = _int_uuid(member)
+        members[iuuid] = member
+        if index.get(iuuid) is not member:
+            missing.append(iuuid)
+        if member._index is not index:
+            unbound.append(iuuid)
+    stale = [
+        iuuid for iuuid, indexed in list(index.items())
+        if members.get(iuuid) is not indexed
+    ]
+    report = dict(
+        nodes=len(members),
+        entries=len(index),
+        stale=[uuid.UUID(int=iuuid) for iuuid in sorted(stale)],
+        missing=[uuid.UUID(int=iuuid) for iuuid in sorted(missing)],
+        unbound=[uuid.UUID(int=iuuid) for iuuid in sorted(unbound)]
+    )
+    report['consistent'] = not (stale or missing or unbound)
+    return report
@@ -78,6 +78,10 @@ class MutableSequence(Sequence):
     def insert(self, index, value):
         raise NotImplementedError
 
+    @default
+    def insert_many(self, index, values):
+        raise NotImplementedError
+
     @default
     def clear(self):
         # Missing in python 2
@@ -112,24 +116,51 @@ class SequenceNode(ContentishNode, MutableSequence):
 
     @plumb
     def __delitem__(next_, self, index):
-        if type(index) is not slice:
+        if type(index) is slice:
+            indices = range(*index.indices(len(self)))
+            start = min(indices[0], indices[-1]) if indices else None
+        else:
             index = int(index)
+            start = index + len(self) if index < 0 else index
         next_(self, index)
-        self._update_indices()
+        if start is not None:
+            self._update_indices(start)
 
     @plumb
     def insert(next_, self, index, value):
-        next_(self, int(index), value)
-        self._update_indices()
+        index = int(index)
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        elif index > length:
+            index = length
+        next_(self, index, value)
+        self._update_indices(index)
+
+    @plumb
+    def insert_many(next_, self, index, values):
+        values = list(values)
+        index = int(index)
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        elif index > length:
+            index = length
+        next_(self, index, values)
+        self._update_indices(index)
 
     @plumb
     def detach(next_, self, index):
-        node = next_(self, int(index))
-        self._update_indices()
-        return node
+        # indices already updated by ``__delitem__``
+        return next_(self, int(index))
 
     @default
-    def _update_indices(self):
-        for index, value in enumerate(self):
+    def _update_indices(self, start=0, stop=None):
+        """Set ``__name__`` of child nodes in range ``start:stop``.
+
+        Mutations only pass the range of positions which actually changed,
+        thus appending is constant time.
+        """
+        for index, value in enumerate(self[start:stop], start):
             if INode.providedBy(value):
                 value.__name__ = str(index)
@@ -1,13 +1,32 @@
 from __future__ import absolute_import
+from collections.abc import Mapping
+from collections.abc import MutableMapping
+from collections.abc import MutableSequence
+from contextlib import contextmanager
+from node.interfaces import IArrayStorage
+from node.interfaces import IIndexedMappingStorage
 from node.interfaces import IMappingStorage
+from node.interfaces import INode
 from node.interfaces import IOrdered
 from node.interfaces import ISequenceStorage
+from node.interfaces import ISortedMappingStorage
 from node.utils import instance_property
+from node.utils import UNSET
 from odict import odict
 from plumber import Behavior
 from plumber import default
 from plumber import override
 from zope.interface import implementer
+import array
+import bisect
+import itertools
+import mmap
+import os
+import pickle
+import re
+import sqlite3
+import struct
+import threading
 
 
 @implementer(IMappingStorage)
@@ -53,8 +72,559 @@ class OdictStorage(MappingStorage):
         return odict()
 
 
+def _check_order(mapping, keys):
+    """Return keys as list. Raise ``ValueError`` if keys are no permutation
+    of the keys contained in mapping.
+    """
+    keys = list(keys)
+    if len(keys) != len(mapping) or set(keys) != set(mapping):
+        raise ValueError('Given keys do not match contained keys')
+    return keys
+
+
+_record_header = struct.Struct('<BII')
+_SET = 1
+_DELETE = 2
+_ORDER = 3
+
+
+class MMapDict(MutableMapping):
+    """Ordered mapping persisted in an append only file.
+
+    Keys and values are pickled and appended to the file on write. For reading
+    the file is memory mapped, thus values are only read from disk when
+    accessed. On open, just the record headers and keys are read to build the
+    index. Order changes are persisted by writing the complete key order,
+    thus each move appends ``O(n)`` bytes. Use ``reorder``,
+    ``movebefore_many`` or ``moveafter_many`` for changing the position of
+    multiple keys at once. ``compact`` rewrites the file containing the current
+    records only.
+
+    Pickling only keeps the path, the file gets opened again when unpickled.
+    Thus ``MMapStorage`` nodes can be children of other pickling storages and
+    keep their children in their own file.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the storage file. Gets created if not exists.
+        """
+        self.path = path
+        self._file = open(path, 'a+b', buffering=0)
+        self._mmap = None
+        self._mapped_size = 0
+        self._load()
+
+    def __getstate__(self):
+        return dict(path=self.path)
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def _load(self):
+        index = self._index = odict()
+        fileno = self._file.fileno()
+        size = os.fstat(fileno).st_size
+        if not size:
+            return
+        view = self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+        header_size = _record_header.size
+        offset = 0
+        while offset + header_size <= size:
+            op, key_size, value_size = _record_header.unpack_from(view, offset)
+            key_offset = offset + header_size
+            value_offset = key_offset + key_size
+            if value_offset + value_size > size:
+                break
+            key = pickle.loads(view[key_offset:value_offset])
+            if op == _SET:
+                index[key] = (value_offset, value_size)
+            elif op == _DELETE:
+                del index[key]
+            elif op == _ORDER:
+                order = pickle.loads(
+                    view[value_offset:value_offset + value_size]
+                )
+                index = self._index = odict([(k, index[k]) for k in order])
+            offset = value_offset + value_size
+        if offset < size:
+            # incomplete record at the end, e.g. due to a crash while writing
+            view.close()
+            self._mmap = None
+            self._mapped_size = 0
+            self._file.truncate(offset)
+
+    def _remap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        fileno = self._file.fileno()
+        self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        self._mapped_size = os.fstat(fileno).st_size
+
+    def _write(self, op, key, data=b''):
+        key_data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        header = _record_header.pack(op, len(key_data), len(data))
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(header + key_data + data)
+        return offset + len(header) + len(key_data)
+
+    def _write_order(self):
+        # writes complete key order, see class docstring
+        data = pickle.dumps(list(self._index), pickle.HIGHEST_PROTOCOL)
+        self._write(_ORDER, None, data)
+
+    def _read(self, offset, size):
+        if offset + size > self._mapped_size:
+            self._remap()
+        return self._mmap[offset:offset + size]
+
+    def __getitem__(self, key):
+        offset, size = self._index[key]
+        return pickle.loads(self._read(offset, size))
+
+    def __setitem__(self, key, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._index[key] = (self._write(_SET, key, data), len(data))
+
+    def __delitem__(self, key):
+        if key not in self._index:
+            raise KeyError(key)
+        self._write(_DELETE, key)
+        del self._index[key]
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def first_key(self):
+        return self._index.first_key
+
+    @property
+    def last_key(self):
+        return self._index.last_key
+
+    def next_key(self, key):
+        return self._index.next_key(key)
+
+    def prev_key(self, key):
+        return self._index.prev_key(key)
+
+    def swap(self, a, b):
+        self._index.swap(a, b)
+        self._write_order()
+
+    def movebefore(self, ref, key):
+        self._index.movebefore(ref, key)
+        self._write_order()
+
+    def moveafter(self, ref, key):
+        self._index.moveafter(ref, key)
+        self._write_order()
+
+    def movefirst(self, key):
+        self._index.movefirst(key)
+        self._write_order()
+
+    def movelast(self, key):
+        self._index.movelast(key)
+        self._write_order()
+
+    def movebefore_many(self, ref, keys):
+        """Move keys before ref at once."""
+        index = self._index
+        for key in keys:
+            index.movebefore(ref, key)
+        self._write_order()
+
+    def moveafter_many(self, ref, keys):
+        """Move keys after ref at once."""
+        index = self._index
+        for key in keys:
+            index.moveafter(ref, key)
+            ref = key
+        self._write_order()
+
+    def reorder(self, keys):
+        """Apply order of keys at once."""
+        index = self._index
+        keys = _check_order(index, keys)
+        self._index = odict([(key, index[key]) for key in keys])
+        self._write_order()
+
+    def compact(self):
+        """Rewrite storage file containing current records only."""
+        path = self.path
+        compact_path = '{}.compact'.format(path)
+        with open(compact_path, 'wb') as compact_file:
+            for key, (offset, size) in self._index.items():
+                key_data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+                compact_file.write(
+                    _record_header.pack(_SET, len(key_data), size)
+                )
+                compact_file.write(key_data)
+                compact_file.write(self._read(offset, size))
+        self.close()
+        os.replace(compact_path, path)
+        self._file = open(path, 'a+b', buffering=0)
+        self._load()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mapped_size = 0
+        self._file.close()
+
+
+class PicklingStorage(MappingStorage):
+    """Base for mapping storages persisting pickled values in a file.
+
+    The file path is taken from ``storage_path``. Values must be picklable.
+    Child nodes get pickled without ``__parent__`` and are adopted again when
+    read, thus modifications of a child node require setting it again. This
+    does not apply to children of child nodes using a persistent storage
+    themselves, e.g. ``MMapStorage`` or ``SqliteStorage``.
+    """
+    storage_path = default(None)
+
+    @override
+    def __getitem__(self, key):
+        value = self.storage[key]
+        if INode.providedBy(value):
+            value.__name__ = key
+            value.__parent__ = self
+        return value
+
+    @override
+    def __setitem__(self, key, val):
+        if not INode.providedBy(val):
+            self.storage[key] = val
+            return
+        parent = val.__parent__
+        val.__parent__ = None
+        try:
+            self.storage[key] = val
+        finally:
+            val.__parent__ = parent
+
+
+@implementer(IOrdered)
+class MMapStorage(PicklingStorage):
+    """Mapping storage persisted in a memory mapped file."""
+
+    @default
+    @instance_property
+    def storage(self):
+        if self.storage_path is None:
+            raise ValueError('``MMapStorage`` requires ``storage_path``')
+        return MMapDict(self.storage_path)
+
+
+class SqliteConnections(threading.local):
+    """SQLite connections of the current thread by database path."""
+
+    def __init__(self):
+        self.connections = dict()
+        self.transactions = dict()
+
+    def connection(self, path):
+        try:
+            return self.connections[path]
+        except KeyError:
+            connection = sqlite3.connect(path, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self.connections[path] = connection
+            return connection
+
+    def close(self, path):
+        connection = self.connections.pop(path, None)
+        if connection is not None:
+            connection.close()
+        self.transactions.pop(path, None)
+
+
+_sqlite_connections = SqliteConnections()
+_table_name = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _dump(ob):
+    return pickle.dumps(ob, pickle.HIGHEST_PROTOCOL)
+
+
+class SqliteDict(MutableMapping):
+    """Ordered mapping persisted in a table of a SQLite database.
+
+    Keys and values are pickled. Each thread uses its own connection to the
+    database. Write operations are committed immediately unless executed
+    inside ``transaction``.
+    """
+
+    def __init__(self, path, table='storage'):
+        """
+        :param path: Path of the database file. Gets created if not exists.
+        :param table: Name of the table. Gets created if not exists.
+        """
+        if not _table_name.match(table):
+            raise ValueError('Invalid table name: {}'.format(table))
+        self.path = os.path.abspath(path)
+        self.table = table
+        self._execute((
+            'CREATE TABLE IF NOT EXISTS {} ('
+            'key BLOB PRIMARY KEY, '
+            'value BLOB NOT NULL, '
+            'position INTEGER NOT NULL)'
+        ).format(table))
+        self._execute(
+            'CREATE INDEX IF NOT EXISTS {0}_position ON {0} (position)'.format(
+                table
+            )
+        )
+
+    @property
+    def connection(self):
+        """SQLite connection of the current thread."""
+        return _sqlite_connections.connection(self.path)
+
+    def _execute(self, sql, params=()):
+        return self.connection.execute(sql.format(self.table), params)
+
+    def _fetch_key(self, sql, params=(), error=None):
+        row = self._execute(sql, params).fetchone()
+        if row is None:
+            raise KeyError(error)
+        return pickle.loads(row[0])
+
+    def _position(self, key):
+        row = self._execute(
+            'SELECT position FROM {} WHERE key = ?',
+            (_dump(key),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    @contextmanager
+    def transaction(self):
+        """Context manager for executing write operations in one
+        transaction. Transactions can be nested, only the outermost one gets
+        committed or rolled back.
+        """
+        transactions = _sqlite_connections.transactions
+        path = self.path
+        connection = self.connection
+        level = transactions.get(path, 0)
+        if not level:
+            connection.execute('BEGIN')
+        transactions[path] = level + 1
+        try:
+            yield
+        except BaseException:
+            transactions[path] = level
+            if not level:
+                connection.execute('ROLLBACK')
+            raise
+        transactions[path] = level
+        if not level:
+            connection.execute('COMMIT')
+
+    def __getitem__(self, key):
+        row = self._execute(
+            'SELECT value FROM {} WHERE key = ?',
+            (_dump(key),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def __setitem__(self, key, value):
+        # new keys are appended, existing keys keep their position
+        self._execute((
+            'INSERT INTO {0} (key, value, position) '
+            'VALUES (?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM {0})) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value'
+        ), (_dump(key), _dump(value)))
+
+    def __delitem__(self, key):
+        cursor = self._execute('DELETE FROM {} WHERE key = ?', (_dump(key),))
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        row = self._execute(
+            'SELECT 1 FROM {} WHERE key = ?',
+            (_dump(key),)
+        ).fetchone()
+        return row is not None
+
+    def __iter__(self):
+        rows = self._execute('SELECT key FROM {} ORDER BY position').fetchall()
+        return (pickle.loads(row[0]) for row in rows)
+
+    def __len__(self):
+        return self._execute('SELECT COUNT(*) FROM {}').fetchone()[0]
+
+    def items(self):
+        rows = self._execute(
+            'SELECT key, value FROM {} ORDER BY position'
+        ).fetchall()
+        return [(pickle.loads(key), pickle.loads(value)) for key, value in rows]
+
+    def values(self):
+        rows = self._execute('SELECT value FROM {} ORDER BY position').fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    def update(self, *args, **kw):
+        with self.transaction():
+            super(SqliteDict, self).update(*args, **kw)
+
+    def clear(self):
+        self._execute('DELETE FROM {}')
+
+    @property
+    def first_key(self):
+        return self._fetch_key(
+            'SELECT key FROM {} ORDER BY position LIMIT 1',
+            error='first_key(): ordered dictionary is empty'
+        )
+
+    @property
+    def last_key(self):
+        return self._fetch_key(
+            'SELECT key FROM {} ORDER BY position DESC LIMIT 1',
+            error='last_key(): ordered dictionary is empty'
+        )
+
+    def next_key(self, key):
+        return self._fetch_key(
+            (
+                'SELECT key FROM {} WHERE position > ? '
+                'ORDER BY position LIMIT 1'
+            ),
+            (self._position(key),),
+            error='next_key(): last key'
+        )
+
+    def prev_key(self, key):
+        return self._fetch_key(
+            (
+                'SELECT key FROM {} WHERE position < ? '
+                'ORDER BY position DESC LIMIT 1'
+            ),
+            (self._position(key),),
+            error='prev_key(): first key'
+        )
+
+    def _set_position(self, key, position):
+        self._execute(
+            'UPDATE {} SET position = ? WHERE key = ?',
+            (position, _dump(key))
+        )
+
+    def swap(self, a, b):
+        with self.transaction():
+            position_a = self._position(a)
+            position_b = self._position(b)
+            self._set_position(b, position_a)
+            self._set_position(a, position_b)
+
+    def movebefore(self, ref, key):
+        with self.transaction():
+            self._position(key)
+            position = self._position(ref)
+            self._execute(
+                'UPDATE {} SET position = position + 1 WHERE position >= ?',
+                (position,)
+            )
+            self._set_position(key, position)
+
+    def moveafter(self, ref, key):
+        with self.transaction():
+            self._position(key)
+            position = self._position(ref) + 1
+            self._execute(
+                'UPDATE {} SET position = position + 1 WHERE position >= ?',
+                (position,)
+            )
+            self._set_position(key, position)
+
+    def movefirst(self, key):
+        with self.transaction():
+            self._position(key)
+            position = self._execute(
+                'SELECT MIN(position) FROM {}'
+            ).fetchone()[0]
+            self._set_position(key, position - 1)
+
+    def movelast(self, key):
+        with self.transaction():
+            self._position(key)
+            position = self._execute(
+                'SELECT MAX(position) FROM {}'
+            ).fetchone()[0]
+            self._set_position(key, position + 1)
+
+    def _move_many(self, ref, keys, offset):
+        keys = list(keys)
+        if ref in keys:
+            raise ValueError('Move keys are equal')
+        with self.transaction():
+            for key in keys:
+                self._position(key)
+            position = self._position(ref) + offset
+            self._execute(
+                'UPDATE {} SET position = position + ? WHERE position >= ?',
+                (len(keys), position)
+            )
+            self.connection.executemany(
+                'UPDATE {} SET position = ? WHERE key = ?'.format(self.table),
+                [(position + i, _dump(key)) for i, key in enumerate(keys)]
+            )
+
+    def movebefore_many(self, ref, keys):
+        """Move keys before ref at once."""
+        self._move_many(ref, keys, 0)
+
+    def moveafter_many(self, ref, keys):
+        """Move keys after ref at once."""
+        self._move_many(ref, keys, 1)
+
+    def reorder(self, keys):
+        """Apply order of keys at once."""
+        with self.transaction():
+            keys = _check_order(self, keys)
+            self.connection.executemany(
+                'UPDATE {} SET position = ? WHERE key = ?'.format(self.table),
+                [(position, _dump(key)) for position, key in enumerate(keys)]
+            )
+
+    def close(self):
+        """Close database connection of the current thread."""
+        _sqlite_connections.close(self.path)
+
+
+@implementer(IOrdered)
+class SqliteStorage(PicklingStorage):
+    """Mapping storage persisted in a SQLite database."""
+    storage_table = default('children')
+
+    @default
+    @instance_property
+    def storage(self):
+        if self.storage_path is None:
+            raise ValueError('``SqliteStorage`` requires ``storage_path``')
+        return SqliteDict(self.storage_path, table=self.storage_table)
+
+
 @implementer(ISequenceStorage)
 class SequenceStorage(Behavior):
+    batch_extend = default(False)
 
     @default
     @property
@@ -82,6 +652,21 @@ class SequenceStorage(Behavior):
     def insert(self, index, value):
         self.storage.insert(index, value)
 
+    @override
+    def insert_many(self, index, values):
+        self.storage[index:index] = values
+
+    @override
+    def extend(self, values):
+        if values is self:
+            values = list(values)
+        if not self.batch_extend:
+            # behaviors might only hook ``insert``
+            for value in values:
+                self.insert(len(self), value)
+            return
+        self.insert_many(len(self), values)
+
 
 class ListStorage(SequenceStorage):
 
@@ -89,3 +674,1096 @@ class ListStorage(SequenceStorage):
     @instance_property
     def storage(self):
         return list()
+
+
+class ChunkedList(MutableSequence):
+    """List split into chunks of bounded size.
+
+    Chunk lengths are summed up in a binary indexed tree, thus positional
+    lookup is ``O(log n)``. Insert and delete only move items inside the
+    affected chunk. Chunks get split if exceeding twice the chunk size and
+    merged with their successor if shrinking below half the chunk size.
+    """
+
+    def __init__(self, values=(), chunksize=512):
+        """
+        :param values: Initial values.
+        :param chunksize: Number of items per chunk.
+        """
+        if chunksize < 1:
+            raise ValueError('chunksize must be positive')
+        self.chunksize = chunksize
+        self._rebuild(values)
+
+    def _rebuild(self, values):
+        values = list(values)
+        size = self.chunksize
+        self._chunks = [
+            values[i:i + size] for i in range(0, len(values), size)
+        ]
+        self._len = len(values)
+        for chunk in self._chunks:
+            self._placed(chunk, chunk)
+        self._build_tree()
+
+    def _placed(self, chunk, values):
+        """Hook called after values were placed in chunk. Chunks keep their
+        identity unless removed, thus subclasses can track the chunk of a value.
+        """
+
+    def _split(self, chunk_index):
+        """Split chunk into pieces of chunk size."""
+        chunks = self._chunks
+        chunk = chunks[chunk_index]
+        size = self.chunksize
+        pieces = [chunk[i:i + size] for i in range(size, len(chunk), size)]
+        del chunk[size:]
+        chunks[chunk_index + 1:chunk_index + 1] = pieces
+        for piece in pieces:
+            self._placed(piece, piece)
+        self._build_tree()
+
+    def _prefix(self, chunk_index):
+        """Return number of values in chunks before chunk index."""
+        tree = self._tree
+        count = 0
+        while chunk_index:
+            count += tree[chunk_index]
+            chunk_index -= chunk_index & -chunk_index
+        return count
+
+    def _build_tree(self):
+        chunks = self._chunks
+        count = len(chunks)
+        tree = [0] * (count + 1)
+        for i in range(1, count + 1):
+            tree[i] += len(chunks[i - 1])
+            parent = i + (i & -i)
+            if parent <= count:
+                tree[parent] += tree[i]
+        self._tree = tree
+        step = 1
+        while step * 2 <= count:
+            step *= 2
+        self._step = step
+
+    def _add(self, chunk_index, delta):
+        tree = self._tree
+        count = len(tree) - 1
+        i = chunk_index + 1
+        while i <= count:
+            tree[i] += delta
+            i += i & -i
+
+    def _locate(self, index):
+        """Return ``(chunk index, offset)`` for normalized index."""
+        tree = self._tree
+        count = len(tree) - 1
+        position = 0
+        step = self._step
+        while step:
+            next_position = position + step
+            if next_position <= count and tree[next_position] <= index:
+                position = next_position
+                index -= tree[position]
+            step >>= 1
+        return position, index
+
+    def _normalize(self, index):
+        if index < 0:
+            index += self._len
+        if index < 0 or index >= self._len:
+            raise IndexError('list index out of range')
+        return index
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __reversed__(self):
+        for chunk in reversed(self._chunks):
+            for value in reversed(chunk):
+                yield value
+
+    def iter_from(self, index, reverse=False):
+        """Iterate values starting at index, backwards if ``reverse``."""
+        if index < 0 or index >= self._len:
+            return
+        chunk_index, offset = self._locate(index)
+        chunks = self._chunks
+        if reverse:
+            for value in reversed(chunks[chunk_index][:offset + 1]):
+                yield value
+            for chunk in reversed(chunks[:chunk_index]):
+                for value in reversed(chunk):
+                    yield value
+            return
+        for value in chunks[chunk_index][offset:]:
+            yield value
+        for chunk in itertools.islice(chunks, chunk_index + 1, None):
+            for value in chunk:
+                yield value
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            if start >= stop:
+                return []
+            chunk_index, offset = self._locate(start)
+            values = []
+            remaining = stop - start
+            for chunk in itertools.islice(self._chunks, chunk_index, None):
+                values += chunk[offset:offset + remaining]
+                remaining = stop - start - len(values)
+                if not remaining:
+                    break
+                offset = 0
+            return values
+        chunk_index, offset = self._locate(self._normalize(index))
+        return self._chunks[chunk_index][offset]
+
+    def __setitem__(self, index, value):
+        if type(index) is slice:
+            start, stop, step = index.indices(self._len)
+            if step == 1 and start >= stop:
+                self.insert_many(start, value)
+                return
+            values = list(self)
+            values[index] = value
+            self._rebuild(values)
+            return
+        chunk_index, offset = self._locate(self._normalize(index))
+        chunk = self._chunks[chunk_index]
+        chunk[offset] = value
+        self._placed(chunk, (value,))
+
+    def __delitem__(self, index):
+        if type(index) is slice:
+            values = list(self)
+            del values[index]
+            self._rebuild(values)
+            return
+        chunk_index, offset = self._locate(self._normalize(index))
+        chunks = self._chunks
+        chunk = chunks[chunk_index]
+        del chunk[offset]
+        self._len -= 1
+        if not chunk:
+            del chunks[chunk_index]
+            self._build_tree()
+        elif len(chunk) < self.chunksize // 2 and chunk_index + 1 < len(chunks) \
+                and len(chunk) + len(chunks[chunk_index + 1]) \
+                <= self.chunksize:
+            successor = chunks.pop(chunk_index + 1)
+            chunk += successor
+            self._placed(chunk, successor)
+            self._build_tree()
+        else:
+            self._add(chunk_index, -1)
+
+    def insert(self, index, value):
+        length = self._len
+        if index < 0:
+            index = max(index + length, 0)
+        elif index > length:
+            index = length
+        chunks = self._chunks
+        if not chunks:
+            chunk = [value]
+            chunks.append(chunk)
+            self._len = 1
+            self._placed(chunk, chunk)
+            self._build_tree()
+            return
+        if index == length:
+            chunk_index = len(chunks) - 1
+            offset = len(chunks[-1])
+        else:
+            chunk_index, offset = self._locate(index)
+        chunk = chunks[chunk_index]
+        chunk.insert(offset, value)
+        self._len += 1
+        self._placed(chunk, (value,))
+        if len(chunk) > 2 * self.chunksize:
+            self._split(chunk_index)
+        else:
+            self._add(chunk_index, 1)
+
+    def insert_many(self, index, values):
+        values = list(values)
+        if not values:
+            return
+        length = self._len
+        if index < 0:
+            index = max(index + length, 0)
+        elif index > length:
+            index = length
+        self._len = length + len(values)
+        chunks = self._chunks
+        size = self.chunksize
+        if index == length:
+            if chunks and len(chunks[-1]) < size:
+                fill = size - len(chunks[-1])
+                chunks[-1] += values[:fill]
+                self._placed(chunks[-1], values[:fill])
+                values = values[fill:]
+            pieces = [values[i:i + size] for i in range(0, len(values), size)]
+            chunks += pieces
+            for piece in pieces:
+                self._placed(piece, piece)
+        else:
+            chunk_index, offset = self._locate(index)
+            chunk = chunks[chunk_index]
+            chunk[offset:offset] = values
+            self._placed(chunk, values)
+            if len(chunk) > 2 * size:
+                self._split(chunk_index)
+                return
+        self._build_tree()
+
+    def append(self, value):
+        self.insert(self._len, value)
+
+    def extend(self, values):
+        if values is self:
+            values = list(values)
+        self.insert_many(self._len, values)
+
+    def clear(self):
+        self._rebuild(())
+
+    def index(self, value, start=0, stop=None):
+        for index, item in enumerate(self[start:stop], start):
+            if item is value or item == value:
+                return index
+        raise ValueError('{!r} is not in list'.format(value))
+
+    def count(self, value):
+        return sum([1 for item in self if item is value or item == value])
+
+    def __eq__(self, other):
+        if isinstance(other, (ChunkedList, list)):
+            return self._len == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self))
+
+
+class ChunkedListStorage(SequenceStorage):
+
+    @default
+    @instance_property
+    def storage(self):
+        return ChunkedList()
+
+
+class _KeyList(ChunkedList):
+    """Chunked list of keys tracking the chunk each key is contained in."""
+
+    def _rebuild(self, values):
+        self._chunk_of = dict()
+        super(_KeyList, self)._rebuild(values)
+
+    def _placed(self, chunk, values):
+        chunk_of = self._chunk_of
+        for key in values:
+            chunk_of[key] = chunk
+
+    def _build_tree(self):
+        super(_KeyList, self)._build_tree()
+        self._chunk_indices = dict([
+            (id(chunk), index) for index, chunk in enumerate(self._chunks)
+        ])
+
+    def position(self, key):
+        chunk = self._chunk_of[key]
+        chunk_index = self._chunk_indices[id(chunk)]
+        return self._prefix(chunk_index) + chunk.index(key)
+
+    def remove_key(self, key):
+        del self[self.position(key)]
+        del self._chunk_of[key]
+
+
+class IndexedOdict(MutableMapping):
+    """Ordered mapping with ``O(log n)`` positional access.
+
+    Keys are kept in a ``ChunkedList``. Provides the ordering API of ``odict``
+    and additionally ``key_at``, ``position`` and ``slice_keys``.
+    """
+
+    def __init__(self, data=(), chunksize=512):
+        """
+        :param data: Initial mapping or iterable of key/value pairs.
+        :param chunksize: Number of keys per chunk.
+        """
+        self._data = dict()
+        self._keys = _KeyList(chunksize=chunksize)
+        self.update(data)
+
+    def __copy__(self):
+        return self.__class__(self.items(), chunksize=self._keys.chunksize)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._data:
+            self._keys.append(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._keys.remove_key(key)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self.items()))
+
+    def clear(self):
+        self._data.clear()
+        self._keys.clear()
+
+    def key_at(self, index):
+        return self._keys[index]
+
+    def position(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        return self._keys.position(key)
+
+    def slice_keys(self, start=None, stop=None):
+        return self._keys[start:stop]
+
+    @property
+    def first_key(self):
+        if not self._data:
+            raise KeyError('Ordered dictionary is empty')
+        return self._keys[0]
+
+    @property
+    def last_key(self):
+        if not self._data:
+            raise KeyError('Ordered dictionary is empty')
+        return self._keys[-1]
+
+    def next_key(self, key):
+        position = self.position(key) + 1
+        if position == len(self._keys):
+            raise KeyError('No next key')
+        return self._keys[position]
+
+    def prev_key(self, key):
+        position = self.position(key)
+        if position == 0:
+            raise KeyError('No previous key')
+        return self._keys[position - 1]
+
+    def swap(self, a, b):
+        position_a = self.position(a)
+        position_b = self.position(b)
+        keys = self._keys
+        keys[position_a] = b
+        keys[position_b] = a
+
+    def _move(self, ref, key, offset):
+        if ref == key:
+            raise ValueError('Move keys are equal')
+        self.position(ref)
+        self.position(key)
+        keys = self._keys
+        keys.remove_key(key)
+        keys.insert(keys.position(ref) + offset, key)
+
+    def movebefore(self, ref, key):
+        self._move(ref, key, 0)
+
+    def moveafter(self, ref, key):
+        self._move(ref, key, 1)
+
+    def _move_many(self, ref, keys, offset):
+        keys = list(keys)
+        if ref in keys:
+            raise ValueError('Move keys are equal')
+        self.position(ref)
+        for key in keys:
+            self.position(key)
+        positions = self._keys
+        for key in keys:
+            positions.remove_key(key)
+        positions.insert_many(positions.position(ref) + offset, keys)
+
+    def movebefore_many(self, ref, keys):
+        """Move keys before ref at once."""
+        self._move_many(ref, keys, 0)
+
+    def moveafter_many(self, ref, keys):
+        """Move keys after ref at once."""
+        self._move_many(ref, keys, 1)
+
+    def movefirst(self, key):
+        self.position(key)
+        self._keys.remove_key(key)
+        self._keys.insert(0, key)
+
+    def movelast(self, key):
+        self.position(key)
+        self._keys.remove_key(key)
+        self._keys.append(key)
+
+    def reorder(self, keys):
+        """Apply order of keys at once."""
+        self._keys._rebuild(_check_order(self._data, keys))
+
+
+@implementer(IIndexedMappingStorage)
+class IndexedOdictStorage(OdictStorage):
+
+    @default
+    @instance_property
+    def storage(self):
+        return IndexedOdict()
+
+    @override
+    def key_at(self, index):
+        return self.storage.key_at(index)
+
+    @override
+    def position(self, key):
+        key = key.name if INode.providedBy(key) else key
+        return self.storage.position(key)
+
+    @override
+    def slice_keys(self, start=None, stop=None):
+        return self.storage.slice_keys(start, stop)
+
+
+class _SortedList(ChunkedList):
+    """Chunked list of unique values kept in sorted order."""
+
+    def _build_tree(self):
+        super(_SortedList, self)._build_tree()
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+
+    def _find(self, value, right=False):
+        """Return ``(chunk index, offset)`` of insertion point of value."""
+        maxes = self._maxes
+        if not maxes:
+            return 0, 0
+        if right:
+            chunk_index = bisect.bisect_right(maxes, value)
+        else:
+            chunk_index = bisect.bisect_left(maxes, value)
+        if chunk_index == len(maxes):
+            return chunk_index - 1, len(self._chunks[-1])
+        chunk = self._chunks[chunk_index]
+        if right:
+            return chunk_index, bisect.bisect_right(chunk, value)
+        return chunk_index, bisect.bisect_left(chunk, value)
+
+    def bisect_left(self, value):
+        chunk_index, offset = self._find(value)
+        return self._prefix(chunk_index) + offset
+
+    def bisect_right(self, value):
+        chunk_index, offset = self._find(value, right=True)
+        return self._prefix(chunk_index) + offset
+
+    def add(self, value):
+        chunk_index, offset = self._find(value)
+        self.insert(self._prefix(chunk_index) + offset, value)
+        maxes = self._maxes
+        if maxes and value > maxes[-1]:
+            maxes[-1] = value
+
+    def remove(self, value):
+        chunk_index, offset = self._find(value)
+        chunks = self._chunks
+        chunk = chunks[chunk_index]
+        del self[self._prefix(chunk_index) + offset]
+        if chunk_index < len(chunks) and chunks[chunk_index] is chunk:
+            self._maxes[chunk_index] = chunk[-1]
+
+
+class _Max(object):
+    """Sorts after every other object."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_MAX = _Max()
+
+
+class SortedDict(MutableMapping):
+    """Mapping keeping keys in sorted order.
+
+    Keys are sorted by their natural order or by ``sort_key`` if given, which
+    is a callable receiving the key and returning the value to sort by. Keys
+    with equal sort values are ordered by key. Insert, delete, positional
+    access and bisecting are ``O(log n)``.
+    """
+
+    def __init__(self, data=(), sort_key=None, chunksize=512):
+        """
+        :param data: Initial mapping or iterable of key/value pairs.
+        :param sort_key: Optional callable returning sort value for key.
+        :param chunksize: Number of keys per chunk.
+        """
+        self._data = dict()
+        self._sort_key = sort_key
+        self._keys = _SortedList(chunksize=chunksize)
+        self.update(data)
+
+    def __copy__(self):
+        return self.__class__(
+            self.items(),
+            sort_key=self._sort_key,
+            chunksize=self._keys.chunksize
+        )
+
+    def _entry(self, key):
+        sort_key = self._sort_key
+        return key if sort_key is None else (sort_key(key), key)
+
+    def _key(self, entry):
+        return entry if self._sort_key is None else entry[1]
+
+    def _bisect(self, value, right=False):
+        """Return position of first key with sort value greater or equal to
+        value, or greater than value if ``right``.
+        """
+        keys = self._keys
+        if self._sort_key is None:
+            if right:
+                return keys.bisect_right(value)
+            return keys.bisect_left(value)
+        return keys.bisect_left((value, _MAX) if right else (value,))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._data:
+            self._keys.add(self._entry(key))
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._keys.remove(self._entry(key))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        if self._sort_key is None:
+            return iter(self._keys)
+        return (entry[1] for entry in self._keys)
+
+    def __reversed__(self):
+        return (self._key(entry) for entry in reversed(self._keys))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, list(self.items()))
+
+    def clear(self):
+        self._data.clear()
+        self._keys.clear()
+
+    def key_at(self, index):
+        return self._key(self._keys[index])
+
+    def position(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        return self._keys.bisect_left(self._entry(key))
+
+    def slice_keys(self, start=None, stop=None):
+        return [self._key(entry) for entry in self._keys[start:stop]]
+
+    def bisect_left(self, value):
+        return self._bisect(value)
+
+    def bisect_right(self, value):
+        return self._bisect(value, right=True)
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True),
+               reverse=False):
+        """Iterate keys with sort value between minimum and maximum."""
+        start = 0 if minimum is None \
+            else self._bisect(minimum, right=not inclusive[0])
+        stop = len(self._keys) if maximum is None \
+            else self._bisect(maximum, right=inclusive[1])
+        if start >= stop:
+            return iter(())
+        if reverse:
+            entries = self._keys.iter_from(stop - 1, reverse=True)
+        else:
+            entries = self._keys.iter_from(start)
+        entries = itertools.islice(entries, stop - start)
+        return (self._key(entry) for entry in entries)
+
+    def prefix_keys(self, prefix):
+        """Iterate keys with sort value starting with prefix."""
+        for entry in self._keys.iter_from(self._bisect(prefix)):
+            value = entry if self._sort_key is None else entry[0]
+            if not value.startswith(prefix):
+                return
+            yield self._key(entry)
+
+
+@implementer(ISortedMappingStorage, IOrdered)
+class SortedStorage(MappingStorage):
+    storage_sort_key = default(None)
+
+    @default
+    @instance_property
+    def storage(self):
+        return SortedDict(sort_key=self.storage_sort_key)
+
+    @override
+    def key_at(self, index):
+        return self.storage.key_at(index)
+
+    @override
+    def position(self, key):
+        key = key.name if INode.providedBy(key) else key
+        return self.storage.position(key)
+
+    @override
+    def slice_keys(self, start=None, stop=None):
+        return self.storage.slice_keys(start, stop)
+
+    @override
+    def bisect_left(self, value):
+        return self.storage.bisect_left(value)
+
+    @override
+    def bisect_right(self, value):
+        return self.storage.bisect_right(value)
+
+    @override
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True),
+               reverse=False):
+        return self.storage.irange(
+            minimum=minimum,
+            maximum=maximum,
+            inclusive=inclusive,
+            reverse=reverse
+        )
+
+    @override
+    def prefix_keys(self, prefix):
+        return self.storage.prefix_keys(prefix)
+
+
+_HAMT_BITS = 5
+_HAMT_MASK = (1 << _HAMT_BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+# marks trie node in place of key in bitmap node entries
+_SUBNODE = object()
+
+
+def _hash(key):
+    return hash(key) & _HASH_MASK
+
+
+def _bitcount(value):
+    return bin(value).count('1')
+
+
+class _BitmapNode(object):
+    """Trie node holding up to 32 entries selected by 5 bits of key hash.
+
+    ``entries`` is a flat tuple of key/value pairs. If key is ``_SUBNODE``,
+    value is a trie node for the next 5 bits.
+    """
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+    def _position(self, shift, hash_):
+        bit = 1 << ((hash_ >> shift) & _HAMT_MASK)
+        return bit, 2 * _bitcount(self.bitmap & (bit - 1))
+
+    def find(self, shift, hash_, key):
+        bit, index = self._position(shift, hash_)
+        if not self.bitmap & bit:
+            raise KeyError(key)
+        entries = self.entries
+        entry_key = entries[index]
+        if entry_key is _SUBNODE:
+            return entries[index + 1].find(shift + _HAMT_BITS, hash_, key)
+        if entry_key == key:
+            return entries[index + 1]
+        raise KeyError(key)
+
+    def assoc(self, shift, hash_, key, value):
+        """Return ``(node, added)`` with key set to value."""
+        bit, index = self._position(shift, hash_)
+        entries = self.entries
+        if not self.bitmap & bit:
+            entries = entries[:index] + (key, value) + entries[index:]
+            return _BitmapNode(self.bitmap | bit, entries), True
+        entry_key, entry_value = entries[index], entries[index + 1]
+        if entry_key is _SUBNODE:
+            node, added = entry_value.assoc(
+                shift + _HAMT_BITS,
+                hash_,
+                key,
+                value
+            )
+            if node is entry_value:
+                return self, False
+        elif entry_key == key:
+            if entry_value is value:
+                return self, False
+            node, added = value, False
+            entries = entries[:index + 1] + (node,) + entries[index + 2:]
+            return _BitmapNode(self.bitmap, entries), added
+        else:
+            node = _trie_node(
+                shift + _HAMT_BITS,
+                _hash(entry_key), entry_key, entry_value,
+                hash_, key, value
+            )
+            added = True
+        entries = entries[:index] + (_SUBNODE, node) + entries[index + 2:]
+        return _BitmapNode(self.bitmap, entries), added
+
+    def without(self, shift, hash_, key):
+        """Return node without key or ``None`` if node gets empty."""
+        bit, index = self._position(shift, hash_)
+        if not self.bitmap & bit:
+            raise KeyError(key)
+        entries = self.entries
+        entry_key, entry_value = entries[index], entries[index + 1]
+        if entry_key is _SUBNODE:
+            node = entry_value.without(shift + _HAMT_BITS, hash_, key)
+            if node is not None:
+                # inline sub nodes containing a single value
+                single = type(node) is _BitmapNode \
+                    and len(node.entries) == 2 \
+                    and node.entries[0] is not _SUBNODE
+                replacement = node.entries if single else (_SUBNODE, node)
+                entries = entries[:index] + replacement + entries[index + 2:]
+                return _BitmapNode(self.bitmap, entries)
+        elif entry_key != key:
+            raise KeyError(key)
+        if self.bitmap == bit:
+            return None
+        entries = entries[:index] + entries[index + 2:]
+        return _BitmapNode(self.bitmap ^ bit, entries)
+
+    def iteritems(self):
+        entries = self.entries
+        for index in range(0, len(entries), 2):
+            key = entries[index]
+            if key is _SUBNODE:
+                for item in entries[index + 1].iteritems():
+                    yield item
+            else:
+                yield key, entries[index + 1]
+
+
+class _CollisionNode(object):
+    """Trie node holding key/value pairs of keys with equal hash."""
+    __slots__ = ('hash', 'entries')
+
+    def __init__(self, hash_, entries):
+        self.hash = hash_
+        self.entries = entries
+
+    def _index(self, key):
+        entries = self.entries
+        for index in range(0, len(entries), 2):
+            if entries[index] == key:
+                return index
+        return -1
+
+    def find(self, shift, hash_, key):
+        index = self._index(key)
+        if index == -1:
+            raise KeyError(key)
+        return self.entries[index + 1]
+
+    def assoc(self, shift, hash_, key, value):
+        if hash_ != self.hash:
+            bit = 1 << ((self.hash >> shift) & _HAMT_MASK)
+            node = _BitmapNode(bit, (_SUBNODE, self))
+            return node.assoc(shift, hash_, key, value)
+        entries = self.entries
+        index = self._index(key)
+        if index == -1:
+            return _CollisionNode(hash_, entries + (key, value)), True
+        if entries[index + 1] is value:
+            return self, False
+        entries = entries[:index + 1] + (value,) + entries[index + 2:]
+        return _CollisionNode(hash_, entries), False
+
+    def without(self, shift, hash_, key):
+        index = self._index(key)
+        if index == -1:
+            raise KeyError(key)
+        entries = self.entries[:index] + self.entries[index + 2:]
+        if len(entries) == 2:
+            bit = 1 << ((self.hash >> shift) & _HAMT_MASK)
+            return _BitmapNode(bit, entries)
+        return _CollisionNode(self.hash, entries)
+
+    def iteritems(self):
+        entries = self.entries
+        for index in range(0, len(entries), 2):
+            yield entries[index], entries[index + 1]
+
+
+def _trie_node(shift, hash_a, key_a, value_a, hash_b, key_b, value_b):
+    """Create trie node containing two keys."""
+    if hash_a == hash_b:
+        return _CollisionNode(hash_a, (key_a, value_a, key_b, value_b))
+    node = _BitmapNode(0, ()).assoc(shift, hash_a, key_a, value_a)[0]
+    return node.assoc(shift, hash_b, key_b, value_b)[0]
+
+
+def _trie_diff(node_a, node_b, shift):
+    """Iterate ``(key, value_a, value_b)`` of keys differing between tries.
+
+    Identical sub tries are skipped, thus the effort depends on the number
+    of differences instead of the size of the tries.
+    """
+    if node_a is node_b:
+        return
+    if type(node_a) is _BitmapNode and type(node_b) is _BitmapNode:
+        bitmap_a, bitmap_b = node_a.bitmap, node_b.bitmap
+        bitmap = bitmap_a | bitmap_b
+        while bitmap:
+            bit = bitmap & -bitmap
+            bitmap ^= bit
+            entry_a = entry_b = None
+            if bitmap_a & bit:
+                index = 2 * _bitcount(bitmap_a & (bit - 1))
+                entry_a = node_a.entries[index:index + 2]
+            if bitmap_b & bit:
+                index = 2 * _bitcount(bitmap_b & (bit - 1))
+                entry_b = node_b.entries[index:index + 2]
+            if entry_a is not None and entry_b is not None \
+                    and entry_a[0] is _SUBNODE and entry_b[0] is _SUBNODE:
+                for diff in _trie_diff(
+                    entry_a[1],
+                    entry_b[1],
+                    shift + _HAMT_BITS
+                ):
+                    yield diff
+                continue
+            for diff in _items_diff(
+                _entry_items(entry_a),
+                _entry_items(entry_b)
+            ):
+                yield diff
+        return
+    for diff in _items_diff(
+        node_a.iteritems() if node_a is not None else (),
+        node_b.iteritems() if node_b is not None else ()
+    ):
+        yield diff
+
+
+def _entry_items(entry):
+    if entry is None:
+        return ()
+    if entry[0] is _SUBNODE:
+        return entry[1].iteritems()
+    return [tuple(entry)]
+
+
+def _items_diff(items_a, items_b):
+    items_a = dict(items_a)
+    items_b = dict(items_b)
+    for key, value_a in items_a.items():
+        value_b = items_b.get(key, UNSET)
+        if value_a is not value_b and (
+            INode.providedBy(value_a)
+            or INode.providedBy(value_b)
+            or value_a != value_b
+        ):
+            yield key, value_a, value_b
+    for key, value_b in items_b.items():
+        if key not in items_a:
+            yield key, UNSET, value_b
+
+
+class HAMT(Mapping):
+    """Immutable mapping implemented as hash array mapped trie.
+
+    ``set`` and ``delete`` return a new mapping sharing all untouched parts of
+    the trie with this one in ``O(log n)``.
+    """
+    __slots__ = ('_root', '_len')
+
+    def __init__(self, data=()):
+        """
+        :param data: Initial mapping or iterable of key/value pairs.
+        """
+        self._root = None
+        self._len = 0
+        items = data.items() if isinstance(data, Mapping) else data
+        for key, value in items:
+            self._root, self._len = self._assoc(key, value)
+
+    def _assoc(self, key, value):
+        root = self._root
+        if root is None:
+            root = _BitmapNode(0, ())
+        root, added = root.assoc(0, _hash(key), key, value)
+        return root, self._len + 1 if added else self._len
+
+    def _create(self, root, length):
+        mapping = self.__class__.__new__(self.__class__)
+        mapping._root = root
+        mapping._len = length
+        return mapping
+
+    def __getitem__(self, key):
+        if self._root is None:
+            raise KeyError(key)
+        return self._root.find(0, _hash(key), key)
+
+    def __iter__(self):
+        if self._root is not None:
+            for key, _ in self._root.iteritems():
+                yield key
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, dict(self.items()))
+
+    def set(self, key, value):
+        """Return new mapping with key set to value."""
+        root, length = self._assoc(key, value)
+        if root is self._root:
+            return self
+        return self._create(root, length)
+
+    def delete(self, key):
+        """Return new mapping without key. Raise ``KeyError`` if key is
+        missing.
+        """
+        if self._root is None:
+            raise KeyError(key)
+        root = self._root.without(0, _hash(key), key)
+        return self._create(root, self._len - 1)
+
+    def diff(self, other):
+        """Iterate ``(key, value, other_value)`` of differing keys.
+
+        ``node.utils.UNSET`` is used for missing values. Values which are
+        nodes are compared by identity, other values by equality.
+        """
+        return _trie_diff(self._root, other._root, 0)
+
+
+class HAMTStorage(MappingStorage):
+
+    @default
+    @instance_property
+    def storage(self):
+        return HAMT()
+
+
+@implementer(IArrayStorage)
+class ArrayStorage(SequenceStorage):
+    storage_typecode = default('d')
+
+    @default
+    @instance_property
+    def storage(self):
+        return array.array(self.storage_typecode)
+
+    @override
+    @property
+    def buffer(self):
+        return memoryview(self.storage)
+
+    @override
+    def append(self, value):
+        self.storage.append(value)
+
+    @override
+    def extend(self, values):
+        if IArrayStorage.providedBy(values):
+            values = values.storage
+        storage = self.storage
+        if isinstance(values, array.array) \
+                and values.typecode != storage.typecode:
+            values = values.tolist()
+        storage.extend(values)
+
+    @override
+    def insert_many(self, index, values):
+        self.storage[index:index] = array.array(self.storage_typecode, values)
+
+    @override
+    def extend_from_buffer(self, buffer):
+        view = memoryview(buffer)
+        if view.format not in (self.storage_typecode, 'B'):
+            raise ValueError(
+                'Buffer format ``{}`` does not match typecode ``{}``'.format(
+                    view.format,
+                    self.storage_typecode
+                )
+            )
+        self.storage.frombytes(view.cast('B'))
+
+    @override
+    def clear(self):
+        del self.storage[:]
+
+    @override
+    def _update_indices(self, start=0, stop=None):
+        # primitive values have no ``__name__``
+        pass
+
+    @override
+    def sum(self):
+        return sum(self.storage)
+
+    @override
+    def equals(self, other):
+        if IArrayStorage.providedBy(other):
+            other = other.storage
+        if not isinstance(other, array.array):
+            try:
+                other = array.array(self.storage_typecode, other)
+            except (OverflowError, TypeError):
+                return False
+        return self.storage == other
@@ -191,6 +191,19 @@ class IMappingNode(IContentishNode, IFullMapping):
     def filteredvalues(interface):
         """Return filtered child nodes by interface."""
 
+    def readonly_view():
+        """Return ``node.utils.ReadOnlyView`` of this node. Changes on node
+        are visible through the view.
+        """
+
+    def freeze():
+        """Return ``node.utils.ReadOnlyView`` of a snapshot of this node.
+
+        The snapshot is taken while holding the ``node.locking.TreeLock`` of
+        the tree. Subsequent changes on the node are not visible through the
+        view if writers hold the tree lock as well.
+        """
+
 
 # B/C 2022-02-14 -> node.interfaces.INodify
 deprecated(
@@ -217,6 +230,9 @@ class ISequenceNode(IContentishNode, IMutableSequence):
     * ``insert``
         Cast index to int. Update indices contained children.
 
+    * ``insert_many``
+        Cast index to int. Update indices contained children once.
+
     * ``detach``
         Update indices contained children.
     """
@@ -226,6 +242,14 @@ class ISequenceNode(IContentishNode, IMutableSequence):
         contained in a sequence node, an ``IndexError`` is raised.
         """
 
+    def insert_many(index, values):
+        """Insert values at index in one batch.
+
+        Constraints, adoption and reference indexing run once per batch and
+        children get renumbered once. ``extend`` uses this if
+        ``batch_extend`` is set on the storage behavior.
+        """
+
 
 ###############################################################################
 # plumbing behaviors
@@ -266,6 +290,10 @@ class ISequenceAdopt(Interface):
     * ``insert``
         Sets ``__name__`` and ``__parent__`` attributes of child node.
         Revert change if error occurs in pipeline.
+
+    * ``insert_many``
+        Sets ``__name__`` and ``__parent__`` attributes of child nodes.
+        Revert changes on all child nodes if error occurs in pipeline.
     """
 
 
@@ -310,6 +338,9 @@ class ISequenceConstraints(IConstraints):
     * ``insert``
         Check if given value is instance of type or implements interface
         defined in ``child_constraints``. Raise ``ValuError`` on mismatch.
+
+    * ``insert_many``
+        Check all given values before inserting any of them.
     """
 
 
@@ -515,13 +546,71 @@ class ICache(Interface):
         Remove child from cache.
 
     * ``__iter__``
-        Iterate cached keys or iterate.
+        Iterate cached keys if ``cache_keys`` is set or iterate.
+
+    * ``__len__``
+        Return number of cached keys if ``cache_keys`` is set or length.
 
     * ``invalidate``
         Invalidate cache.
+
+    If a ``node.behaviors.CacheManager`` is set on the root node, cached
+    children get registered at the manager.
     """
 
     cache = Attribute('Dict like object representing the cache.')
+    cache_maxsize = Attribute(
+        'Maximum number of cached children or None. If set, least recently '
+        'used children get evicted from cache.'
+    )
+    cache_ttl = Attribute(
+        'Time to live of cached children in seconds or None.'
+    )
+    cache_keys = Attribute(
+        'Flag whether to cache child keys. Keys are reloaded after adding '
+        'children or invalidating all children. Must not be used if the '
+        'order of children gets changed directly on the storage.'
+    )
+    cache_misses = Attribute(
+        'Maximum number of remembered keys of missing children. If set, '
+        '``KeyError`` is raised for remembered keys without asking the '
+        'backend. 0 disables remembering missing children.'
+    )
+    negative_cache = Attribute(
+        'Dict like object containing keys of missing children.'
+    )
+    cache_loader = Attribute(
+        'Optional hook for loading multiple children at once. If defined, '
+        'it gets called with a list of keys by ``prefetch`` and must return '
+        'an iterable of key/value pairs. Values get cached as returned.'
+    )
+    cache_stats = Attribute(
+        '``node.behaviors.CacheStats`` instance counting hits, misses, '
+        'invalidations and load time of this node.'
+    )
+
+    def prefetch(keys, workers=None):
+        """Load and cache children for keys in one batch.
+
+        Already cached or missing children are skipped. If ``cache_loader``
+        is defined, it is used for loading the children. Otherwise, if
+        ``workers`` is given, children are loaded by a thread pool with given
+        number of workers, else one after another.
+        """
+
+    def warm(depth=1, workers=None):
+        """Prefetch all children and recursively the children of cached
+        ``ICache`` providing children down to ``depth`` levels.
+        """
+
+    def cache_info():
+        """Return dict with cache statistics of this node.
+
+        Contains ``hits``, ``misses``, ``negative_hits``, ``evictions``,
+        ``invalidations``, ``loads``, ``load_time``, ``average_load_time``,
+        ``entries`` and ``memory``, which is a shallow estimate of the cache
+        size in bytes.
+        """
 
 
 class INodeOrder(Interface):
@@ -550,6 +639,24 @@ class INodeOrder(Interface):
         :param refnode: Either ``INode`` implementing object or node name.
         """
 
+    def insertbefore_many(newnodes, refnode):
+        """Insert ``newnodes`` in given order before ``refnode``. ``refnode``
+        must be children of self. Nodes already set are removed again if
+        inserting fails.
+
+        :param newnodes: Iterable of ``INode`` implementing objects.
+        :param refnode: Either ``INode`` implementing object or node name.
+        """
+
+    def insertafter_many(newnodes, refnode):
+        """Insert ``newnodes`` in given order after ``refnode``. ``refnode``
+        must be children of self. Nodes already set are removed again if
+        inserting fails.
+
+        :param newnodes: Iterable of ``INode`` implementing objects.
+        :param refnode: Either ``INode`` implementing object or node name.
+        """
+
     def insertfirst(newnode):
         """Insert ``newnode`` as first node.
 
@@ -611,6 +718,23 @@ class IMappingOrder(INodeOrder):
         children or no key before given key.
         """
 
+    def reorder(keys):
+        """Order children by given keys at once. Uses ``reorder`` of storage
+        if provided.
+
+        :param keys: Iterable of ``INode`` implementing objects or node names.
+            Must contain all keys of node. Raise ``ValueError`` otherwise.
+        """
+
+    def apply_order(keys):
+        """Order children by given keys by moving as few children as
+        possible. Children already in right relative order stay in place.
+
+        :param keys: Iterable of ``INode`` implementing objects or node names.
+            Must contain all keys of node. Raise ``ValueError`` otherwise.
+        :return: List of moved keys.
+        """
+
 
 # B/C 2022-11-22 -> node.interfaces.IOrder
 deprecated(
@@ -685,6 +809,12 @@ class INodeReference(IUUID):
 
     index = Attribute('The tree node index')
 
+    weak_reference_index = Attribute(
+        'Flag whether the index created by this node holds weak references '
+        'to the indexed nodes. Entries of garbage collected nodes get '
+        'removed from weak indexes. Defaults to False.'
+    )
+
     def node(uuid):
         """Return node by uuid located anywhere in this tree."""
 
@@ -705,6 +835,80 @@ class IMappingReference(INodeReference):
     """
 
 
+class IImmutable(IMappingNode):
+    """Plumbing behavior for immutable persistent mapping nodes.
+
+    Children are not changed in place. Updates return a new version of the
+    node sharing all untouched subtrees with this one. Children are bound to
+    the parent they are read from, so the same child may be contained in
+    several versions of a tree.
+
+    Plumbing hooks:
+
+    * ``__getitem__``
+        Return child nodes bound to this node.
+    """
+
+    def __setitem__(key, value):
+        """Raise ``TypeError``."""
+
+    def __delitem__(key):
+        """Raise ``TypeError``."""
+
+    def set(path, value):
+        """Return new version of this node with value set at path.
+
+        :param path: Child key or list of keys relative to this node.
+        :param value: Immutable node or any other value.
+        """
+
+    def delete(path):
+        """Return new version of this node without value at path. Raise
+        ``KeyError`` if path not exists.
+        """
+
+    def diff(other):
+        """Iterate ``(path, value, other_value)`` of values differing between
+        this node and other version of it. ``node.utils.UNSET`` is used for
+        missing values. Subtrees shared by both versions are skipped.
+        """
+
+
+class ICopyOnWrite(IMappingNode):
+    """Plumbing behavior for copy on write cloning of mapping nodes.
+
+    ``deepcopy`` returns a copy sharing the storage with the original node.
+    Children of the copy are cloned lazily on first access, storages are
+    copied on first write of either node. Children not providing
+    ``ICopyOnWrite`` get deep copied when their parent is cloned, immutable
+    values are shared. Mutable values which were handed out or set get
+    snapshots when copying, since writes to them are not noticed.
+
+    Plumbing hooks:
+
+    * ``__getitem__``
+        Clone children of copy on first access. Mark node if a mutable value
+        gets handed out.
+
+    * ``__setitem__``
+        Copy shared storages of node and its parents. Mark node if a mutable
+        value gets set.
+
+    * ``__delitem__``
+        Copy shared storages of node and its parents.
+
+    * ``swap``, ``movebefore``, ``moveafter``, ``movefirst``, ``movelast``,
+      ``reorder`` and ``apply_order``
+        Copy shared storages of node and its parents if ordering is supported.
+
+    * ``node``
+        Clone all pending children if uuid is not found in reference index.
+    """
+
+    def deepcopy():
+        """Return copy of node sharing storage with this node."""
+
+
 # B/C 2022-05-06 -> node.interfaces.IReference
 deprecated(
     '``IReference`` has been renamed to ``IMappingReference``. '
@@ -727,11 +931,90 @@ class ISequenceReference(INodeReference):
     * ``insert``
         Set child in index.
 
+    * ``insert_many``
+        Set children in index. Revert index changes if a child collides.
+
     * ``detach``
         Reduce own index and initialize index of detached child.
     """
 
 
+class IAttributeIndexes(Interface):
+    """Plumbing behavior maintaining secondary indexes of mapping node trees.
+
+    Indexes are shared by all nodes of the tree providing this behavior.
+    Indexes of attached subtrees are dropped, detached subtrees start without
+    indexes.
+
+    Plumbing hooks:
+
+    * ``__init__``
+        Create indexes container.
+
+    * ``__setitem__``
+        Add child and its subtree to indexes. Raise ``TypeError`` without
+        adding the child if values cannot be indexed.
+
+    * ``__delitem__``
+        Remove child and its subtree from indexes.
+
+    * ``detach``
+        Remove detached child and its subtree from indexes.
+    """
+
+    attribute_indexes = Attribute(
+        'Dict mapping index names to index factories used by ``index_by``. '
+        'Defaults to ``node.behaviors.HashIndex`` for undeclared names.'
+    )
+
+    def index_by(name, factory=None):
+        """Return index by name. Build the index if not exists yet.
+
+        :param name: Index name. Default index factories read the value to
+            index from ``attrs[name]`` or attribute ``name`` of the nodes.
+        :param factory: Optional index factory. Called with name, overrides
+            declared factory.
+        """
+
+    def reindex():
+        """Update entries of this node in all indexes. Must be called after
+        values of this node used by indexes changed.
+        """
+
+
+class IPathIndex(Interface):
+    """Plumbing behavior maintaining an index of mapping node trees by path.
+
+    The index is shared by all nodes of the tree providing this behavior and
+    contains their paths relative to the topmost of them. Paths get cached
+    per node until the node is added to or removed from an indexed tree.
+
+    Plumbing hooks:
+
+    * ``__init__``
+        Create path index containing this node.
+
+    * ``__setitem__``
+        Add child and its subtree to path index.
+
+    * ``__delitem__``
+        Remove child and its subtree from path index.
+
+    * ``detach``
+        Remove detached child and its subtree from path index.
+    """
+
+    path = Attribute('Path of node as list, created from ``path_tuple``.')
+    path_tuple = Attribute('Cached path of node as tuple.')
+
+    def node_by_path(path):
+        """Return node by path relative to this node from path index or None
+        if path not indexed.
+
+        :param path: Sequence of names.
+        """
+
+
 class IMappingStorage(Interface):
     """Plumbing behavior providing mapping storage related endpoints.
 
@@ -752,6 +1035,60 @@ class IMappingStorage(Interface):
         """Iter throught storage keys."""
 
 
+class IIndexedMappingStorage(IMappingStorage):
+    """Plumbing behavior providing ordered mapping storage with positional
+    access in ``O(log n)``.
+    """
+
+    def key_at(index):
+        """Return key at position. Raise ``IndexError`` if out of range."""
+
+    def position(key):
+        """Return position of key.
+
+        :param key: Either ``INode`` implementing object or node name.
+        Raise ``KeyError`` if key not contained.
+        """
+
+    def slice_keys(start=None, stop=None):
+        """Return list of keys from position ``start`` to ``stop``."""
+
+
+class ISortedMappingStorage(IIndexedMappingStorage):
+    """Plumbing behavior providing mapping storage keeping keys sorted.
+
+    Keys are sorted by natural order or by the sort value returned by
+    ``storage_sort_key``. Sort values in the API below refer to the keys
+    themselves if no ``storage_sort_key`` is defined.
+    """
+
+    storage_sort_key = Attribute(
+        'Optional method receiving a key and returning the value to sort by. '
+        'Defaults to ``None``.'
+    )
+
+    def bisect_left(value):
+        """Return position of first key with sort value greater or equal to
+        value.
+        """
+
+    def bisect_right(value):
+        """Return position of first key with sort value greater than value."""
+
+    def irange(minimum=None, maximum=None, inclusive=(True, True),
+               reverse=False):
+        """Iterate keys with sort value between ``minimum`` and ``maximum``.
+
+        :param minimum: Lower bound or ``None`` for no lower bound.
+        :param maximum: Upper bound or ``None`` for no upper bound.
+        :param inclusive: Tuple defining whether bounds are inclusive.
+        :param reverse: Iterate in descending order.
+        """
+
+    def prefix_keys(prefix):
+        """Iterate keys with string sort value starting with ``prefix``."""
+
+
 # B/C 2022-02-14 -> node.interfaces.IStorage
 deprecated(
     '``IStorage`` has been renamed to ``IMappingStorage``. Please fix your import',
@@ -766,6 +1103,13 @@ class ISequenceStorage(Interface):
     interface could provide other storage related methods as appropriate.
     """
 
+    batch_extend = Attribute(
+        'Flag whether ``extend`` inserts all values at once via '
+        '``insert_many``. Defaults to False, thus each value passes '
+        '``insert``. Only enable if all behaviors hooking ``insert`` also '
+        'hook ``insert_many``.'
+    )
+
     def __len__():
         """Return length of storage."""
 
@@ -781,6 +1125,43 @@ class ISequenceStorage(Interface):
     def insert(index, value):
         """Insert item to storage."""
 
+    def insert_many(index, values):
+        """Insert items at index to storage."""
+
+
+
+class IArrayStorage(ISequenceStorage):
+    """Plumbing behavior providing sequence storage of primitive numeric
+    values backed by ``array.array``.
+
+    Values are stored unboxed. The storage can be exported without copying
+    via the buffer protocol, e.g. ``numpy.frombuffer(node.buffer)``.
+    """
+
+    storage_typecode = Attribute(
+        'Type code of the underlying ``array.array``. Defaults to ``d``.'
+    )
+
+    buffer = Attribute(
+        '``memoryview`` on the underlying array. The sequence cannot change '
+        'size while a memory view is alive.'
+    )
+
+    def extend(values):
+        """Extend storage by values at once."""
+
+    def extend_from_buffer(buffer):
+        """Extend storage by raw machine values from object supporting the
+        buffer protocol.
+
+        Buffer format must match ``storage_typecode`` or be raw bytes.
+        """
+
+    def sum():
+        """Return sum of all values."""
+
+    def equals(other):
+        """Return whether values equal values of other sequence."""
 
 class IFallback(Interface):
     """Plumbing behavior providing a way to fall back to values by subpath
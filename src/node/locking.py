@@ -1,4 +1,24 @@
-from threading import RLock
+import threading
+
+
+class RLock(object):
+    """Reentrant lock stored on the root node by ``TreeLock``.
+
+    Pickled and copied nodes get a new lock instead of failing, thus locked
+    trees can still be pickled and deep copied.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def __reduce__(self):
+        return (self.__class__, ())
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        self._lock.release()
 
 
 class TreeLock(object):
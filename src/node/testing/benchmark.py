@@ -0,0 +1,561 @@
+"""Benchmarks for node implementations.
+
+Run with ``python -m node.testing.benchmark``.
+"""
+from node.base import ArrayNode
+from node.base import BaseNode
+from node.base import ImmutableNode
+from node.base import ListNode
+from node.base import Node
+from node.base import OrderedNode
+from node.base import SlottedBaseNode
+from node.base import SlottedListNode
+from node.base import SlottedNode
+from node.base import SlottedOrderedNode
+from node.behaviors import AttributeIndexes
+from node.behaviors import Attributes
+from node.behaviors import ChunkedList
+from node.behaviors import CopyOnWrite
+from node.behaviors import DefaultInit
+from node.behaviors import DictStorage
+from node.behaviors import IndexedOdict
+from node.behaviors import MappingAdopt
+from node.behaviors import MappingNode
+from node.behaviors import MappingOrder
+from node.behaviors import MappingReference
+from node.behaviors import MMapStorage
+from node.behaviors import OdictStorage
+from node.behaviors import PathIndex
+from node.behaviors import SortedDict
+from node.behaviors import SortedIndex
+from node.behaviors import SqliteStorage
+from node.utils import node_by_path
+from odict import odict
+from plumber import plumbing
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def timed(func, *args, **kw):
+    """Call function and return duration in seconds."""
+    start = time.perf_counter()
+    func(*args, **kw)
+    return time.perf_counter() - start
+
+
+def print_results(title, results):
+    """Print list of ``(name, {column: seconds})`` as table."""
+    print(title)
+    columns = list(results[0][1])
+    width = max([len(name) for name, _ in results])
+    print('  '.join([''.ljust(width)] + [c.rjust(10) for c in columns]))
+    for name, row in results:
+        print('  '.join(
+            [name.ljust(width)]
+            + ['{:.4f}'.format(row[c]).rjust(10) for c in columns]
+        ))
+    print('')
+
+
+###############################################################################
+# node sizes
+###############################################################################
+
+def node_size(factory, count=10000):
+    """Return average number of bytes allocated per node created by factory.
+
+    Includes the node storage but no children.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        nodes = [factory() for _ in range(count)]
+        for node in nodes:
+            node.storage
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before - sys.getsizeof(nodes)) / float(count)
+
+
+def benchmark_node_sizes(count=10000):
+    print('Node sizes in bytes ({} nodes)'.format(count))
+    for plain, slotted in [
+        (BaseNode, SlottedBaseNode),
+        (OrderedNode, SlottedOrderedNode),
+        (ListNode, SlottedListNode),
+        (Node, SlottedNode)
+    ]:
+        print('{}  {:>8.1f}    {}  {:>8.1f}'.format(
+            plain.__name__.ljust(12),
+            node_size(plain, count),
+            slotted.__name__.ljust(18),
+            node_size(slotted, count)
+        ))
+    print('')
+
+
+def sequence_size(factory, values):
+    """Return number of bytes allocated by sequence node filled with values.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        node = factory()
+        node.storage.extend(values)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before
+
+
+def benchmark_sequence_sizes(count=100000):
+    print('Sequence sizes in bytes ({} floats)'.format(count))
+    for factory in (ListNode, ArrayNode):
+        # values are created inside measurement to include boxed floats
+        values = (float(i) for i in range(count))
+        print('{}  {:>10}'.format(
+            factory.__name__.ljust(12),
+            sequence_size(factory, values)
+        ))
+    print('')
+
+
+###############################################################################
+# sequences
+###############################################################################
+
+def benchmark_sequence_build(counts=(25000, 50000, 100000)):
+    print('Sequence build time in seconds')
+    for count in counts:
+        children = [SlottedBaseNode() for _ in range(count)]
+
+        def append():
+            node = ListNode()
+            for child in children:
+                node.append(child)
+
+        def extend():
+            ListNode().extend(children)
+
+        def insert_front():
+            node = ListNode()
+            for child in children[:count // 100]:
+                node.insert(0, child)
+
+        print((
+            '{:>8} items  append {:.4f}  extend {:.4f}  '
+            'insert front ({} items) {:.4f}'
+        ).format(
+            count,
+            timed(append),
+            timed(extend),
+            count // 100,
+            timed(insert_front)
+        ))
+    print('')
+
+
+def benchmark_sequence_storages(sizes=(100000, 1000000), count=10000):
+    print('Sequence storage, {} inserts and deletes in seconds'.format(count))
+    for size in sizes:
+        row = []
+        for factory in (list, ChunkedList):
+            storage = factory(range(size))
+
+            def insert_delete():
+                for i in range(count):
+                    index = (i * 7919) % size
+                    storage.insert(index, i)
+                    del storage[size - index]
+
+            row.append('{} {:.4f}'.format(factory.__name__, timed(insert_delete)))
+        print('{:>8} items  {}'.format(size, '  '.join(row)))
+    print('')
+
+
+def benchmark_pagination(size=200000, pages=100, page_size=20):
+    print('Ordered mapping, {} random pages of {} keys out of {} in seconds'.format(
+        pages, page_size, size))
+    items = [(str(i), i) for i in range(size)]
+    starts = [(i * 7919) % (size - page_size) for i in range(pages)]
+    data = odict(items)
+
+    def walk():
+        for start in starts:
+            list(itertools.islice(data, start, start + page_size))
+
+    indexed = IndexedOdict(items)
+
+    def slice_keys():
+        for start in starts:
+            indexed.slice_keys(start, start + page_size)
+            indexed.position(indexed.key_at(start))
+
+    print('odict {:.4f}  IndexedOdict {:.4f}'.format(
+        timed(walk),
+        timed(slice_keys)
+    ))
+    print('')
+
+
+def benchmark_sorted(size=200000, queries=20, span=50):
+    print('Sorted mapping, {} range queries of {} keys out of {} in seconds'.format(
+        queries, span, size))
+    items = [('{:08d}'.format((i * 7919) % size), i) for i in range(size)]
+    bounds = [
+        ('{:08d}'.format(start), '{:08d}'.format(start + span - 1))
+        for start in [(i * 104729) % (size - span) for i in range(queries)]
+    ]
+    data = dict(items)
+
+    def sort_keys():
+        for minimum, maximum in bounds:
+            [key for key in sorted(data) if minimum <= key <= maximum]
+
+    sorted_data = SortedDict(items)
+
+    def irange():
+        for minimum, maximum in bounds:
+            list(sorted_data.irange(minimum, maximum))
+
+    print('sorted(keys()) {:.4f}  SortedDict.irange {:.4f}'.format(
+        timed(sort_keys),
+        timed(irange)
+    ))
+    print('')
+
+
+def benchmark_reorder(size=100000, moved=100):
+    print('Reorder {} children, {} displaced, in seconds'.format(size, moved))
+
+    @plumbing(
+        MappingOrder,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class OrderNode(object):
+        pass
+
+    keys = [str(i) for i in range(size)]
+    order = list(keys)
+    for i in range(moved):
+        order.insert(0, order.pop((i * 7919) % size))
+
+    def create():
+        node = OrderNode()
+        for key in keys:
+            node[key] = key
+        return node
+
+    node = create()
+
+    def move_each():
+        for previous, key in zip(order, order[1:]):
+            node.moveafter(key, previous)
+
+    row = [('moveafter each', timed(move_each))]
+    node = create()
+    row.append(('reorder', timed(node.reorder, order)))
+    node = create()
+    row.append(('apply_order', timed(node.apply_order, order)))
+    print('  '.join(['{} {:.4f}'.format(name, t) for name, t in row]))
+    print('')
+
+
+###############################################################################
+# copies
+###############################################################################
+
+def benchmark_deepcopy(width=40, depth=3):
+    @plumbing(
+        MappingAdopt,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class PlainNode(object):
+        pass
+
+    @plumbing(
+        CopyOnWrite,
+        MappingAdopt,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class CopyOnWriteNode(object):
+        pass
+
+    def create(factory, level=depth):
+        node = factory()
+        if level:
+            for i in range(width):
+                node[str(i)] = create(factory, level - 1)
+        return node
+
+    print('Deep copy of {} nodes and write of one leaf in seconds'.format(
+        sum([width ** i for i in range(depth + 1)])))
+    row = []
+    for factory in (PlainNode, CopyOnWriteNode):
+        node = create(factory)
+
+        def copy_and_write():
+            copied = node.deepcopy()
+            copied['0']['0']['0']['x'] = factory()
+
+        row.append('{} {:.4f}'.format(factory.__name__, timed(copy_and_write)))
+
+    def create_immutable(level=depth):
+        node = ImmutableNode()
+        if level:
+            for i in range(width):
+                node = node.set(str(i), create_immutable(level - 1))
+        return node
+
+    node = create_immutable()
+
+    def set_path():
+        node.set(['0', '0', '0', 'x'], ImmutableNode())
+
+    row.append('ImmutableNode {:.4f}'.format(timed(set_path)))
+    print('  '.join(row))
+    print('')
+
+
+###############################################################################
+# reference index
+###############################################################################
+
+def benchmark_reference_index(width=1000, depth=100000):
+    @plumbing(
+        MappingAdopt,
+        MappingReference,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class ReferenceNode(object):
+        pass
+
+    print('Reference index of {} nodes in seconds'.format(width * width + 1))
+    subtree = ReferenceNode()
+
+    def build():
+        for i in range(width):
+            child = ReferenceNode()
+            for j in range(width):
+                child[str(j)] = ReferenceNode()
+            subtree[str(i)] = child
+
+    root = ReferenceNode()
+
+    def attach():
+        root['subtree'] = subtree
+
+    def detach():
+        root.detach('subtree')
+
+    print('build {:.4f}  attach {:.4f}  detach {:.4f}'.format(
+        timed(build),
+        timed(attach),
+        timed(detach)
+    ))
+
+    print('Reference index of chain of {} nodes in seconds'.format(depth))
+    chain = node = ReferenceNode()
+    for _ in range(depth - 1):
+        node['child'] = ReferenceNode()
+        node = node['child']
+
+    def attach_chain():
+        root['chain'] = chain
+
+    print('attach {:.4f}  detach {:.4f}'.format(
+        timed(attach_chain),
+        timed(root.detach, 'chain')
+    ))
+    print('')
+
+
+def benchmark_attribute_index(width=200, queries=10):
+    @plumbing(
+        Attributes,
+        MappingAdopt,
+        AttributeIndexes,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class IndexedNode(object):
+        attribute_indexes = {'size': SortedIndex}
+
+    root = IndexedNode()
+    for i in range(width):
+        child = root[str(i)] = IndexedNode()
+        for j in range(width):
+            node = child[str(j)] = IndexedNode()
+            node.attrs['size'] = (i * width + j) * 7919 % (width * width)
+    values = [(i * 104729) % (width * width) for i in range(queries)]
+    print('Attribute lookup, {} queries on {} nodes in seconds'.format(
+        queries, width * width + width + 1))
+
+    def walk():
+        for value in values:
+            [
+                node for child in root.values() for node in child.values()
+                if node.attrs['size'] == value
+            ]
+
+    build = timed(root.index_by, 'size')
+    index = root.index_by('size')
+
+    def lookup():
+        for value in values:
+            index.lookup(value)
+
+    def range_():
+        for value in values:
+            index.range(value, value + 50)
+
+    print('walk {:.4f}  build {:.4f}  lookup {:.4f}  range {:.4f}'.format(
+        timed(walk),
+        build,
+        timed(lookup),
+        timed(range_)
+    ))
+    print('')
+
+
+def benchmark_path_index(depth=20, lookups=10000):
+    @plumbing(
+        MappingAdopt,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class PlainNode(object):
+        pass
+
+    @plumbing(
+        MappingAdopt,
+        PathIndex,
+        DefaultInit,
+        MappingNode,
+        OdictStorage)
+    class PathNode(object):
+        pass
+
+    print('Path of depth {}, {} lookups in seconds'.format(depth, lookups))
+    path = '/'.join([str(i) for i in range(depth)])
+    for factory in (PlainNode, PathNode):
+        root = node = factory(name='root')
+        for i in range(depth):
+            node[str(i)] = factory()
+            node = node[str(i)]
+
+        def by_path():
+            for _ in range(lookups):
+                node_by_path(root, path)
+
+        def node_path():
+            for _ in range(lookups):
+                node.path
+
+        print('{}  node_by_path {:.4f}  path {:.4f}'.format(
+            factory.__name__.ljust(9),
+            timed(by_path),
+            timed(node_path)
+        ))
+    print('')
+
+
+###############################################################################
+# storages
+###############################################################################
+
+def storage_node(storage):
+    @plumbing(
+        MappingAdopt,
+        DefaultInit,
+        MappingNode,
+        storage)
+    class StorageNode(object):
+        pass
+    return StorageNode
+
+
+def benchmark_storage(node, count, batch=None):
+    keys = [str(i) for i in range(count)]
+
+    def write():
+        for key in keys:
+            node[key] = key
+
+    def read():
+        for key in keys:
+            node[key]
+
+    def iterate():
+        list(node.keys())
+
+    def delete():
+        for key in keys:
+            del node[key]
+
+    result = dict()
+    for name, func in [
+        ('write', write),
+        ('read', read),
+        ('iterate', iterate),
+        ('delete', delete)
+    ]:
+        if batch is not None and name in ('write', 'delete'):
+            with batch():
+                result[name] = timed(func)
+        else:
+            result[name] = timed(func)
+    return result
+
+
+def benchmark_storages(count=10000):
+    tempdir = tempfile.mkdtemp()
+    try:
+        results = []
+        for storage in (DictStorage, OdictStorage):
+            node = storage_node(storage)()
+            results.append((storage.__name__, benchmark_storage(node, count)))
+        node = storage_node(MMapStorage)()
+        node.storage_path = os.path.join(tempdir, 'mmap')
+        results.append(('MMapStorage', benchmark_storage(node, count)))
+        node.storage.close()
+        node = storage_node(SqliteStorage)()
+        node.storage_path = os.path.join(tempdir, 'sqlite.db')
+        results.append(('SqliteStorage', benchmark_storage(node, count)))
+        results.append((
+            'SqliteStorage (transaction)',
+            benchmark_storage(node, count, batch=node.storage.transaction)
+        ))
+        node.storage.close()
+    finally:
+        shutil.rmtree(tempdir)
+    print_results('Storages ({} items)'.format(count), results)
+
+
+def main():
+    benchmark_node_sizes()
+    benchmark_sequence_sizes()
+    benchmark_sequence_build()
+    benchmark_sequence_storages()
+    benchmark_pagination()
+    benchmark_sorted()
+    benchmark_reorder()
+    benchmark_deepcopy()
+    benchmark_reference_index()
+    benchmark_attribute_index()
+    benchmark_path_index()
+    benchmark_storages()
+
+
+if __name__ == '__main__':                                   # pragma: no cover
+    main()
@@ -111,6 +111,29 @@ class TestAdopt(NodeTestCase):
         self.assertEqual(node.__name__, None)
         self.assertEqual(node.__parent__, None)
 
+        # Batch adoption reverted on all nodes if something goes wrong
+        class FakeBatchList(FakeList):
+            def insert_many(self, index, values):
+                raise Exception()
+
+        @plumbing(SequenceAdopt)
+        class FailingBatchAL(FakeBatchList):
+            pass
+
+        fail = FailingBatchAL()
+        nodes = [MockupNode(), MockupNode()]
+        with self.assertRaises(Exception):
+            fail.insert_many(0, nodes)
+        self.assertEqual([node.__name__ for node in nodes], [None, None])
+        self.assertEqual([node.__parent__ for node in nodes], [None, None])
+
+        # Batch adoption
+        nodes = [MockupNode(), nonode, MockupNode()]
+        al.insert_many(1, nodes)
+        self.assertEqual(nodes[0].__name__, '1')
+        self.assertEqual(nodes[2].__name__, '3')
+        self.assertTrue(nodes[2].__parent__ is al)
+
     def test_BC_imports(self):
         from node.behaviors import Adopt
         self.assertTrue(Adopt is MappingAdopt)
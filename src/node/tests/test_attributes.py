@@ -3,11 +3,16 @@ from node.behaviors import DefaultInit
 from node.behaviors import DictStorage
 from node.behaviors import MappingNode
 from node.behaviors import Nodespaces
+from node.behaviors import SqliteNodeAttributes
+from node.behaviors import SqliteStorage
 from node.behaviors.attributes import NodeAttributes
 from node.interfaces import INodeAttributes
 from node.tests import NodeTestCase
 from node.utils import AttributeAccess
 from plumber import plumbing
+import os
+import shutil
+import tempfile
 
 
 class TestAttributes(NodeTestCase):
@@ -71,3 +76,29 @@ class TestAttributes(NodeTestCase):
 
         attrs['bar'] = 'baz'
         self.assertEqual(attrs.bar, 'baz')
+
+    def test_SqliteNodeAttributes(self):
+        @plumbing(Attributes, DefaultInit, MappingNode, SqliteStorage)
+        class SqliteNode(object):
+            attributes_factory = SqliteNodeAttributes
+
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'node.db')
+            node = SqliteNode(name='sqlite')
+            node.storage_path = path
+            node['child'] = 'child'
+            node.attrs['title'] = 'Title'
+            self.assertTrue(INodeAttributes.providedBy(node.attrs))
+            self.assertEqual(node.attrs.storage.table, 'attributes')
+            expected = '<SqliteNodeAttributes object \'sqlite\' at '
+            self.assertTrue(repr(node.attrs).startswith(expected))
+            node.storage.close()
+
+            node = SqliteNode(name='sqlite')
+            node.storage_path = path
+            self.assertEqual(node.keys(), ['child'])
+            self.assertEqual(node.attrs.items(), [('title', 'Title')])
+            node.storage.close()
+        finally:
+            shutil.rmtree(tempdir)
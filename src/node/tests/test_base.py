@@ -1,18 +1,28 @@
 from node.base import AbstractNode
 from node.base import BaseNode
 from node.base import ListNode
+from node.base import NodeSlots
 from node.base import OrderedNode
+from node.base import SlottedBaseNode
+from node.base import SlottedListNode
+from node.base import SlottedNode
+from node.base import SlottedOrderedNode
+from node.behaviors import DefaultInit
+from node.behaviors import MappingNode
+from node.behaviors import OdictStorage
 from node.interfaces import INode
 from node.testing import FullMappingTester
 from node.testing.base import create_tree
 from node.testing.env import MyNode
 from node.tests import NodeTestCase
 from node.utils import AttributeAccess
+from plumber import plumbing
 from zope.interface import directlyProvides
 from zope.interface import Interface
 from zope.interface import noLongerProvides
 import copy
 import pickle
+import weakref
 
 
 class TestBase(NodeTestCase):
@@ -447,3 +457,109 @@ class TestBase(NodeTestCase):
         __<class 'node.base.BaseNode'>: 0
         __<class 'node.base.BaseNode'>: 1
         """, node.treerepr(prefix='_'))
+
+    def test_ListNode_insert_many(self):
+        node = ListNode(name='listnode')
+        node.extend([BaseNode(), BaseNode()])
+        node.insert_many(1, (BaseNode(name=str(i)) for i in range(2)))
+        self.assertEqual(len(node), 4)
+        self.assertEqual([child.name for child in node], ['0', '1', '2', '3'])
+        self.assertTrue(all([child.parent is node for child in node]))
+
+        node.insert_many(-1, [BaseNode()])
+        node.insert_many(100, [BaseNode()])
+        node += [BaseNode()]
+        self.assertEqual(
+            [child.name for child in node],
+            ['0', '1', '2', '3', '4', '5', '6']
+        )
+
+        # constraints are checked before any value is inserted
+        child = BaseNode()
+        with self.assertRaises(ValueError):
+            node.extend([child, object()])
+        self.assertEqual(len(node), 7)
+        self.assertEqual(child.name, None)
+        self.assertEqual(child.parent, None)
+
+    def test_SlottedBaseNode(self):
+        node = SlottedBaseNode(name='root')
+        self.assertIsInstance(node, NodeSlots)
+        self.assertFalse(hasattr(node, '__dict__'))
+        with self.assertRaises(AttributeError):
+            node.foo = 'foo'
+        self.assertTrue(weakref.ref(node)() is node)
+
+        fmtester = FullMappingTester(SlottedBaseNode)
+        fmtester.run()
+        self.assertFalse('failed' in fmtester.combined)
+
+        node['child'] = SlottedBaseNode()
+        self.assertEqual(node['child'].path, ['root', 'child'])
+
+        copied = node.deepcopy()
+        self.assertFalse(copied['child'] is node['child'])
+        self.assertTrue(copied['child'].parent is copied)
+
+        unpickled = pickle.loads(pickle.dumps(node))
+        self.checkOutput("""\
+        <class 'node.base.SlottedBaseNode'>: root
+        __<class 'node.base.SlottedBaseNode'>: child
+        """, unpickled.treerepr(prefix='_'))
+
+    def test_SlottedOrderedNode(self):
+        node = SlottedOrderedNode(name='root')
+        self.assertFalse(hasattr(node, '__dict__'))
+        node['b'] = SlottedOrderedNode()
+        node['a'] = SlottedOrderedNode()
+        self.assertEqual(list(node.keys()), ['b', 'a'])
+
+        copied = copy.copy(node)
+        self.assertTrue(copied['a'] is node['a'])
+
+        unpickled = pickle.loads(pickle.dumps(node))
+        self.checkOutput("""\
+        <class 'node.base.SlottedOrderedNode'>: root
+        __<class 'node.base.SlottedOrderedNode'>: b
+        __<class 'node.base.SlottedOrderedNode'>: a
+        """, unpickled.treerepr(prefix='_'))
+
+    def test_SlottedListNode(self):
+        node = SlottedListNode(name='listnode')
+        self.assertFalse(hasattr(node, '__dict__'))
+        node.insert(0, SlottedBaseNode())
+        node.insert(1, SlottedBaseNode())
+        self.checkOutput("""
+        <class 'node.base.SlottedListNode'>: listnode
+        __<class 'node.base.SlottedBaseNode'>: 0
+        __<class 'node.base.SlottedBaseNode'>: 1
+        """, node.treerepr(prefix='_'))
+
+    def test_SlottedNode(self):
+        node = SlottedNode(name='root')
+        self.assertFalse(hasattr(node, '__dict__'))
+        node['child'] = SlottedNode()
+        node.attrs['title'] = 'Title'
+        self.assertEqual(node.attrs['title'], 'Title')
+        self.assertTrue(node.node(node['child'].uuid) is node['child'])
+
+        node['other'] = SlottedNode()
+        node.swap(node['child'], node['other'])
+        self.assertEqual(list(node.keys()), ['other', 'child'])
+
+        unpickled = pickle.loads(pickle.dumps(node))
+        self.assertEqual(unpickled.attrs['title'], 'Title')
+        self.assertEqual(unpickled['child'].uuid, node['child'].uuid)
+
+        # Custom slotted nodes
+        @plumbing(
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CustomSlottedNode(NodeSlots):
+            __slots__ = ()
+
+        node = CustomSlottedNode(name='custom')
+        node['child'] = CustomSlottedNode()
+        self.assertEqual(list(node.keys()), ['child'])
+        self.assertFalse(hasattr(node, '__dict__'))
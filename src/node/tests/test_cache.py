@@ -1,16 +1,50 @@
 from node.base import BaseNode
+from node.behaviors import cache
 from node.behaviors import Cache
+from node.behaviors import cache_manager
+from node.behaviors import cache_report
+from node.behaviors import CacheManager
+from node.behaviors import CacheStats
 from node.behaviors import ChildFactory
 from node.behaviors import DefaultInit
 from node.behaviors import Invalidate
+from node.behaviors import ListStorage
+from node.behaviors import LRUCache
 from node.behaviors import MappingAdopt
 from node.behaviors import MappingNode
 from node.behaviors import OdictStorage
+from node.behaviors import SequenceNode
 from node.behaviors import VolatileStorageInvalidate
 from node.interfaces import ICache
 from node.interfaces import IInvalidate
 from node.tests import NodeTestCase
+from node.tests import patch
+from odict import odict
 from plumber import plumbing
+import gc
+import threading
+import weakref
+
+
+class CountingOdict(odict):
+    iterations = 0
+
+    def __iter__(self):
+        CountingOdict.iterations += 1
+        return super(CountingOdict, self).__iter__()
+
+
+class MockTime(object):
+    now = 0.
+
+    @classmethod
+    def monotonic(cls):
+        return cls.now
+
+    @classmethod
+    def perf_counter(cls):
+        cls.now += .5
+        return cls.now
 
 
 class TestCache(NodeTestCase):
@@ -233,3 +267,702 @@ class TestCache(NodeTestCase):
         self.assertEqual(root.treerepr(), (
             '<class \'node.tests.test_cache.Node\'>: None\n'
         ))
+
+    def test_LRUCache(self):
+        lru = LRUCache(maxsize=2)
+        self.assertEqual(lru, {})
+        self.assertEqual(len(lru), 0)
+
+        lru['a'] = 1
+        lru['b'] = 2
+        self.assertEqual(lru['a'], 1)
+        self.assertEqual((lru.hits, lru.misses, lru.evictions), (1, 0, 0))
+
+        # 'b' is least recently used and gets evicted
+        lru['c'] = 3
+        self.assertEqual(list(lru.keys()), ['a', 'c'])
+        self.assertEqual(lru.items(), [('a', 1), ('c', 3)])
+        self.assertEqual(lru.values(), [1, 3])
+        self.assertEqual(lru.evictions, 1)
+
+        with self.assertRaises(KeyError):
+            lru['b']
+        self.assertEqual(lru.misses, 1)
+
+        # containment check neither counts nor touches recent usage
+        self.assertTrue('a' in lru)
+        self.assertFalse('b' in lru)
+        self.assertEqual((lru.hits, lru.misses), (1, 1))
+
+        # overwriting marks entry as recently used
+        lru['a'] = 4
+        lru['d'] = 5
+        self.assertEqual(lru, {'a': 4, 'd': 5})
+        self.assertEqual(lru.evictions, 2)
+
+        del lru['a']
+        self.assertEqual(list(lru), ['d'])
+        lru.clear()
+        self.assertEqual(len(lru), 0)
+        self.assertEqual(repr(lru), '<LRUCache maxsize=2 ttl=None entries=0>')
+
+        # size limit of 0 disables caching
+        lru = LRUCache(maxsize=0)
+        lru['a'] = 1
+        self.assertEqual(len(lru), 0)
+        self.assertEqual(lru.evictions, 1)
+
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=-1)
+
+    @patch(cache, 'time', MockTime)
+    def test_LRUCache_ttl(self):
+        MockTime.now = 0.
+        lru = LRUCache(ttl=10)
+        lru['a'] = 1
+        MockTime.now = 5.
+        lru['b'] = 2
+        self.assertEqual(lru['a'], 1)
+
+        MockTime.now = 11.
+        # containment check considers expiry without evicting
+        self.assertFalse('a' in lru)
+        self.assertTrue('b' in lru)
+        self.assertEqual(len(lru), 2)
+        with self.assertRaises(KeyError):
+            lru['a']
+        self.assertEqual(lru['b'], 2)
+        self.assertEqual(list(lru), ['b'])
+        self.assertEqual((lru.hits, lru.misses, lru.evictions), (2, 1, 1))
+
+    def test_Cache_bounded(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class BoundedNode(object):
+            cache_maxsize = 2
+
+        root = BoundedNode()
+        self.assertIsInstance(root.cache, LRUCache)
+        self.assertEqual(root.cache.maxsize, 2)
+        self.assertEqual(root.cache.ttl, None)
+
+        root['c1'] = BoundedNode()
+        root['c2'] = BoundedNode()
+        root['c3'] = BoundedNode()
+        self.assertEqual(len(root.cache), 0)
+
+        c1 = root['c1']
+        self.assertTrue(root['c1'] is c1)
+        root['c2']
+        root['c3']
+        self.assertEqual(list(root.cache), ['c2', 'c3'])
+        self.assertEqual(root.cache.hits, 1)
+        self.assertEqual(root.cache.misses, 3)
+        self.assertEqual(root.cache.evictions, 1)
+
+        # evicted child is read from storage again
+        self.assertTrue(root['c1'] is c1)
+        self.assertEqual(list(root.cache), ['c3', 'c1'])
+
+        # invalidation still works
+        root.invalidate(key='c3')
+        self.assertEqual(list(root.cache), ['c1'])
+        self.assertEqual(sorted(root.keys()), ['c1', 'c2'])
+
+        root.invalidate()
+        self.assertEqual(len(root.cache), 0)
+        self.assertEqual(list(root.keys()), [])
+
+        # missing children are not cached
+        with self.assertRaises(KeyError):
+            root['c1']
+        self.assertEqual(len(root.cache), 0)
+
+        # default cache is unbounded dict
+        @plumbing(
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class UnboundedNode(object):
+            pass
+
+        self.assertEqual(type(UnboundedNode().cache), dict)
+
+    @patch(cache, 'time', MockTime)
+    def test_cache_stats(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            pass
+
+        MockTime.now = 0.
+        root = CachingNode()
+        self.assertIsInstance(root.cache_stats, CacheStats)
+        self.assertEqual(root.cache_stats.average_load_time, 0.)
+
+        root['c1'] = CachingNode()
+        root['c2'] = CachingNode()
+        root['c1']
+        root['c1']
+        root['c2']
+        with self.assertRaises(KeyError):
+            root['c3']
+
+        info = root.cache_info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 3)
+        self.assertEqual(info['loads'], 3)
+        self.assertEqual(info['load_time'], 1.5)
+        self.assertEqual(info['average_load_time'], .5)
+        self.assertEqual(info['evictions'], 0)
+        self.assertEqual(info['invalidations'], 0)
+        self.assertEqual(info['entries'], 2)
+        self.assertTrue(info['memory'] > 0)
+
+        root.invalidate('c1')
+        with self.assertRaises(KeyError):
+            root.invalidate('c1')
+        self.assertEqual(root.cache_info()['invalidations'], 1)
+        root.invalidate()
+        self.assertEqual(root.cache_info()['invalidations'], 2)
+        self.assertEqual(root.cache_info()['entries'], 0)
+
+        root.cache_stats.reset()
+        self.assertEqual(root.cache_stats.hits, 0)
+        self.assertEqual(root.cache_stats.loads, 0)
+
+    @patch(cache, 'time', MockTime)
+    def test_cache_report(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            cache_maxsize = 1
+
+        @plumbing(
+            DefaultInit,
+            SequenceNode,
+            ListStorage)
+        class SequenceContainer(object):
+            pass
+
+        MockTime.now = 0.
+        root = BaseNode()
+        root['a'] = CachingNode()
+        root['a']['x'] = CachingNode()
+        root['a']['y'] = CachingNode()
+        root['b'] = SequenceContainer()
+        root['b'].append(CachingNode())
+        root['b'].append('no node')
+        root['b'][0]['z'] = CachingNode()
+
+        root['a']['x']['1'] = CachingNode()
+        root['a']['x']['1']
+        root['a']['x']['1']
+        root['a']['y']
+        root['b'][0]['z']
+
+        report = cache_report(root)
+        self.assertEqual(report['nodes'], 4)
+        self.assertEqual(report['hits'], 2)
+        self.assertEqual(report['misses'], 3)
+        self.assertEqual(report['evictions'], 1)
+        self.assertEqual(report['invalidations'], 0)
+        self.assertEqual(report['loads'], 3)
+        self.assertEqual(report['entries'], 2)
+        self.assertEqual(report['average_load_time'], .5)
+        self.assertEqual(report['hit_ratio'], .4)
+        self.assertTrue(report['memory'] > 0)
+
+        # evicted child 'x' is not part of the report
+        self.assertEqual(list(root['a'].cache), ['y'])
+
+        report = cache_report(BaseNode())
+        self.assertEqual(report['nodes'], 0)
+        self.assertEqual(report['hit_ratio'], 0.)
+        self.assertEqual(report['average_load_time'], 0.)
+
+    def test_CacheManager(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            pass
+
+        root = CachingNode()
+        root['a'] = CachingNode()
+        root['b'] = CachingNode()
+        root['a']['x'] = CachingNode()
+        root['a']['y'] = CachingNode()
+        root['b']['z'] = CachingNode()
+
+        self.assertEqual(cache_manager(root), None)
+        self.assertEqual(cache_manager(root['a']), None)
+
+        # children cached before manager was set are not registered
+        manager = CacheManager(root['a'], max_entries=3)
+        self.assertTrue(root._cache_manager is manager)
+        self.assertTrue(cache_manager(root) is manager)
+        self.assertEqual(len(manager), 0)
+
+        root.cache.clear()
+        self.assertTrue(cache_manager(root['a']) is manager)
+        self.assertEqual(len(manager), 1)
+        self.assertEqual(manager.size, manager._entries[(id(root), 'a')][2])
+
+        root['a']['x']
+        root['a']['y']
+        self.assertEqual(len(manager), 3)
+        self.assertEqual(manager.evictions, 0)
+
+        # inspect caches via storage to not touch the cache manager
+        a = root.storage['a']
+        b = root.storage['b']
+
+        # least recently used entries 'x' and 'a' get evicted, cached
+        # children of evicted nodes get unregistered
+        root['b']['z']
+        self.assertEqual(len(manager), 2)
+        self.assertEqual(manager.evictions, 2)
+        self.assertEqual(list(root.cache), ['b'])
+        self.assertEqual(list(b.cache), ['z'])
+        self.assertFalse((id(a), 'y') in manager._entries)
+
+        # hits mark entries recently used, 'b' is kept while 'z' gets evicted
+        root['a']
+        root['b']['w'] = CachingNode()
+        root['b']['w']
+        self.assertEqual(manager.evictions, 3)
+        self.assertEqual(list(root.cache), ['b', 'a'])
+        self.assertEqual(list(b.cache), ['w'])
+
+        # setting, deleting and invalidating unregisters entries
+        self.assertEqual(len(manager), 3)
+        root['b']['w'] = CachingNode()
+        self.assertEqual(len(manager), 2)
+        root['b']['w']
+        self.assertEqual(len(manager), 3)
+        root['b'].invalidate()
+        self.assertEqual(len(manager), 2)
+        del root['a']
+        self.assertEqual(len(manager), 1)
+        root.invalidate()
+        self.assertEqual(len(manager), 0)
+        self.assertEqual(manager.size, 0)
+
+        # cached subtrees of deleted and invalidated children are unregistered
+        root = CachingNode()
+        manager = CacheManager(root)
+        root['a'] = CachingNode()
+        root['a']['x'] = CachingNode()
+        root['a']['x']['1'] = CachingNode()
+        root['b'] = CachingNode()
+        root['b']['y'] = CachingNode()
+        root['a']['x']['1']
+        root['b']['y']
+        self.assertEqual(len(manager), 5)
+        a = weakref.ref(root['a'])
+        del root['a']
+        gc.collect()
+        self.assertTrue(a() is None)
+        self.assertEqual(len(manager), 2)
+        root.invalidate()
+        self.assertEqual(len(manager), 0)
+        self.assertEqual(manager.size, 0)
+        self.assertEqual(manager._node_keys, {})
+
+        # budget by estimated memory
+        root = CachingNode()
+        root['a'] = CachingNode()
+        root['b'] = CachingNode()
+        manager = CacheManager(root, max_bytes=1)
+        root['a']
+        self.assertEqual(len(root.cache), 0)
+        self.assertEqual(manager.evictions, 1)
+        self.assertEqual(manager.size, 0)
+
+    def test_CacheManager_with_LRUCache(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            cache_maxsize = 1
+
+        root = CachingNode()
+        root['a'] = CachingNode()
+        root['b'] = CachingNode()
+        manager = CacheManager(root, max_entries=10)
+        root['a']
+        root['b']
+        # eviction by node cache unregisters entry from manager
+        self.assertEqual(list(root.cache), ['b'])
+        self.assertEqual(len(manager), 1)
+        self.assertEqual(manager.evictions, 0)
+        self.assertEqual(root.cache.evictions, 1)
+
+    def test_cache_keys(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class KeyCachingNode(object):
+            cache_keys = True
+
+            def __init__(self, name=None, parent=None):
+                self.__name__ = name
+                self.__parent__ = parent
+                self._storage = CountingOdict()
+
+        root = KeyCachingNode()
+        root['a'] = KeyCachingNode()
+        root['b'] = KeyCachingNode()
+        CountingOdict.iterations = 0
+
+        self.assertEqual(list(root), ['a', 'b'])
+        self.assertEqual(len(root), 2)
+        self.assertEqual(root.keys(), ['a', 'b'])
+        self.assertEqual([v.name for v in root.values()], ['a', 'b'])
+        self.assertEqual([k for k, _ in root.items()], ['a', 'b'])
+        self.assertEqual(CountingOdict.iterations, 1)
+
+        # length first fills key cache
+        root.invalidate('a')
+        root._key_cache = None
+        self.assertEqual(len(root), 1)
+        self.assertEqual(CountingOdict.iterations, 2)
+
+        # overwriting existing key keeps key cache
+        root['b'] = KeyCachingNode()
+        self.assertEqual(list(root), ['b'])
+        self.assertEqual(CountingOdict.iterations, 2)
+
+        # adding new key reloads keys
+        root['c'] = KeyCachingNode()
+        self.assertEqual(list(root), ['b', 'c'])
+        self.assertEqual(len(root), 2)
+        self.assertEqual(CountingOdict.iterations, 3)
+
+        # deleting removes key from key cache
+        del root['b']
+        self.assertEqual(list(root), ['c'])
+        self.assertEqual(len(root), 1)
+        self.assertEqual(CountingOdict.iterations, 3)
+
+        # invalidating all children resets key cache
+        root.invalidate()
+        self.assertEqual(list(root), [])
+        self.assertEqual(len(root), 0)
+        self.assertEqual(CountingOdict.iterations, 4)
+
+        # keys deleted on storage by downstream invalidation are reloaded
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            VolatileStorageInvalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class VolatileNode(object):
+            cache_keys = True
+
+        node = VolatileNode()
+        node['a'] = VolatileNode()
+        self.assertEqual(len(node), 1)
+        node.invalidate()
+        self.assertEqual(len(node), 0)
+
+        node['a'] = VolatileNode()
+        node['b'] = VolatileNode()
+        self.assertEqual(list(node), ['a', 'b'])
+        node.invalidate('a')
+        self.assertEqual(list(node), ['b'])
+        self.assertEqual(len(node), 1)
+
+        # keys are not cached by default
+        @plumbing(
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            pass
+
+        node = CachingNode()
+        node['a'] = 1
+        self.assertEqual(list(node), ['a'])
+        self.assertEqual(len(node), 1)
+        self.assertEqual(node._key_cache, None)
+
+    def test_cache_misses(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            cache_misses = 2
+
+            def __init__(self, name=None, parent=None):
+                self.__name__ = name
+                self.__parent__ = parent
+                self.lookups = []
+
+            def __getitem__(self, key):
+                # records lookups reaching the storage
+                self.lookups.append(key)
+                return self.storage[key]
+
+        root = CachingNode()
+        self.assertIsInstance(root.negative_cache, LRUCache)
+        self.assertEqual(root.negative_cache.maxsize, 2)
+
+        with self.assertRaises(KeyError):
+            root['a']
+        with self.assertRaises(KeyError):
+            root['a']
+        self.assertFalse('a' in root)
+        self.assertEqual(root.get('a', 'default'), 'default')
+        self.assertEqual(root.lookups, ['a'])
+        self.assertEqual(list(root.negative_cache), ['a'])
+
+        info = root.cache_info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['negative_hits'], 3)
+
+        # negative cache is bounded
+        root.get('b')
+        root.get('c')
+        self.assertEqual(list(root.negative_cache), ['b', 'c'])
+        root.get('a')
+        self.assertEqual(root.lookups, ['a', 'b', 'c', 'a'])
+
+        # setting item clears negative cache entry
+        root['c'] = CachingNode()
+        self.assertEqual(list(root.negative_cache), ['a'])
+        self.assertTrue('c' in root)
+
+        # invalidating clears negative cache
+        with self.assertRaises(KeyError):
+            root.invalidate('a')
+        self.assertEqual(list(root.negative_cache), [])
+        root.get('x')
+        root.get('y')
+        root.invalidate()
+        self.assertEqual(len(root.negative_cache), 0)
+
+        # deleting does not remember key as missing
+        root['z'] = CachingNode()
+        del root['z']
+        self.assertEqual(len(root.negative_cache), 0)
+        self.assertFalse('z' in root)
+        self.assertEqual(list(root.negative_cache), ['z'])
+
+        # missing children are not remembered by default
+        @plumbing(
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class DefaultCachingNode(object):
+            pass
+
+        node = DefaultCachingNode()
+        self.assertFalse('a' in node)
+        self.assertFalse('_negative_cache' in node.__dict__)
+
+    def test_prefetch(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            cache_misses = 10
+
+            def __init__(self, name=None, parent=None):
+                self.__name__ = name
+                self.__parent__ = parent
+                self.lookups = []
+
+            def __getitem__(self, key):
+                # records lookups reaching the storage and the loading thread
+                self.lookups.append((key, threading.current_thread().name))
+                return self.storage[key]
+
+        root = CachingNode()
+        for key in ['a', 'b', 'c', 'd']:
+            root[key] = CachingNode()
+        root['a']['x'] = CachingNode()
+        root['a']['x']['1'] = CachingNode()
+        root.cache.clear()
+        root.cache_stats.reset()
+        del root.lookups[:]
+
+        # serial prefetch
+        root['a']
+        root.prefetch(['a', 'b', 'b', 'missing'])
+        self.assertEqual(sorted(root.cache), ['a', 'b'])
+        self.assertEqual(
+            [key for key, _ in root.lookups],
+            ['a', 'b', 'missing']
+        )
+        self.assertEqual(list(root.negative_cache), ['missing'])
+        self.assertEqual(root.cache_stats.misses, 3)
+
+        # prefetch with thread pool
+        main_thread = threading.current_thread().name
+        del root.lookups[:]
+        root.cache_stats.reset()
+        root.prefetch(['a', 'c', 'd', 'other'], workers=2)
+        self.assertEqual(sorted(root.cache), ['a', 'b', 'c', 'd'])
+        self.assertEqual(
+            sorted([key for key, _ in root.lookups]),
+            ['c', 'd', 'other']
+        )
+        self.assertFalse(main_thread in [name for _, name in root.lookups])
+        self.assertEqual(sorted(root.negative_cache), ['missing', 'other'])
+        self.assertEqual(root.cache_stats.misses, 3)
+        self.assertEqual(root.cache_stats.loads, 3)
+        self.assertTrue(root['c'] is root.storage['c'])
+        self.assertEqual(root['c'].name, 'c')
+        self.assertEqual(root.cache_stats.hits, 2)
+
+        # prefetched children are served from cache afterwards
+        self.assertTrue(root.storage['a'] is root['a'])
+        root['a'].cache.clear()
+        root['a'].prefetch(['x'], workers=1)
+        self.assertEqual(list(root['a'].cache), ['x'])
+        self.assertEqual(root['a'].lookups[-1][0], 'x')
+        del root['a'].lookups[:]
+        root['a']['x']
+        self.assertEqual(root['a'].lookups, [])
+
+        # nothing to prefetch
+        root.prefetch(['a', 'b'], workers=2)
+        self.assertEqual(root.cache_stats.loads, 3)
+
+    @patch(cache, 'time', MockTime)
+    def test_prefetch_ttl(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            cache_ttl = 10
+
+        MockTime.now = 0.
+        root = CachingNode()
+        root['a'] = CachingNode()
+        root['b'] = CachingNode()
+        root.prefetch(['a', 'b'])
+        self.assertEqual(root.cache_stats.loads, 2)
+
+        # cached entries are skipped without counting lookups
+        counters = (root.cache.hits, root.cache.misses)
+        root.prefetch(['a', 'b'])
+        self.assertEqual(root.cache_stats.loads, 2)
+        self.assertEqual((root.cache.hits, root.cache.misses), counters)
+
+        # expired entries are loaded again
+        MockTime.now = 20.
+        root.prefetch(['a', 'b'])
+        self.assertEqual(root.cache_stats.loads, 4)
+        self.assertEqual(sorted(root.cache), ['a', 'b'])
+
+    def test_prefetch_cache_loader(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class BulkLoadingNode(object):
+            cache_misses = 10
+            bulk_loads = []
+
+            def cache_loader(self, keys):
+                self.bulk_loads.append(keys)
+                storage = self.storage
+                return [(key, storage[key]) for key in keys if key in storage]
+
+        root = BulkLoadingNode()
+        root['a'] = BulkLoadingNode()
+        root['b'] = BulkLoadingNode()
+        root['a']
+        root.prefetch(['a', 'b', 'c'])
+        self.assertEqual(BulkLoadingNode.bulk_loads, [['b', 'c']])
+        self.assertEqual(list(root.cache), ['a', 'b'])
+        self.assertEqual(list(root.negative_cache), ['c'])
+        self.assertEqual(root.cache_stats.loads, 3)
+
+    def test_warm(self):
+        @plumbing(
+            MappingAdopt,
+            Cache,
+            Invalidate,
+            DefaultInit,
+            MappingNode,
+            OdictStorage)
+        class CachingNode(object):
+            pass
+
+        root = CachingNode()
+        root['a'] = CachingNode()
+        root['a']['x'] = CachingNode()
+        root['a']['x']['1'] = CachingNode()
+        root['b'] = BaseNode()
+        root['b']['y'] = BaseNode()
+
+        def clear(node):
+            node.cache.clear()
+            for child in node.storage.values():
+                if hasattr(child, 'cache'):
+                    clear(child)
+
+        clear(root)
+        root.warm()
+        self.assertEqual(list(root.cache), ['a', 'b'])
+        self.assertEqual(list(root.storage['a'].cache), [])
+
+        clear(root)
+        root.warm(depth=3, workers=2)
+        self.assertEqual(list(root.cache), ['a', 'b'])
+        self.assertEqual(list(root.storage['a'].cache), ['x'])
+        self.assertEqual(list(root.storage['a'].storage['x'].cache), ['1'])
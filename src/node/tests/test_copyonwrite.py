@@ -0,0 +1,284 @@
+from node.base import BaseNode
+from node.behaviors import Attributes
+from node.behaviors import CopyOnWrite
+from node.behaviors import DefaultInit
+from node.behaviors import IndexViolationError
+from node.behaviors import MappingAdopt
+from node.behaviors import MappingNode
+from node.behaviors import MappingOrder
+from node.behaviors import MappingReference
+from node.behaviors import Nodespaces
+from node.behaviors import OdictStorage
+from node.behaviors import UUIDAware
+from node.interfaces import ICopyOnWrite
+from node.locking import TreeLock
+from node.tests import NodeTestCase
+from node.utils import ReadOnlyView
+from plumber import plumbing
+import copy
+import pickle
+import threading
+
+
+###############################################################################
+# Mock objects
+###############################################################################
+
+@plumbing(
+    CopyOnWrite,
+    Attributes,
+    Nodespaces,
+    MappingAdopt,
+    MappingOrder,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class CopyOnWriteNode(object):
+    pass
+
+
+@plumbing(
+    CopyOnWrite,
+    MappingAdopt,
+    MappingReference,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class CopyOnWriteReferenceNode(object):
+    pass
+
+
+@plumbing(
+    CopyOnWrite,
+    MappingAdopt,
+    MappingReference,
+    DefaultInit,
+    MappingNode,
+    OdictStorage,
+    UUIDAware)
+class CopyOnWriteUUIDNode(object):
+    pass
+
+
+def create_tree(factory):
+    root = factory(name='root')
+    for name in ['a', 'b']:
+        child = root[name] = factory()
+        child['c'] = factory()
+    return root
+
+
+###############################################################################
+# Tests
+###############################################################################
+
+class TestCopyOnWrite(NodeTestCase):
+
+    def test_deepcopy(self):
+        root = create_tree(CopyOnWriteNode)
+        self.assertTrue(ICopyOnWrite.providedBy(root))
+
+        # copy shares storage until first access
+        copied = root.deepcopy()
+        self.assertFalse(copied is root)
+        self.assertTrue(copied.storage is root.storage)
+        self.assertEqual(copied.name, 'root')
+        self.assertEqual(list(copied.keys()), ['a', 'b'])
+
+        # children get cloned on access
+        child = copied['a']
+        self.assertFalse(copied.storage is root.storage)
+        self.assertFalse(child is root['a'])
+        self.assertTrue(child.parent is copied)
+        self.assertTrue(child.storage is root['a'].storage)
+        self.assertTrue(root['a'].parent is root)
+
+        # immutable values are shared
+        root['a']['title'] = 'A'
+        copied = root.deepcopy()
+        self.assertTrue(copied.storage is root.storage)
+        self.assertTrue(copied['a']['title'] is root['a']['title'])
+        del root['a']['title']
+
+        # storages containing mutable values not supporting copy on write,
+        # which were handed out or set, are copied at copy time
+        root['a']['value'] = [1]
+        root['b']['leaf'] = BaseNode()
+        copied = root.deepcopy()
+        self.assertFalse(copied.storage is root.storage)
+        child = copied['a']
+
+        # writes on copy do not touch original
+        child['d'] = CopyOnWriteNode()
+        child['value'].append(2)
+        del copied['b']['c']
+        self.assertEqual(list(child.keys()), ['c', 'value', 'd'])
+        self.assertEqual(list(root['a'].keys()), ['c', 'value'])
+        self.assertEqual(root['a']['value'], [1])
+        self.assertEqual(list(root['b'].keys()), ['c', 'leaf'])
+
+        # children not supporting copy on write are deep copied
+        self.assertFalse(copied['b']['leaf'] is root['b']['leaf'])
+        self.assertTrue(copied['b']['leaf'].parent is copied['b'])
+
+        # writes on original do not touch copy, also if node was fetched
+        # before copying
+        node = root['b']['c']
+        copied = root.deepcopy()
+        node['e'] = CopyOnWriteNode()
+        root.movefirst('b')
+        self.assertEqual(list(root.keys()), ['b', 'a'])
+        self.assertEqual(list(copied.keys()), ['a', 'b'])
+        self.assertEqual(list(root['b']['c'].keys()), ['e'])
+        self.assertEqual(list(copied['b']['c'].keys()), [])
+
+        # values not supporting copy on write are copied at copy time
+        leaf = root['b']['leaf']
+        value = root['a']['value']
+        copied = root.deepcopy()
+        leaf['x'] = BaseNode()
+        value.append(3)
+        self.assertFalse('x' in copied['b']['leaf'])
+        self.assertEqual(copied['a']['value'], [1])
+        other = copied.deepcopy()
+        copied['a']['value'].append(4)
+        self.assertEqual(other['a']['value'], [1])
+        self.assertEqual(root['a']['value'], [1, 3])
+        root['a']['value'] = [1]
+        del root['b']['leaf']['x']
+        copied = root.deepcopy()
+
+        # copies of copies
+        other = copied.deepcopy()
+        copied['a']['f'] = CopyOnWriteNode()
+        self.assertEqual(list(copied['a'].keys()), ['c', 'value', 'f'])
+        self.assertEqual(list(other['a'].keys()), ['c', 'value'])
+
+        # attributes are copied
+        root.attrs['title'] = 'Root'
+        copied = root.deepcopy()
+        copied.attrs['title'] = 'Copy'
+        self.assertEqual(root.attrs['title'], 'Root')
+        self.assertTrue(copied.attrs.parent is copied)
+        self.assertTrue(copied.nodespaces['__children__'] is copied)
+
+    def test_UUIDAware(self):
+        root = create_tree(CopyOnWriteUUIDNode)
+        copied = root.deepcopy()
+        self.assertNotEqual(copied.uuid, root.uuid)
+        self.assertNotEqual(copied['a'].uuid, root['a'].uuid)
+        self.assertNotEqual(copied['a']['c'].uuid, root['a']['c'].uuid)
+
+        class NoRecursiveUUIDNode(CopyOnWriteUUIDNode):
+            overwrite_recursiv_on_copy = False
+
+        root = create_tree(NoRecursiveUUIDNode)
+        copied = root.deepcopy()
+        self.assertNotEqual(copied.uuid, root.uuid)
+        self.assertEqual(copied['a'].uuid, root['a'].uuid)
+
+    def test_MappingReference(self):
+        root = create_tree(CopyOnWriteReferenceNode)
+        uuid = root['a']['c'].uuid
+        copied = root.deepcopy()
+
+        # index of copy gets completed if uuid not found
+        self.assertEqual(len(copied._index), 1)
+        node = copied.node(uuid)
+        self.assertTrue(node is copied['a']['c'])
+        self.assertFalse(node is root['a']['c'])
+        self.assertEqual(len(copied._index), 5)
+        self.assertTrue(root.node(uuid) is root['a']['c'])
+
+        del copied['a']
+        self.assertTrue(copied.node(uuid) is None)
+        self.assertTrue(root.node(uuid) is root['a']['c'])
+
+        # pending copies are completed before checking index collisions
+        copied = root.deepcopy()
+        with self.assertRaises(IndexViolationError):
+            copied['x'] = root.deepcopy()
+
+        # new uuids are set on cloned children if UUIDAware
+        root = create_tree(CopyOnWriteUUIDNode)
+        copied = root.deepcopy()
+        self.assertTrue(copied.node(root.uuid) is None)
+        node = copied['a']['c']
+        self.assertTrue(copied.node(node.uuid) is node)
+        self.assertTrue(root.node(node.uuid) is None)
+
+    def test_freeze(self):
+        root = create_tree(CopyOnWriteUUIDNode)
+        view = root.freeze()
+        self.assertTrue(isinstance(view, ReadOnlyView))
+        self.assertTrue(view._context.storage is root.storage)
+
+        # snapshots keep uuids
+        self.assertEqual(view.uuid, root.uuid)
+        self.assertEqual(view['a']['c'].uuid, root['a']['c'].uuid)
+        node = view.node(root['b']['c'].uuid)
+        self.assertTrue(isinstance(node, ReadOnlyView))
+        self.assertEqual(node.path, ['root', 'b', 'c'])
+
+        root['a']['d'] = CopyOnWriteUUIDNode()
+        self.assertEqual(list(view['a'].keys()), ['c'])
+        with self.assertRaises(TypeError):
+            view['a']['x'] = CopyOnWriteUUIDNode()
+
+        # copies of snapshots get new uuids
+        copied = view.deepcopy()
+        self.assertNotEqual(copied['b'].uuid, root['b'].uuid)
+
+    def test_pickle(self):
+        # writes store the tree lock on root, locked trees can be pickled
+        # and copied
+        root = create_tree(CopyOnWriteNode)
+        root['a']['value'] = [1]
+        self.assertTrue(root._treelock is not None)
+        copied = root.deepcopy()
+        self.assertTrue(copied._treelock is root._treelock)
+
+        unpickled = pickle.loads(pickle.dumps(root))
+        self.assertFalse(unpickled._treelock is root._treelock)
+        self.assertEqual(unpickled['a']['value'], [1])
+        unpickled['a']['value'].append(2)
+        self.assertEqual(root['a']['value'], [1])
+
+        unpickled = pickle.loads(pickle.dumps(copied))
+        self.assertEqual(list(unpickled['a'].keys()), ['c', 'value'])
+        with TreeLock(unpickled):
+            unpickled['a']['d'] = CopyOnWriteNode()
+        self.assertEqual(list(copied['a'].keys()), ['c', 'value'])
+
+        other = copy.deepcopy(root)
+        self.assertFalse(other._treelock is root._treelock)
+        self.assertEqual(other['a']['value'], [1])
+
+    def test_freeze_concurrent(self):
+        # writer moves values between children holding the tree lock, all
+        # snapshots see a consistent total
+        root = CopyOnWriteNode()
+        for i in range(10):
+            root[str(i)] = CopyOnWriteNode()
+            root[str(i)]['value'] = 10
+        stop = threading.Event()
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                source, target = str(i % 10), str((i * 7 + 3) % 10)
+                with TreeLock(root):
+                    root[source]['value'] -= 1
+                    root[target]['value'] += 1
+                i += 1
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(200):
+                view = root.freeze()
+                total = sum([view[key]['value'] for key in view])
+                self.assertEqual(total, 100)
+        finally:
+            stop.set()
+            writer.join()
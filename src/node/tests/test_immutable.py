@@ -0,0 +1,89 @@
+from node.base import BaseNode
+from node.base import ImmutableNode
+from node.interfaces import IImmutable
+from node.tests import NodeTestCase
+from node.utils import UNSET
+
+
+class TestImmutable(NodeTestCase):
+
+    def test_Immutable(self):
+        root = ImmutableNode(name='root')
+        self.assertTrue(IImmutable.providedBy(root))
+
+        # updates return new versions
+        version_1 = root.set('a', ImmutableNode())
+        version_1 = version_1.set(['a', 'b'], ImmutableNode())
+        version_1 = version_1.set(('a', 'b', 'value'), 1)
+        self.assertEqual(list(root.keys()), [])
+        self.assertEqual(version_1.name, 'root')
+        self.assertEqual(version_1['a']['b']['value'], 1)
+        self.checkOutput("""
+        <class 'node.base.ImmutableNode'>: root
+          <class 'node.base.ImmutableNode'>: a
+            <class 'node.base.ImmutableNode'>: b
+              value: 1
+        """, version_1.treerepr())
+
+        # untouched subtrees are shared
+        version_2 = version_1.set('c', ImmutableNode())
+        self.assertTrue(
+            version_2.storage['a'] is version_1.storage['a']
+        )
+        version_3 = version_2.set(['a', 'b', 'value'], 2)
+        self.assertTrue(
+            version_3.storage['c'] is version_2.storage['c']
+        )
+        self.assertEqual(version_2['a']['b']['value'], 1)
+        self.assertEqual(version_3['a']['b']['value'], 2)
+
+        # setting equal value returns same version
+        self.assertTrue(version_3.set(['a', 'b', 'value'], 2) is version_3)
+
+        # children are bound to parent they are read from
+        node = version_3['a']['b']
+        self.assertEqual(node.path, ['root', 'a', 'b'])
+        self.assertTrue(node.parent.parent is version_3)
+        self.assertTrue(version_2['a'].parent is version_2)
+
+        # nodes get named by key
+        version_4 = version_3.set('d', version_3['a'])
+        self.assertEqual(version_4['d'].name, 'd')
+        self.assertEqual(version_4['a'].name, 'a')
+
+        # delete
+        version_5 = version_4.delete(['a', 'b'])
+        self.assertEqual(list(version_5['a'].keys()), [])
+        self.assertEqual(list(version_4['a'].keys()), ['b'])
+        self.assertEqual(sorted(version_5.delete('d').keys()), ['a', 'c'])
+        with self.assertRaises(KeyError):
+            version_5.delete(['a', 'x'])
+        with self.assertRaises(KeyError):
+            version_5.set([], 1)
+
+        # diff
+        self.assertEqual(sorted(version_3.diff(version_1), key=str), [
+            (('a', 'b', 'value'), 2, 1),
+            (('c',), version_3.storage['c'], UNSET)
+        ])
+        self.assertEqual(list(version_5.diff(version_5)), [])
+
+        # in place modification is not supported
+        with self.assertRaises(TypeError) as arc:
+            version_5['x'] = 1
+        self.assertEqual(
+            str(arc.exception),
+            'Immutable node does not support item assignment'
+        )
+        with self.assertRaises(TypeError) as arc:
+            del version_5['a']
+        self.assertEqual(
+            str(arc.exception),
+            'Immutable node does not support item deletion'
+        )
+        with self.assertRaises(TypeError) as arc:
+            version_5.set('x', BaseNode())
+        self.assertEqual(
+            str(arc.exception),
+            'Only immutable nodes can be added'
+        )
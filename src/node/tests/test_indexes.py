@@ -0,0 +1,313 @@
+from node.base import BaseNode
+from node.behaviors import AttributeIndexes
+from node.behaviors import Attributes
+from node.behaviors import DefaultInit
+from node.behaviors import HashIndex
+from node.behaviors import MappingAdopt
+from node.behaviors import MappingNode
+from node.behaviors import OdictStorage
+from node.behaviors import PathIndex
+from node.behaviors import SortedIndex
+from node.interfaces import IAttributeIndexes
+from node.interfaces import IPathIndex
+from node.tests import NodeTestCase
+from node.utils import node_by_path
+from plumber import plumbing
+from zope.interface import Interface
+from zope.interface import alsoProvides
+import copy
+import functools
+import sys
+
+
+###############################################################################
+# Mock objects
+###############################################################################
+
+class IMarker(Interface):
+    pass
+
+
+@plumbing(
+    Attributes,
+    MappingAdopt,
+    AttributeIndexes,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class IndexedNode(object):
+    attribute_indexes = {
+        'email': HashIndex,
+        'size': SortedIndex,
+        'marker': functools.partial(
+            HashIndex,
+            key=lambda node: IMarker.providedBy(node)
+        )
+    }
+
+
+@plumbing(
+    MappingAdopt,
+    PathIndex,
+    DefaultInit,
+    MappingNode,
+    OdictStorage)
+class PathNode(object):
+    pass
+
+
+def create_node(email=None, size=None):
+    node = IndexedNode()
+    if email is not None:
+        node.attrs['email'] = email
+    if size is not None:
+        node.attrs['size'] = size
+    return node
+
+
+###############################################################################
+# Tests
+###############################################################################
+
+class TestIndexes(NodeTestCase):
+
+    def test_HashIndex(self):
+        index = HashIndex('email')
+        a = create_node(email='a@example.com')
+        b = create_node(email='a@example.com')
+        c = create_node()
+        for node in (a, b, c):
+            index.add(node)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(list(index), ['a@example.com'])
+        self.assertTrue('a@example.com' in index)
+        self.assertEqual(index.lookup('a@example.com'), [a, b])
+        self.assertEqual(index.lookup('b@example.com'), [])
+        self.assertEqual(repr(index), '<HashIndex \'email\' with 2 nodes>')
+
+        b.attrs['email'] = 'b@example.com'
+        index.update(b)
+        self.assertEqual(index.lookup('a@example.com'), [a])
+        self.assertEqual(index.lookup('b@example.com'), [b])
+
+        index.remove(a)
+        index.remove(c)
+        self.assertFalse('a@example.com' in index)
+        self.assertEqual(len(index), 1)
+
+        # values read from node attributes if no attributes behavior
+        index = HashIndex('name')
+        index.add(BaseNode(name='x'))
+        self.assertEqual(len(index.lookup('x')), 1)
+
+    def test_SortedIndex(self):
+        index = SortedIndex('size')
+        nodes = [create_node(size=size) for size in (5, 1, 3, 3, 9)]
+        for node in nodes:
+            index.add(node)
+        self.assertEqual(list(index), [1, 3, 5, 9])
+        self.assertEqual(index.lookup(3), [nodes[2], nodes[3]])
+        self.assertEqual(index.range(2, 5), nodes[2:4] + [nodes[0]])
+        self.assertEqual(
+            index.range(3, 9, inclusive=(False, False)),
+            [nodes[0]]
+        )
+        self.assertEqual(index.range(minimum=5, reverse=True), [
+            nodes[4], nodes[0]
+        ])
+        self.assertEqual(index.range(maximum=1), [nodes[1]])
+
+        index.remove(nodes[1])
+        self.assertEqual(list(index), [3, 5, 9])
+
+    def test_AttributeIndexes(self):
+        root = create_node()
+        self.assertTrue(IAttributeIndexes.providedBy(root))
+        root['a'] = create_node(email='a@example.com', size=2)
+        root['a']['b'] = create_node(email='b@example.com', size=4)
+
+        # indexes are built on first access and shared by tree
+        email = root['a'].index_by('email')
+        self.assertTrue(isinstance(email, HashIndex))
+        self.assertTrue(root.index_by('email') is email)
+        self.assertEqual(email.lookup('b@example.com'), [root['a']['b']])
+        size = root.index_by('size')
+        self.assertTrue(isinstance(size, SortedIndex))
+        self.assertEqual(size.range(1, 3), [root['a']])
+
+        # indexes get maintained when adding children
+        root['c'] = create_node(email='a@example.com', size=3)
+        self.assertEqual(email.lookup('a@example.com'), [root['a'], root['c']])
+        self.assertEqual(size.range(1, 3), [root['a'], root['c']])
+
+        # indexes of added subtrees are dropped
+        subtree = create_node(email='d@example.com')
+        subtree['e'] = create_node(email='e@example.com')
+        subtree.index_by('email')
+        root['d'] = subtree
+        self.assertTrue(subtree['e'].index_by('email') is email)
+        self.assertEqual(email.lookup('e@example.com'), [subtree['e']])
+
+        # overwritten children are removed from indexes
+        root['c'] = create_node(email='c@example.com')
+        self.assertEqual(email.lookup('a@example.com'), [root['a']])
+        self.assertEqual(email.lookup('c@example.com'), [root['c']])
+
+        # deleted and detached subtrees are removed from indexes
+        del root['d']
+        self.assertEqual(email.lookup('e@example.com'), [])
+        self.assertEqual(subtree['e']._tree_indexes, {})
+        detached = root.detach('a')
+        self.assertEqual(email.lookup('b@example.com'), [])
+        self.assertEqual(size.range(), [])
+        self.assertFalse(detached.index_by('email') is email)
+        self.assertEqual(
+            detached.index_by('email').lookup('b@example.com'),
+            [detached['b']]
+        )
+
+        # changed values require reindex
+        node = root['c']
+        node.attrs['email'] = 'x@example.com'
+        self.assertEqual(email.lookup('x@example.com'), [])
+        node.reindex()
+        self.assertEqual(email.lookup('c@example.com'), [])
+        self.assertEqual(email.lookup('x@example.com'), [node])
+
+        # setting indexed node again updates its entries
+        node.attrs['email'] = 'y@example.com'
+        root['c'] = node
+        self.assertEqual(email.lookup('x@example.com'), [])
+        self.assertEqual(email.lookup('y@example.com'), [node])
+        node.attrs['email'] = 'x@example.com'
+        root['c'] = node
+        self.assertEqual(email.lookup('y@example.com'), [])
+
+        # index by interface
+        marked = create_node()
+        alsoProvides(marked, IMarker)
+        root['marked'] = marked
+        marker = root.index_by('marker')
+        self.assertEqual(marker.lookup(True), [marked])
+        self.assertEqual(len(marker.lookup(False)), 2)
+
+        # undeclared index names and explicit factories
+        name = root.index_by('name', functools.partial(
+            SortedIndex,
+            key=lambda node: node.name
+        ))
+        self.assertTrue(isinstance(name, SortedIndex))
+        self.assertEqual(name.range('c', 'd'), [root['c']])
+        self.assertTrue(isinstance(root.index_by('other'), HashIndex))
+
+        # children with values which cannot be indexed are not added
+        with self.assertRaises(TypeError):
+            root['invalid'] = create_node(email=['x@example.com'])
+        invalid = create_node(size='old')
+        invalid['valid'] = create_node(email='v@example.com', size=1)
+        with self.assertRaises(TypeError):
+            root['invalid'] = invalid
+        self.assertFalse('invalid' in root)
+        self.assertEqual(email.lookup('v@example.com'), [])
+        self.assertEqual(len(size), 0)
+        self.assertEqual(invalid._tree_indexes, {})
+
+        # values must be comparable with already indexed ones
+        root['sized'] = create_node(size=1)
+        with self.assertRaises(TypeError):
+            root['invalid'] = create_node(size='old')
+        self.assertFalse('invalid' in root)
+        self.assertEqual(size.range(), [root['sized']])
+        del root['sized']
+
+        # children not providing the behavior are not indexed
+        root['plain'] = BaseNode()
+        self.assertEqual(len(name.lookup('plain')), 0)
+
+        # deep copies get copied indexes
+        copied = copy.deepcopy(root)
+        self.assertFalse(copied.index_by('email') is email)
+        self.assertEqual(
+            copied.index_by('email').lookup('x@example.com'),
+            [copied['c']]
+        )
+        del copied['c']
+        self.assertEqual(copied.index_by('email').lookup('x@example.com'), [])
+        self.assertEqual(email.lookup('x@example.com'), [root['c']])
+
+        # snapshots start without indexes
+        view = root.freeze()
+        self.assertEqual(view._context._tree_indexes, {})
+        self.assertTrue(view['c']._context._tree_indexes is
+                        view._context._tree_indexes)
+        self.assertEqual(email.lookup('x@example.com'), [root['c']])
+
+    def test_PathIndex(self):
+        root = PathNode(name='root')
+        self.assertTrue(IPathIndex.providedBy(root))
+        root['a'] = PathNode()
+        root['a']['b'] = PathNode()
+        root['a']['b']['c'] = PathNode()
+        node = root['a']['b']['c']
+
+        # paths are cached
+        self.assertEqual(node.path_tuple, ('root', 'a', 'b', 'c'))
+        self.assertEqual(node.path, ['root', 'a', 'b', 'c'])
+        self.assertEqual(node._path_tuple[1], ('root', 'a', 'b', 'c'))
+
+        # nodes are looked up in path index
+        self.assertTrue(root.node_by_path(['a', 'b', 'c']) is node)
+        self.assertTrue(root['a'].node_by_path(('b',)) is root['a']['b'])
+        self.assertTrue(root.node_by_path(['x']) is None)
+        self.assertTrue(node_by_path(root, 'a/b/c') is node)
+        self.assertTrue(node_by_path(root['a'], '/b/c') is node)
+
+        # lookup falls back to traversal for nodes not providing behavior
+        root['a']['plain'] = BaseNode()
+        root['a']['plain']['d'] = PathNode()
+        self.assertTrue(root.node_by_path(['a', 'plain']) is None)
+        self.assertTrue(
+            node_by_path(root, 'a/plain/d') is root['a']['plain']['d']
+        )
+        with self.assertRaises(KeyError):
+            node_by_path(root, 'a/x')
+
+        # moved subtrees get new paths
+        subtree = root['a'].detach('b')
+        self.assertEqual(subtree.path_tuple, ('b',))
+        self.assertEqual(node.path_tuple, ('b', 'c'))
+        self.assertTrue(root.node_by_path(['a', 'b', 'c']) is None)
+        self.assertTrue(subtree.node_by_path(['c']) is node)
+        root['x'] = subtree
+        self.assertEqual(node.path_tuple, ('root', 'x', 'c'))
+        self.assertTrue(root.node_by_path(['x', 'c']) is node)
+        self.assertEqual(sorted(root._path_index), [
+            (), ('a',), ('x',), ('x', 'c')
+        ])
+
+        # overwritten and deleted children are removed
+        root['x'] = PathNode()
+        self.assertTrue(root.node_by_path(['x', 'c']) is None)
+        self.assertTrue(subtree.node_by_path(['c']) is node)
+        del root['a']
+        self.assertEqual(sorted(root._path_index), [(), ('x',)])
+
+        # snapshots get own path index
+        view = root['x'].freeze()
+        self.assertEqual(list(view._context._path_index), [()])
+        self.assertEqual(view.path_tuple, ('root', 'x'))
+        self.assertEqual(sorted(root._path_index), [(), ('x',)])
+
+        # index root below node not providing behavior
+        plain = BaseNode(name='plain')
+        plain['root'] = root
+        self.assertEqual(root['x'].path, ['plain', 'root', 'x'])
+
+        # deep trees
+        depth = sys.getrecursionlimit() + 100
+        root = leaf = PathNode()
+        for _ in range(depth):
+            leaf['child'] = PathNode()
+            leaf = leaf['child']
+        self.assertEqual(len(leaf.path_tuple), depth + 1)
+        self.assertTrue(root.node_by_path(['child'] * depth) is leaf)
@@ -1,3 +1,6 @@
+from node.base import BaseNode
+from node.base import Node
+from node.behaviors import CacheManager
 from node.behaviors import DefaultInit
 from node.behaviors import DictStorage
 from node.behaviors import FullMapping
@@ -7,11 +10,15 @@ from node.behaviors import OdictStorage
 from node.interfaces import IContentishNode
 from node.interfaces import IMappingNode
 from node.interfaces import INode
+from node.locking import TreeLock
 from node.testing import FullMappingTester
+from node.utils import ReadOnlyView
 from node.tests import NodeTestCase
 from plumber import plumbing
 from zope.interface import alsoProvides
 from zope.interface import Interface
+import copy
+import pickle
 
 
 ###############################################################################
@@ -245,6 +252,70 @@ class TestMapping(NodeTestCase):
         __<class 'node.tests.test_mapping.MappingNode'>: subchild
         """, child.treerepr(prefix='_'))
 
+    def test_readonly_view(self):
+        root = MappingNode(name='root')
+        root['child'] = MappingNode()
+        view = root['child'].readonly_view()
+        self.assertTrue(isinstance(view, ReadOnlyView))
+        self.assertEqual(view.path, ['root', 'child'])
+        root['child']['sub'] = MappingNode()
+        self.assertEqual(view.keys(), ['sub'])
+        with self.assertRaises(TypeError):
+            view['x'] = MappingNode()
+
+    def test_freeze(self):
+        root = MappingNode(name='root')
+        child = root['child'] = MappingNode()
+        child['sub'] = MappingNode()
+        view = child.freeze()
+        self.assertTrue(isinstance(view, ReadOnlyView))
+        self.assertEqual(view.path, ['root', 'child'])
+        self.assertEqual(view.parent.name, 'root')
+
+        # snapshot is not affected by changes
+        child['other'] = MappingNode()
+        del child['sub']
+        self.assertEqual(view.keys(), ['sub'])
+        self.assertEqual(view['sub'].path, ['root', 'child', 'sub'])
+        self.assertEqual(root.keys(), ['child'])
+        with self.assertRaises(TypeError):
+            view['x'] = MappingNode()
+
+        # tree wide objects are not copied, snapshot gets own reference index
+        root = Node(name='root')
+        CacheManager(root)
+        for i in range(20):
+            child = root[str(i)] = Node()
+            for j in range(20):
+                child[str(j)] = Node()
+        node = root['0']['0']
+        view = root['0'].freeze()
+        self.assertEqual(len(view._context._index), 21)
+        self.assertEqual(len(root._index), 421)
+        frozen = view.node(node.uuid)
+        self.assertTrue(frozen._context is view['0']._context)
+        self.assertFalse(frozen._context is node)
+        self.assertTrue(view.node(root.uuid) is None)
+        self.assertTrue(root.node(node.uuid) is node)
+
+        # live tree stays picklable and copyable
+        root = BaseNode(name='root')
+        root['a'] = BaseNode()
+        root['a']['b'] = BaseNode()
+        root['a'].freeze()
+        self.assertFalse(hasattr(root, '_treelock'))
+        self.assertEqual(pickle.loads(pickle.dumps(root)).treerepr(),
+                         root.treerepr())
+        self.assertEqual(copy.deepcopy(root).treerepr(), root.treerepr())
+
+        # existing tree lock is acquired
+        with TreeLock(root):
+            view = root['a'].freeze()
+        self.assertEqual(view.keys(), ['b'])
+        self.assertEqual(pickle.loads(pickle.dumps(root)).treerepr(),
+                         root.treerepr())
+        self.assertEqual(copy.deepcopy(root).treerepr(), root.treerepr())
+
     def test_BC_imports(self):
         from node.behaviors import Nodify
         self.assertTrue(Nodify is MappingNodeBehavior)
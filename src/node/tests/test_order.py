@@ -1,3 +1,4 @@
+from node.behaviors import IndexedOdictStorage
 from node.behaviors import ListStorage
 from node.behaviors import MappingAdopt
 from node.behaviors import MappingNode
@@ -38,6 +39,16 @@ class OrderReferenceMappingNode(object):
     pass
 
 
+@plumbing(
+    NodeInit,
+    MappingAdopt,
+    MappingOrder,
+    MappingNode,
+    IndexedOdictStorage)
+class IndexedOrderableMappingNode(object):
+    pass
+
+
 @plumbing(
     NodeInit,
     SequenceAdopt,
@@ -434,6 +445,108 @@ class TestMappingOrder(NodeTestCase):
             node._index is node['child1']._index is node['child2']._index
         )
 
+    def test_reorder(self):
+        for factory in (OrderableMappingNode, IndexedOrderableMappingNode):
+            node = factory(name='root')
+            for name in ['a', 'b', 'c', 'd']:
+                node[name] = factory()
+            node.reorder(['d', node['b'], 'a', 'c'])
+            self.assertEqual(list(node.keys()), ['d', 'b', 'a', 'c'])
+            self.assertEqual(node.first_key, 'd')
+            self.assertEqual(node.next_key('b'), 'a')
+
+            with self.assertRaises(ValueError) as arc:
+                node.reorder(['a', 'b', 'c'])
+            self.assertEqual(
+                str(arc.exception),
+                'Given keys do not match keys of node'
+            )
+            with self.assertRaises(ValueError):
+                node.reorder(['a', 'b', 'c', 'x'])
+            with self.assertRaises(ValueError):
+                node.reorder(['a', 'b', 'c', 'c'])
+            self.assertEqual(list(node.keys()), ['d', 'b', 'a', 'c'])
+
+    def test_apply_order(self):
+        node = OrderableMappingNode(name='root')
+        for name in ['a', 'b', 'c', 'd', 'e']:
+            node[name] = OrderableMappingNode()
+
+        # only keys not in longest increasing subsequence get moved
+        self.assertEqual(node.apply_order(['b', 'c', 'd', 'e', 'a']), ['a'])
+        self.assertEqual(list(node.keys()), ['b', 'c', 'd', 'e', 'a'])
+        self.assertEqual(node.apply_order(['b', 'c', 'd', 'e', 'a']), [])
+        self.assertEqual(node.apply_order(['e', 'b', 'a', 'c', 'd']), ['e', 'a'])
+        self.assertEqual(list(node.keys()), ['e', 'b', 'a', 'c', 'd'])
+        self.assertEqual(
+            node.apply_order(['d', 'c', 'a', 'b', 'e']),
+            ['d', 'c', 'a', 'b']
+        )
+        self.assertEqual(list(node.keys()), ['d', 'c', 'a', 'b', 'e'])
+        with self.assertRaises(ValueError):
+            node.apply_order(['a'])
+
+        node = IndexedOrderableMappingNode(name='root')
+        self.assertEqual(node.apply_order([]), [])
+        for name in ['a', 'b', 'c']:
+            node[name] = IndexedOrderableMappingNode()
+        self.assertEqual(node.apply_order(['c', 'a', 'b']), ['c'])
+        self.assertEqual(node.slice_keys(), ['c', 'a', 'b'])
+
+    def test_insert_many(self):
+        for factory in (OrderableMappingNode, IndexedOrderableMappingNode):
+            node = factory(name='root')
+            node['a'] = factory()
+            node['b'] = factory()
+            node.insertbefore_many(
+                [factory(name='x'), factory(name='y')],
+                node['b']
+            )
+            self.assertEqual(list(node.keys()), ['a', 'x', 'y', 'b'])
+            node.insertafter_many([factory(name='z'), factory(name='w')], 'a')
+            self.assertEqual(
+                list(node.keys()),
+                ['a', 'z', 'w', 'x', 'y', 'b']
+            )
+            self.assertTrue(node['w'].parent is node)
+
+            with self.assertRaises(ValueError) as arc:
+                node.insertbefore_many([factory(name='v')], 'unknown')
+            self.assertEqual(
+                str(arc.exception),
+                'Given reference node not child of self.'
+            )
+            with self.assertRaises(KeyError):
+                node.insertbefore_many([factory(name='x')], 'a')
+            with self.assertRaises(KeyError) as arc:
+                node.insertbefore_many(
+                    [factory(name='v'), factory(name='v')],
+                    'a'
+                )
+            self.assertEqual(
+                str(arc.exception),
+                "'Given nodes contain duplicate names'"
+            )
+            with self.assertRaises(ValueError):
+                node.insertafter_many([factory()], 'a')
+            self.assertEqual(len(node), 6)
+
+        # nodes already set get removed if inserting fails
+        class FailingNode(OrderableMappingNode):
+            def __setitem__(self, key, value):
+                if key == 'fail':
+                    raise Exception('Failed')
+                super(FailingNode, self).__setitem__(key, value)
+
+        node = FailingNode(name='root')
+        node['a'] = OrderableMappingNode()
+        with self.assertRaises(Exception):
+            node.insertbefore_many([
+                OrderableMappingNode(name='b'),
+                OrderableMappingNode(name='fail')
+            ], 'a')
+        self.assertEqual(list(node.keys()), ['a'])
+
 
 class TestSequenceOrder(NodeTestCase):
 
@@ -945,3 +1058,38 @@ class TestSequenceOrder(NodeTestCase):
         from node.interfaces import IMappingOrder
         from node.interfaces import IOrder
         self.assertTrue(IOrder is IMappingOrder)
+
+    def test_insert_many(self):
+        node = OrderableSequenceNode(name='root')
+        child_0 = OrderableSequenceNode()
+        child_1 = OrderableSequenceNode()
+        node.extend([child_0, child_1])
+
+        child_2 = OrderableSequenceNode()
+        child_3 = OrderableSequenceNode()
+        node.insertbefore_many([child_2, child_3], child_1)
+        self.assertEqual(list(node), [child_0, child_2, child_3, child_1])
+
+        child_4 = OrderableSequenceNode()
+        node.insertafter_many([child_4], '3')
+        self.assertEqual(
+            list(node),
+            [child_0, child_2, child_3, child_1, child_4]
+        )
+        self.assertEqual(
+            [child.name for child in node],
+            ['0', '1', '2', '3', '4']
+        )
+
+        with self.assertRaises(ValueError) as arc:
+            node.insertbefore_many([child_0], child_1)
+        self.assertEqual(
+            str(arc.exception),
+            'Given node already child of self.'
+        )
+        child_5 = OrderableSequenceNode()
+        with self.assertRaises(ValueError):
+            node.insertafter_many([child_5, child_5], child_1)
+        with self.assertRaises(ValueError):
+            node.insertafter_many([child_5], '7')
+        self.assertEqual(len(node), 5)
@@ -1,3 +1,5 @@
+from node.base import SlottedNode
+from node.behaviors import audit_reference_index
 from node.behaviors import DefaultInit
 from node.behaviors import IndexViolationError
 from node.behaviors import ListStorage
@@ -11,12 +13,17 @@ from node.behaviors import OdictStorage
 from node.behaviors import SequenceAdopt
 from node.behaviors import SequenceNode
 from node.behaviors import SequenceReference
+from node.behaviors import WeakReferenceIndex
 from node.interfaces import IMappingReference
 from node.interfaces import INodeReference
 from node.interfaces import ISequenceReference
 from node.tests import NodeTestCase
 from plumber import plumbing
 from zope.interface.common.mapping import IReadMapping
+import copy
+import gc
+import pickle
+import sys
 import uuid
 
 
@@ -96,10 +103,12 @@ class TestReference(NodeTestCase):
         node_uuid = node.uuid
         self.assertIsInstance(node_uuid, uuid.UUID)
         self.assertTrue(node.index[int(node_uuid)] is node)
+        self.assertEqual(node._iuuid, int(node_uuid))
 
         node.uuid = uuid.uuid4()
         self.assertFalse(int(node_uuid) in node.index)
         self.assertTrue(int(node.uuid) in node.index)
+        self.assertEqual(node._iuuid, int(node.uuid))
 
         conflicting_uuid = uuid.uuid4()
         node._index[int(conflicting_uuid)] = ReferenceNode()
@@ -216,6 +225,16 @@ class TestReference(NodeTestCase):
             node._update_reference_index(valid)
         self.assertEqual(arc.exception.colliding, [node.uuid])
 
+        # colliding uuids are reported sorted
+        valid['other'] = ReferenceNode()
+        valid['other'].uuid = new.uuid
+        with self.assertRaises(IndexViolationError) as arc:
+            node._update_reference_index(valid)
+        self.assertEqual(
+            arc.exception.colliding,
+            sorted([node.uuid, new.uuid])
+        )
+
     def test__reduce_reference_index(self):
         node = ReferenceMappingNode(name='root')
 
@@ -242,6 +261,13 @@ class TestReference(NodeTestCase):
         self.assertTrue(int(sequence.uuid) in node._index)
         self.assertTrue(int(sequence[0].uuid) in node._index)
 
+        # removed entries are moved to new index of removed node
+        self.assertEqual(sorted(mapping._index), sorted([
+            int(mapping.uuid),
+            int(mapping['ref'].uuid)
+        ]))
+        self.assertTrue(mapping['ref']._index is mapping._index)
+
         node._reduce_reference_index(sequence)
         self.assertEqual(len(node._index), 1)
         self.assertTrue(int(node.uuid) in node._index)
@@ -538,6 +564,34 @@ class TestReference(NodeTestCase):
         del node['foo']
         self.assertEqual(len(node._index), 1)
 
+    def test_unpickle_without_iuuid(self):
+        # nodes pickled before ``_iuuid`` was introduced
+        root = ReferenceMappingNode(name='root')
+        root['a'] = ReferenceMappingNode()
+        root['a']['b'] = ReferenceNode()
+        for node in root._referencable_nodes:
+            del node.__dict__['_iuuid']
+        root = pickle.loads(pickle.dumps(root))
+        self.assertTrue(root['a']._iuuid is None)
+        node = root['a']['b']
+        self.assertTrue(root.node(node.uuid) is node)
+        del root['a']
+        self.assertEqual(list(root._index), [int(root.uuid)])
+        self.assertEqual(node._iuuid, int(node.uuid))
+        self.assertTrue(node.node(node.uuid) is node)
+        self.assertTrue(audit_reference_index(root)['consistent'])
+
+        # nodes using slots get ``_iuuid`` set to None on creation
+        root = SlottedNode()
+        root['a'] = SlottedNode()
+        for node in root._referencable_nodes:
+            node._iuuid = None
+        root = pickle.loads(pickle.dumps(root))
+        del root['a']
+        self.assertEqual(list(root._index), [int(root.uuid)])
+        root.uuid = uuid.uuid4()
+        self.assertEqual(list(root._index), [int(root.uuid)])
+
     def test_subtree(self):
         node = ReferenceMappingNode(name='root')
         self.assertEqual(len(node._index), 1)
@@ -572,6 +626,174 @@ class TestReference(NodeTestCase):
         self.assertEqual(len(mapping._index), 2)
         self.assertEqual(len(sequence._index), 2)
 
+    def test_insert_many(self):
+        sequence = ReferenceSequenceNode()
+        child_a = ReferenceNode()
+        child_b = ReferenceNode()
+        sequence.insert_many(0, [child_a, child_b, NoReferenceNode()])
+        self.assertEqual(len(sequence._index), 3)
+        self.assertTrue(sequence.node(child_b.uuid) is child_b)
+        self.assertTrue(child_a._index is sequence._index)
+
+        # Already member of tree
+        with self.assertRaises(IndexViolationError):
+            sequence.insert_many(0, [child_a])
+
+        # Colliding values within one batch revert the index
+        child_c = ReferenceNode()
+        child_d = ReferenceNode()
+        child_d.uuid = child_c.uuid
+        with self.assertRaises(IndexViolationError):
+            sequence.insert_many(0, [child_c, child_d])
+        self.assertEqual(len(sequence), 3)
+        self.assertEqual(len(sequence._index), 3)
+        self.assertEqual(sequence.node(child_c.uuid), None)
+        self.assertFalse(child_c._index is sequence._index)
+        self.assertEqual(list(child_c._index), [int(child_c.uuid)])
+
+        # Rollback with values not providing a reference index
+        child_e = ReferenceNode()
+        child_e.uuid = child_a.uuid
+        with self.assertRaises(IndexViolationError):
+            sequence.insert_many(1, [NoReferenceNode(), child_c, child_e])
+        self.assertEqual(len(sequence), 3)
+        self.assertEqual(len(sequence._index), 3)
+        self.assertEqual(sequence.node(child_c.uuid), None)
+        self.assertEqual(list(child_c._index), [int(child_c.uuid)])
+        self.assertTrue(child_c._index[int(child_c.uuid)] is child_c)
+
+    def test_deep_tree(self):
+        # index maintenance is not limited by recursion depth
+        depth = sys.getrecursionlimit() * 2
+        root = ReferenceMappingNode(name='root')
+        child = ReferenceMappingNode()
+        node = child
+        for _ in range(depth):
+            node['child'] = ReferenceMappingNode()
+            node = node['child']
+        self.assertEqual(len(child._index), depth + 1)
+        self.assertEqual(len(child._recursiv_reference_keys), depth + 1)
+
+        root['child'] = child
+        self.assertEqual(len(root._index), depth + 2)
+        self.assertTrue(node._index is root._index)
+
+        # colliding uuid deep in subtree
+        other = ReferenceMappingNode()
+        other['child'] = ReferenceMappingNode()
+        other['child'].uuid = node.uuid
+        with self.assertRaises(IndexViolationError) as arc:
+            root['other'] = other
+        self.assertEqual(arc.exception.colliding, [node.uuid])
+        self.assertEqual(len(root._index), depth + 2)
+
+        detached = root.detach('child')
+        self.assertEqual(len(root._index), 1)
+        self.assertEqual(len(detached._index), depth + 1)
+        self.assertTrue(node._index is detached._index)
+
+    def test_WeakReferenceIndex(self):
+        index = WeakReferenceIndex()
+        removed = []
+        index.callbacks.append(removed.append)
+        node = ReferenceNode()
+        other = ReferenceNode()
+        index[1] = node
+        index[2] = other
+        self.assertTrue(index[1] is node)
+        self.assertTrue(1 in index)
+        self.assertEqual(sorted(index), [1, 2])
+        self.assertEqual(sorted(index.keys() & {2, 3}), [2])
+        self.assertEqual(repr(index), '<WeakReferenceIndex with 2 entries>')
+
+        # entries of garbage collected nodes get removed
+        del other
+        gc.collect()
+        self.assertEqual(len(index), 1)
+        self.assertFalse(2 in index)
+        with self.assertRaises(KeyError):
+            index[2]
+        self.assertEqual(removed, [2])
+
+        # removed or replaced entries do not trigger callbacks
+        index[3] = ReferenceNode()
+        index[3] = node
+        del index[1]
+        gc.collect()
+        self.assertEqual(list(index.items()), [(3, node)])
+        self.assertEqual(removed, [2])
+
+        # copies contain copied nodes, which are referenced by the copy only
+        self.assertEqual(list(copy.copy(index).items()), [(3, node)])
+        copied = copy.deepcopy(index)
+        gc.collect()
+        self.assertEqual(len(copied), 0)
+
+    def test_weak_reference_index(self):
+        class WeakReferenceMappingNode(ReferenceMappingNode):
+            weak_reference_index = True
+
+        root = WeakReferenceMappingNode()
+        self.assertTrue(isinstance(root._index, WeakReferenceIndex))
+        child = root['child'] = WeakReferenceMappingNode()
+        child['leaf'] = ReferenceMappingNode()
+        self.assertTrue(isinstance(child['leaf']._index, WeakReferenceIndex))
+        self.assertEqual(len(root._index), 3)
+        self.assertTrue(root.node(child['leaf'].uuid) is child['leaf'])
+
+        # nodes bypassing index maintenance get released
+        uuid_ = child.uuid
+        del root.storage['child']
+        del child
+        gc.collect()
+        self.assertEqual(len(root._index), 1)
+        self.assertTrue(root.node(uuid_) is None)
+
+        # colliding uuids are checked against weak index
+        leaf = ReferenceMappingNode()
+        leaf.uuid = root.uuid
+        with self.assertRaises(IndexViolationError):
+            root['leaf'] = leaf
+
+        # detached nodes get index of kind they define
+        root['child'] = ReferenceMappingNode()
+        root['child']['leaf'] = ReferenceMappingNode()
+        child = root.detach('child')
+        self.assertTrue(isinstance(child._index, dict))
+        self.assertEqual(len(child._index), 2)
+        self.assertEqual(len(root._index), 1)
+
+    def test_audit_reference_index(self):
+        root = ReferenceMappingNode()
+        root['a'] = ReferenceMappingNode()
+        root['a']['b'] = ReferenceMappingNode()
+        report = audit_reference_index(root['a'])
+        self.assertEqual(report, dict(
+            nodes=3,
+            entries=3,
+            stale=[],
+            missing=[],
+            unbound=[],
+            consistent=True
+        ))
+
+        # children removed from storage directly stay in index
+        node = root['a']['b']
+        del root['a'].storage['b']
+        report = audit_reference_index(root)
+        self.assertFalse(report['consistent'])
+        self.assertEqual(report['nodes'], 2)
+        self.assertEqual(report['entries'], 3)
+        self.assertEqual(report['stale'], [node.uuid])
+
+        # children added to storage directly are missing in index
+        other = ReferenceMappingNode()
+        root['a'].storage['c'] = other
+        other.__parent__ = root['a']
+        report = audit_reference_index(root)
+        self.assertEqual(report['missing'], [other.uuid])
+        self.assertEqual(report['unbound'], [other.uuid])
+
     def test_BC_imports(self):
         from node.behaviors import Reference
         self.assertTrue(Reference is MappingReference)
@@ -235,3 +235,67 @@ class TestSequence(NodeTestCase):
         ____<class 'node.base.BaseNode'>: 1
         ____<class 'node.base.BaseNode'>: 2
         """, root.treerepr(prefix='_'))
+
+    def test_SequenceNode_update_indices(self):
+        @plumbing(SequenceNodeBehavior, ListStorage)
+        class SequenceNode(object):
+            pass
+
+        renamed = []
+
+        class Child(BaseNode):
+            @property
+            def __name__(self):
+                return self._name
+
+            @__name__.setter
+            def __name__(self, name):
+                renamed.append(name)
+                self._name = name
+
+        def names(node):
+            return [child.name for child in node.storage]
+
+        node = SequenceNode()
+        children = [Child() for i in range(5)]
+        del renamed[:]
+        for child in children:
+            node.append(child)
+        self.assertEqual(names(node), ['0', '1', '2', '3', '4'])
+        # appending only names the appended child
+        self.assertEqual(renamed, ['0', '1', '2', '3', '4'])
+
+        # insert only renames children at and after insert position
+        child = Child()
+        del renamed[:]
+        node.insert(3, child)
+        self.assertEqual(renamed, ['3', '4', '5'])
+        self.assertEqual(names(node), ['0', '1', '2', '3', '4', '5'])
+
+        # insert with negative and out of range indices
+        node.insert(-1, Child())
+        self.assertEqual(names(node), ['0', '1', '2', '3', '4', '5', '6'])
+        node.insert(-100, Child())
+        self.assertEqual(names(node)[0], '0')
+        node.insert(100, Child())
+        self.assertEqual(names(node), [str(i) for i in range(9)])
+
+        # __delitem__ only renames children after deleted position
+        del renamed[:]
+        del node[6]
+        self.assertEqual(renamed, ['6', '7'])
+        del node[-2]
+        self.assertEqual(names(node), [str(i) for i in range(7)])
+
+        # __delitem__ with slices
+        del node[1:3]
+        self.assertEqual(names(node), ['0', '1', '2', '3', '4'])
+        del node[::-2]
+        self.assertEqual(names(node), ['0', '1'])
+        del node[5:]
+        self.assertEqual(names(node), ['0', '1'])
+
+        # detach
+        child = node.detach(0)
+        self.assertEqual(child.name, '0')
+        self.assertEqual(names(node), ['0'])
@@ -1,12 +1,47 @@
+from node.base import ArrayNode
+from node.base import BaseNode
+from node.behaviors import ArrayStorage
+from node.behaviors import ChunkedList
+from node.behaviors import ChunkedListStorage
+from node.behaviors import DefaultInit
 from node.behaviors import DictStorage
+from node.behaviors import HAMT
+from node.behaviors import IndexedOdict
+from node.behaviors import IndexedOdictStorage
 from node.behaviors import ListStorage
+from node.behaviors import MappingAdopt
+from node.behaviors import MappingNode
+from node.behaviors import MappingOrder
 from node.behaviors import MappingStorage
+from node.behaviors import MMapDict
+from node.behaviors import MMapStorage
 from node.behaviors import OdictStorage
+from node.behaviors import SequenceAdopt
+from node.behaviors import SequenceNode
+from node.behaviors import SequenceOrder
 from node.behaviors import SequenceStorage
+from node.behaviors import SortedDict
+from node.behaviors import SortedStorage
+from node.behaviors import SqliteDict
+from node.behaviors import SqliteStorage
+from node.interfaces import IArrayStorage
+from node.interfaces import IIndexedMappingStorage
 from node.interfaces import IMappingStorage
+from node.interfaces import IOrdered
+from node.interfaces import ISortedMappingStorage
 from node.tests import NodeTestCase
+from node.utils import UNSET
 from odict import odict
+from plumber import Behavior
+from plumber import plumb
 from plumber import plumbing
+import array
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import threading
 
 
 ###############################################################################
@@ -28,6 +63,26 @@ class OdictStorageObject(object):
     pass
 
 
+@plumbing(
+    MappingAdopt,
+    MappingOrder,
+    DefaultInit,
+    MappingNode,
+    MMapStorage)
+class MMapNode(object):
+    pass
+
+
+@plumbing(
+    MappingAdopt,
+    MappingOrder,
+    DefaultInit,
+    MappingNode,
+    SqliteStorage)
+class SqliteNode(object):
+    pass
+
+
 @plumbing(SequenceStorage)
 class SequenceStorageObject(object):
     pass
@@ -44,6 +99,14 @@ class ListStorageObject(object):
 
 class TestStorage(NodeTestCase):
 
+    def setUp(self):
+        super(TestStorage, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        super(TestStorage, self).tearDown()
+
     def test_MappingStorage(self):
         obj = MappingStorageObject()
         self.assertTrue(IMappingStorage.providedBy(obj))
@@ -77,6 +140,334 @@ class TestStorage(NodeTestCase):
         del obj['foo']
         self.assertEqual(obj.storage, odict())
 
+    def test_MMapDict(self):
+        path = os.path.join(self.tempdir, 'data')
+        data = MMapDict(path)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(len(data), 0)
+        self.assertEqual(list(data), [])
+
+        data['a'] = 1
+        data['b'] = {'x': [1, 2]}
+        data[3] = 'c'
+        self.assertEqual(data['a'], 1)
+        self.assertEqual(data['b'], {'x': [1, 2]})
+        self.assertEqual(data[3], 'c')
+        self.assertEqual(list(data), ['a', 'b', 3])
+        self.assertTrue('a' in data)
+        self.assertFalse('x' in data)
+        with self.assertRaises(KeyError):
+            data['x']
+
+        # overwriting keeps position
+        data['a'] = 'A'
+        self.assertEqual(
+            list(data.items()),
+            [('a', 'A'), ('b', {'x': [1, 2]}), (3, 'c')]
+        )
+
+        del data['b']
+        with self.assertRaises(KeyError):
+            del data['b']
+        self.assertEqual(list(data), ['a', 3])
+
+        # ordering
+        data['d'] = 'd'
+        self.assertEqual(data.first_key, 'a')
+        self.assertEqual(data.last_key, 'd')
+        self.assertEqual(data.next_key('a'), 3)
+        self.assertEqual(data.prev_key('d'), 3)
+        data.movefirst('d')
+        data.movelast('a')
+        self.assertEqual(list(data), ['d', 3, 'a'])
+        data.movebefore(3, 'a')
+        self.assertEqual(list(data), ['d', 'a', 3])
+        data.moveafter(3, 'd')
+        self.assertEqual(list(data), ['a', 3, 'd'])
+        data.swap('a', 'd')
+        self.assertEqual(list(data), ['d', 3, 'a'])
+        data.reorder(['a', 'd', 3])
+        self.assertEqual(list(data), ['a', 'd', 3])
+        with self.assertRaises(ValueError):
+            data.reorder(['a', 'd'])
+        data.movebefore_many('a', [3, 'd'])
+        self.assertEqual(list(data), [3, 'd', 'a'])
+        data.moveafter_many('a', [3, 'd'])
+        self.assertEqual(list(data), ['a', 3, 'd'])
+        data.reorder(['d', 3, 'a'])
+        data.close()
+
+        # reopen
+        data = MMapDict(path)
+        self.assertEqual(list(data), ['d', 3, 'a'])
+
+        # compact
+        size = os.path.getsize(path)
+        data.compact()
+        self.assertTrue(os.path.getsize(path) < size)
+        self.assertEqual(list(data), ['d', 3, 'a'])
+        data['e'] = 'e'
+        data.close()
+        data = MMapDict(path)
+        self.assertEqual(list(data), ['d', 3, 'a', 'e'])
+        data.close()
+
+        # incomplete record at end of file gets truncated
+        size = os.path.getsize(path)
+        with open(path, 'ab') as f:
+            f.write(b'\x01\x10\x00')
+        data = MMapDict(path)
+        self.assertEqual(list(data), ['d', 3, 'a', 'e'])
+        self.assertEqual(os.path.getsize(path), size)
+        data['f'] = 'f'
+        data.close()
+        data = MMapDict(path)
+        self.assertEqual(data['f'], 'f')
+        data.compact()
+        data.clear()
+        data.compact()
+        self.assertEqual(os.path.getsize(path), 0)
+        self.assertEqual(len(data), 0)
+        data.close()
+
+    def test_MMapStorage(self):
+        with self.assertRaises(ValueError) as arc:
+            MMapNode().storage
+        self.assertEqual(
+            str(arc.exception),
+            '``MMapStorage`` requires ``storage_path``'
+        )
+
+        path = os.path.join(self.tempdir, 'node')
+        node = MMapNode()
+        node.storage_path = path
+        self.assertTrue(IOrdered.providedBy(node))
+
+        child = BaseNode()
+        child['x'] = BaseNode()
+        node['a'] = child
+        node['b'] = 'value'
+        self.assertTrue(child.parent is node)
+
+        read = node['a']
+        self.assertFalse(read is child)
+        self.assertEqual(read.name, 'a')
+        self.assertTrue(read.parent is node)
+        self.assertTrue(read['x'].parent is read)
+        self.assertEqual(node['b'], 'value')
+
+        node.insertfirst(BaseNode(name='c'))
+        node.movelast('a')
+        self.assertEqual(node.keys(), ['c', 'b', 'a'])
+        del node['b']
+        node.storage.close()
+
+        node = MMapNode()
+        node.storage_path = path
+        self.assertEqual(node.keys(), ['c', 'a'])
+        self.assertEqual(node.treerepr(), (
+            '<class \'node.tests.test_storage.MMapNode\'>: None\n'
+            '  <class \'node.base.BaseNode\'>: c\n'
+            '  <class \'node.base.BaseNode\'>: a\n'
+            '    <class \'node.base.BaseNode\'>: x\n'
+        ))
+        node.storage.close()
+
+        # nested trees, children keep their children in own file
+        node = MMapNode()
+        node.storage_path = os.path.join(self.tempdir, 'root')
+        child = MMapNode()
+        child.storage_path = os.path.join(self.tempdir, 'child')
+        child['x'] = BaseNode()
+        node['child'] = child
+        node['child']['y'] = BaseNode()
+        self.assertEqual(node['child'].keys(), ['x', 'y'])
+        self.assertFalse(node['child'].storage is child.storage)
+        child.storage.close()
+        node.storage.close()
+
+        node = MMapNode()
+        node.storage_path = os.path.join(self.tempdir, 'root')
+        self.assertEqual(node.treerepr(), (
+            '<class \'node.tests.test_storage.MMapNode\'>: None\n'
+            '  <class \'node.tests.test_storage.MMapNode\'>: child\n'
+            '    <class \'node.base.BaseNode\'>: x\n'
+            '    <class \'node.base.BaseNode\'>: y\n'
+        ))
+        node.storage.close()
+
+    def test_SqliteDict(self):
+        path = os.path.join(self.tempdir, 'data.db')
+        with self.assertRaises(ValueError) as arc:
+            SqliteDict(path, table='data; DROP TABLE x')
+        self.assertEqual(
+            str(arc.exception),
+            'Invalid table name: data; DROP TABLE x'
+        )
+
+        data = SqliteDict(path)
+        self.assertEqual(data.table, 'storage')
+        self.assertEqual(len(data), 0)
+        self.assertEqual(list(data), [])
+        with self.assertRaises(KeyError) as arc:
+            data.first_key
+        self.assertEqual(
+            str(arc.exception),
+            '\'first_key(): ordered dictionary is empty\''
+        )
+        with self.assertRaises(KeyError):
+            data.last_key
+
+        data['a'] = 1
+        data['b'] = {'x': [1, 2]}
+        data[3] = 'c'
+        self.assertEqual(data['a'], 1)
+        self.assertEqual(data['b'], {'x': [1, 2]})
+        self.assertEqual(data[3], 'c')
+        self.assertEqual(list(data), ['a', 'b', 3])
+        self.assertEqual(len(data), 3)
+        self.assertTrue('a' in data)
+        self.assertFalse('x' in data)
+        with self.assertRaises(KeyError):
+            data['x']
+
+        # overwriting keeps position
+        data['a'] = 'A'
+        self.assertEqual(
+            data.items(),
+            [('a', 'A'), ('b', {'x': [1, 2]}), (3, 'c')]
+        )
+        self.assertEqual(data.values(), ['A', {'x': [1, 2]}, 'c'])
+
+        del data['b']
+        with self.assertRaises(KeyError):
+            del data['b']
+        self.assertEqual(list(data), ['a', 3])
+
+        # ordering
+        data['d'] = 'd'
+        self.assertEqual(data.first_key, 'a')
+        self.assertEqual(data.last_key, 'd')
+        self.assertEqual(data.next_key('a'), 3)
+        self.assertEqual(data.prev_key('d'), 3)
+        with self.assertRaises(KeyError):
+            data.next_key('d')
+        with self.assertRaises(KeyError):
+            data.prev_key('a')
+        with self.assertRaises(KeyError):
+            data.next_key('x')
+        data.movefirst('d')
+        data.movelast('a')
+        self.assertEqual(list(data), ['d', 3, 'a'])
+        data.movebefore(3, 'a')
+        self.assertEqual(list(data), ['d', 'a', 3])
+        data.moveafter(3, 'd')
+        self.assertEqual(list(data), ['a', 3, 'd'])
+        data.moveafter('a', 'd')
+        self.assertEqual(list(data), ['a', 'd', 3])
+        data.swap('a', 3)
+        self.assertEqual(list(data), [3, 'd', 'a'])
+        data.reorder(['a', 3, 'd'])
+        self.assertEqual(list(data), ['a', 3, 'd'])
+        self.assertEqual(data.next_key(3), 'd')
+        with self.assertRaises(ValueError):
+            data.reorder(['a', 3, 'x'])
+        self.assertEqual(list(data), ['a', 3, 'd'])
+        data.movebefore_many('a', [3, 'd'])
+        self.assertEqual(list(data), [3, 'd', 'a'])
+        data.moveafter_many(3, ['a'])
+        self.assertEqual(list(data), [3, 'a', 'd'])
+        with self.assertRaises(ValueError):
+            data.moveafter_many(3, [3])
+        with self.assertRaises(KeyError):
+            data.moveafter_many(3, ['x'])
+        data.reorder([3, 'd', 'a'])
+        with self.assertRaises(KeyError):
+            data.movebefore('x', 'a')
+        with self.assertRaises(KeyError):
+            data.movefirst('x')
+        self.assertEqual(list(data), [3, 'd', 'a'])
+
+        # transactions
+        with data.transaction():
+            data['e'] = 'e'
+            with data.transaction():
+                data['f'] = 'f'
+        self.assertEqual(list(data), [3, 'd', 'a', 'e', 'f'])
+        with self.assertRaises(RuntimeError):
+            with data.transaction():
+                data['g'] = 'g'
+                del data['e']
+                raise RuntimeError()
+        self.assertEqual(list(data), [3, 'd', 'a', 'e', 'f'])
+        data.update([('g', 'g')], h='h')
+        self.assertEqual(list(data), [3, 'd', 'a', 'e', 'f', 'g', 'h'])
+
+        # separate connection per thread
+        connections = []
+
+        def read():
+            connections.append(data.connection)
+            self.assertEqual(data['a'], 'A')
+            data.close()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        self.assertFalse(connections[0] is data.connection)
+        data.close()
+
+        # reopen
+        data = SqliteDict(path)
+        self.assertEqual(list(data), [3, 'd', 'a', 'e', 'f', 'g', 'h'])
+        data.clear()
+        self.assertEqual(len(data), 0)
+        data.close()
+
+    def test_SqliteStorage(self):
+        with self.assertRaises(ValueError) as arc:
+            SqliteNode().storage
+        self.assertEqual(
+            str(arc.exception),
+            '``SqliteStorage`` requires ``storage_path``'
+        )
+
+        path = os.path.join(self.tempdir, 'node.db')
+        node = SqliteNode()
+        node.storage_path = path
+        self.assertTrue(IOrdered.providedBy(node))
+        self.assertEqual(node.storage.table, 'children')
+
+        child = BaseNode()
+        child['x'] = BaseNode()
+        node['a'] = child
+        node['b'] = 'value'
+        self.assertTrue(child.parent is node)
+
+        read = node['a']
+        self.assertFalse(read is child)
+        self.assertEqual(read.name, 'a')
+        self.assertTrue(read.parent is node)
+        self.assertTrue(read['x'].parent is read)
+
+        node.insertfirst(BaseNode(name='c'))
+        node.insertbefore(BaseNode(name='d'), 'b')
+        node.movelast('a')
+        self.assertEqual(node.keys(), ['c', 'd', 'b', 'a'])
+        del node['b']
+        node.storage.close()
+
+        node = SqliteNode()
+        node.storage_path = path
+        self.assertEqual(node.treerepr(), (
+            '<class \'node.tests.test_storage.SqliteNode\'>: None\n'
+            '  <class \'node.base.BaseNode\'>: c\n'
+            '  <class \'node.base.BaseNode\'>: d\n'
+            '  <class \'node.base.BaseNode\'>: a\n'
+            '    <class \'node.base.BaseNode\'>: x\n'
+        ))
+        node.storage.close()
+
     def test_SequenceStorage(self):
         obj = SequenceStorageObject()
 
@@ -111,6 +502,544 @@ class TestStorage(NodeTestCase):
         with self.assertRaises(IndexError):
             del lseq[0]
 
+        # extend passes ``insert`` unless ``batch_extend`` is set
+        class InsertHook(Behavior):
+            @plumb
+            def insert(next_, self, index, value):
+                self.inserted.append(value)
+                next_(self, index, value)
+
+        @plumbing(InsertHook, ListStorage)
+        class HookedListStorageObject(object):
+            def __init__(self):
+                self.inserted = []
+
+        lseq = HookedListStorageObject()
+        lseq.extend([1, 2])
+        self.assertEqual(lseq.storage, [1, 2])
+        self.assertEqual(lseq.inserted, [1, 2])
+
+        lseq = HookedListStorageObject()
+        lseq.batch_extend = True
+        lseq.extend([1, 2])
+        self.assertEqual(lseq.storage, [1, 2])
+        self.assertEqual(lseq.inserted, [])
+
+    def test_ChunkedList(self):
+        with self.assertRaises(ValueError):
+            ChunkedList(chunksize=0)
+
+        chunked = ChunkedList(range(10), chunksize=4)
+        self.assertEqual(len(chunked), 10)
+        self.assertEqual(chunked._chunks, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual(chunked[5], 5)
+        self.assertEqual(chunked[-1], 9)
+        self.assertEqual(chunked[3:6], [3, 4, 5])
+        self.assertEqual(chunked[::3], [0, 3, 6, 9])
+        self.assertEqual(list(reversed(chunked)), list(range(9, -1, -1)))
+        with self.assertRaises(IndexError):
+            chunked[10]
+        with self.assertRaises(IndexError):
+            chunked[-11]
+
+        # chunks get split if exceeding twice the chunk size
+        chunked.insert_many(1, ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(chunked._chunks, [
+            [0, 'a', 'b', 'c'], ['d', 'e', 1, 2], [3],
+            [4, 5, 6, 7], [8, 9]
+        ])
+
+        # chunks get merged with successor if shrinking below half size
+        del chunked[1:6]
+        chunked = ChunkedList(range(6), chunksize=4)
+        del chunked[0]
+        del chunked[0]
+        self.assertEqual(chunked._chunks, [[2, 3], [4, 5]])
+        del chunked[0]
+        self.assertEqual(chunked._chunks, [[3, 4, 5]])
+
+        # misc list API
+        chunked = ChunkedList([1, 2, 3])
+        chunked.extend(chunked)
+        self.assertEqual(chunked, [1, 2, 3, 1, 2, 3])
+        self.assertNotEqual(chunked, [1, 2, 3])
+        self.assertFalse(chunked == (1, 2, 3, 1, 2, 3))
+        self.assertEqual(chunked.index(3), 2)
+        self.assertEqual(chunked.index(3, 3), 5)
+        with self.assertRaises(ValueError):
+            chunked.index(4)
+        self.assertEqual(chunked.count(1), 2)
+        self.assertTrue(2 in chunked)
+        self.assertEqual(repr(chunked), 'ChunkedList([1, 2, 3, 1, 2, 3])')
+        self.assertEqual(pickle.loads(pickle.dumps(chunked)), chunked)
+        chunked[::2] = ['a', 'b', 'c']
+        self.assertEqual(chunked, ['a', 2, 'b', 1, 'c', 3])
+        chunked.clear()
+        self.assertEqual(len(chunked), 0)
+
+        # behaves like list on random operations
+        rand = random.Random(0)
+        for chunksize in (1, 2, 3, 8):
+            expected = []
+            chunked = ChunkedList(chunksize=chunksize)
+            for _ in range(500):
+                op = rand.randrange(6)
+                index = rand.randint(-len(expected) - 2, len(expected) + 2)
+                if op == 0:
+                    expected.insert(index, index)
+                    chunked.insert(index, index)
+                elif op == 1 and expected:
+                    index = rand.randrange(len(expected))
+                    del expected[index]
+                    del chunked[index]
+                elif op == 2:
+                    values = list(range(rand.randrange(8)))
+                    expected[index:index] = values
+                    chunked[index:index] = values
+                elif op == 3 and expected:
+                    index = rand.randrange(len(expected))
+                    expected[index] = 'x'
+                    chunked[index] = 'x'
+                elif op == 4:
+                    expected.append(index)
+                    chunked.append(index)
+                else:
+                    start = rand.randint(-2, len(expected) + 2)
+                    stop = rand.randint(-2, len(expected) + 2)
+                    self.assertEqual(
+                        chunked[start:stop],
+                        expected[start:stop]
+                    )
+                self.assertEqual(len(chunked), len(expected))
+                self.assertEqual(list(chunked), expected)
+                if expected:
+                    index = rand.randrange(len(expected))
+                    self.assertEqual(chunked[index], expected[index])
+
+    def test_ChunkedListStorage(self):
+        @plumbing(
+            SequenceAdopt,
+            SequenceOrder,
+            DefaultInit,
+            SequenceNode,
+            ChunkedListStorage)
+        class ChunkedListNode(object):
+            pass
+
+        node = ChunkedListNode()
+        self.assertIsInstance(node.storage, ChunkedList)
+        children = [BaseNode() for _ in range(5)]
+        node.extend(children[:3])
+        node.insert(0, children[3])
+        node.append(children[4])
+        self.assertEqual(list(node), [
+            children[3], children[0], children[1], children[2], children[4]
+        ])
+        self.assertEqual(
+            [child.name for child in node],
+            ['0', '1', '2', '3', '4']
+        )
+
+        node.movebefore(children[4], children[0])
+        node.moveafter(children[3], children[2])
+        node.swap(children[0], children[1])
+        self.assertEqual(list(node), [
+            children[4], children[1], children[0], children[2], children[3]
+        ])
+        self.assertEqual(
+            [child.name for child in node],
+            ['0', '1', '2', '3', '4']
+        )
+
+        del node[1]
+        self.assertEqual(list(node), [
+            children[4], children[0], children[2], children[3]
+        ])
+        self.assertEqual([child.name for child in node], ['0', '1', '2', '3'])
+
+    def test_IndexedOdict(self):
+        data = IndexedOdict([('a', 1), ('b', 2)], chunksize=2)
+        data['c'] = 3
+        data['a'] = 0
+        self.assertEqual(list(data), ['a', 'b', 'c'])
+        self.assertEqual(list(reversed(data)), ['c', 'b', 'a'])
+        self.assertEqual(len(data), 3)
+        self.assertTrue('a' in data)
+        self.assertEqual(data['a'], 0)
+        self.assertEqual(
+            repr(data),
+            "IndexedOdict([('a', 0), ('b', 2), ('c', 3)])"
+        )
+
+        # positional access
+        self.assertEqual(data.key_at(1), 'b')
+        self.assertEqual(data.key_at(-1), 'c')
+        with self.assertRaises(IndexError):
+            data.key_at(3)
+        self.assertEqual(data.position('c'), 2)
+        with self.assertRaises(KeyError):
+            data.position('x')
+        self.assertEqual(data.slice_keys(1), ['b', 'c'])
+        self.assertEqual(data.slice_keys(0, 2), ['a', 'b'])
+
+        # odict ordering API
+        self.assertEqual(data.first_key, 'a')
+        self.assertEqual(data.last_key, 'c')
+        self.assertEqual(data.next_key('a'), 'b')
+        self.assertEqual(data.prev_key('b'), 'a')
+        with self.assertRaises(KeyError):
+            data.next_key('c')
+        with self.assertRaises(KeyError):
+            data.prev_key('a')
+        data.swap('a', 'c')
+        self.assertEqual(list(data), ['c', 'b', 'a'])
+        data.movebefore('c', 'a')
+        self.assertEqual(list(data), ['a', 'c', 'b'])
+        data.moveafter('b', 'c')
+        self.assertEqual(list(data), ['a', 'b', 'c'])
+        data.movefirst('c')
+        self.assertEqual(list(data), ['c', 'a', 'b'])
+        data.movelast('c')
+        self.assertEqual(list(data), ['a', 'b', 'c'])
+        data.reorder(['c', 'a', 'b'])
+        self.assertEqual(data.position('b'), 2)
+        data.movebefore_many('c', ['a', 'b'])
+        self.assertEqual(list(data), ['a', 'b', 'c'])
+        data.moveafter_many('c', ['a', 'b'])
+        self.assertEqual(list(data), ['c', 'a', 'b'])
+        with self.assertRaises(ValueError):
+            data.moveafter_many('c', ['c'])
+        with self.assertRaises(KeyError):
+            data.moveafter_many('c', ['x'])
+        with self.assertRaises(ValueError):
+            data.reorder(['a', 'b'])
+        data.reorder(['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            data.movebefore('a', 'a')
+        with self.assertRaises(KeyError):
+            data.movebefore('x', 'a')
+
+        del data['b']
+        self.assertEqual(list(data), ['a', 'c'])
+        self.assertEqual(data.position('c'), 1)
+        with self.assertRaises(KeyError):
+            del data['b']
+        data.clear()
+        self.assertEqual(len(data), 0)
+        with self.assertRaises(KeyError):
+            data.first_key
+        with self.assertRaises(KeyError):
+            data.last_key
+
+        # behaves like odict on random operations
+        rand = random.Random(0)
+        expected = odict()
+        data = IndexedOdict(chunksize=2)
+        for step in range(300):
+            keys = list(expected)
+            op = rand.randrange(5)
+            if op == 0 or len(keys) < 2:
+                key = rand.randrange(50)
+                expected[key] = data[key] = step
+            elif op == 1:
+                key = rand.choice(keys)
+                del expected[key]
+                del data[key]
+            elif op == 2:
+                key_a, key_b = rand.sample(keys, 2)
+                expected.swap(key_a, key_b)
+                data.swap(key_a, key_b)
+            elif op == 3:
+                key_a, key_b = rand.sample(keys, 2)
+                expected.movebefore(key_a, key_b)
+                data.movebefore(key_a, key_b)
+            else:
+                key_a, key_b = rand.sample(keys, 2)
+                expected.moveafter(key_a, key_b)
+                data.moveafter(key_a, key_b)
+            self.assertEqual(list(data.items()), list(expected.items()))
+            for position, key in enumerate(expected):
+                self.assertEqual(data.position(key), position)
+                self.assertEqual(data.key_at(position), key)
+
+    def test_IndexedOdictStorage(self):
+        @plumbing(
+            MappingAdopt,
+            MappingOrder,
+            DefaultInit,
+            MappingNode,
+            IndexedOdictStorage)
+        class IndexedNode(object):
+            pass
+
+        node = IndexedNode()
+        self.assertTrue(IIndexedMappingStorage.providedBy(node))
+        self.assertTrue(IOrdered.providedBy(node))
+        for i in range(5):
+            node[str(i)] = BaseNode()
+        self.assertEqual(node.key_at(3), '3')
+        self.assertEqual(node.position('2'), 2)
+        self.assertEqual(node.position(node['4']), 4)
+        self.assertEqual(node.slice_keys(1, 3), ['1', '2'])
+
+        node.movefirst('4')
+        node.swap('0', '1')
+        self.assertEqual(node.slice_keys(), ['4', '1', '0', '2', '3'])
+        self.assertEqual(node.position('0'), 2)
+        self.assertEqual(node.next_key('0'), '2')
+        del node['4']
+        self.assertEqual(node.key_at(0), '1')
+
+    def test_SortedDict(self):
+        data = SortedDict([('c', 3), ('a', 1), ('b', 2)], chunksize=2)
+        self.assertEqual(list(data), ['a', 'b', 'c'])
+        self.assertEqual(list(reversed(data)), ['c', 'b', 'a'])
+        self.assertEqual(repr(data), "SortedDict([('a', 1), ('b', 2), ('c', 3)])")
+        data['b'] = 4
+        self.assertEqual(data['b'], 4)
+        self.assertEqual(len(data), 3)
+
+        # positional access
+        self.assertEqual(data.key_at(-1), 'c')
+        self.assertEqual(data.position('b'), 1)
+        with self.assertRaises(KeyError):
+            data.position('x')
+        self.assertEqual(data.slice_keys(1), ['b', 'c'])
+
+        # bisect and ranges
+        self.assertEqual(data.bisect_left('b'), 1)
+        self.assertEqual(data.bisect_right('b'), 2)
+        self.assertEqual(list(data.irange('a', 'b')), ['a', 'b'])
+        self.assertEqual(list(data.irange('a', 'b', (False, True))), ['b'])
+        self.assertEqual(list(data.irange('a', 'c', (True, False))), ['a', 'b'])
+        self.assertEqual(list(data.irange(maximum='b', reverse=True)), ['b', 'a'])
+        self.assertEqual(list(data.irange('d')), [])
+
+        # prefix scans
+        data.update([('ab', 5), ('abc', 6), ('b1', 7)])
+        self.assertEqual(list(data.prefix_keys('ab')), ['ab', 'abc'])
+        self.assertEqual(list(data.prefix_keys('b')), ['b', 'b1'])
+        self.assertEqual(list(data.prefix_keys('x')), [])
+
+        del data['ab']
+        self.assertEqual(list(data), ['a', 'abc', 'b', 'b1', 'c'])
+        data.clear()
+        self.assertEqual(list(data), [])
+
+        # sort key, ties are ordered by key
+        data = SortedDict(sort_key=lambda key: key % 3, chunksize=2)
+        for i in range(7):
+            data[i] = i
+        self.assertEqual(list(data), [0, 3, 6, 1, 4, 2, 5])
+        self.assertEqual(list(data.irange(1, 2)), [1, 4, 2, 5])
+        self.assertEqual(list(data.irange(0, 1, (False, True), True)), [4, 1])
+        self.assertEqual(data.bisect_right(1), 5)
+        self.assertEqual(data.position(4), 4)
+        del data[3]
+        self.assertEqual(list(data), [0, 6, 1, 4, 2, 5])
+
+        # compare against sorted keys
+        rand = random.Random(17)
+        data = SortedDict(chunksize=4)
+        keys = set()
+        for _ in range(500):
+            key = rand.randrange(100)
+            if key in keys:
+                del data[key]
+                keys.remove(key)
+            else:
+                data[key] = key
+                keys.add(key)
+        expected = sorted(keys)
+        self.assertEqual(list(data), expected)
+        self.assertEqual(
+            list(data.irange(20, 60)),
+            [key for key in expected if 20 <= key <= 60]
+        )
+
+    def test_SortedStorage(self):
+        @plumbing(
+            MappingAdopt,
+            DefaultInit,
+            MappingNode,
+            SortedStorage)
+        class SortedNode(object):
+            pass
+
+        node = SortedNode()
+        self.assertTrue(ISortedMappingStorage.providedBy(node))
+        self.assertTrue(IOrdered.providedBy(node))
+        for key in ['2024-03-01', '2023-12-24', '2024-01-15', '2024-03-02']:
+            node[key] = BaseNode()
+        self.assertEqual(node.key_at(0), '2023-12-24')
+        self.assertEqual(node.position(node['2024-03-01']), 2)
+        self.assertEqual(node.slice_keys(-1), ['2024-03-02'])
+        self.assertEqual(
+            list(node.irange('2024-01-01', '2024-03-01')),
+            ['2024-01-15', '2024-03-01']
+        )
+        self.assertEqual(list(node.prefix_keys('2024-03')), [
+            '2024-03-01', '2024-03-02'
+        ])
+        self.assertEqual(node.bisect_left('2024'), 1)
+        self.assertEqual(node.bisect_right('2024-01-15'), 2)
+        self.assertEqual(list(node.irange(reverse=True))[0], '2024-03-02')
+
+        class ByLength(SortedNode):
+            def storage_sort_key(self, key):
+                return len(key)
+
+        node = ByLength()
+        for key in ['ccc', 'a', 'bb', 'aa']:
+            node[key] = BaseNode()
+        self.assertEqual(list(node), ['a', 'aa', 'bb', 'ccc'])
+        self.assertEqual(list(node.irange(2, 2)), ['aa', 'bb'])
+
+    def test_HAMT(self):
+        data = HAMT({'a': 1})
+        self.assertEqual(repr(data), "HAMT({'a': 1})")
+        self.assertEqual(HAMT(), {})
+
+        # set and delete return new mappings
+        other = data.set('b', 2)
+        self.assertEqual(data, {'a': 1})
+        self.assertEqual(other, {'a': 1, 'b': 2})
+        self.assertEqual(len(other), 2)
+        self.assertTrue(other.set('b', 2) is other)
+        self.assertEqual(other.set('b', 3)['b'], 3)
+        self.assertEqual(other.delete('a'), {'b': 2})
+        self.assertEqual(other.delete('a').delete('b'), {})
+        with self.assertRaises(KeyError):
+            other.delete('c')
+        with self.assertRaises(KeyError):
+            HAMT().delete('c')
+        with self.assertRaises(KeyError):
+            HAMT()['c']
+
+        # diff
+        self.assertEqual(sorted(other.set('b', 3).set('c', 4).diff(data)), [
+            ('b', 3, UNSET),
+            ('c', 4, UNSET)
+        ])
+        self.assertEqual(list(data.diff(data.delete('a'))), [('a', 1, UNSET)])
+
+        # setting identical value in sub trie returns same map
+        data = HAMT([(i, i) for i in range(100)])
+        for i in range(100):
+            self.assertTrue(data.set(i, i) is data)
+
+        # keys with colliding hashes
+        class Key(object):
+            def __init__(self, value):
+                self.value = value
+
+            def __hash__(self):
+                return self.value % 3
+
+            def __eq__(self, other):
+                return self.value == other.value
+
+        # compare against dict
+        rand = random.Random(3)
+        for factory in (int, Key):
+            data = HAMT()
+            expected = dict()
+            versions = []
+            for i in range(1000):
+                key = factory(rand.randrange(200))
+                if key in expected:
+                    data = data.delete(key)
+                    del expected[key]
+                else:
+                    data = data.set(key, i)
+                    expected[key] = i
+                if i % 100 == 0:
+                    versions.append((data, dict(expected)))
+            self.assertEqual(dict(data.items()), expected)
+            for (data_a, expected_a), (data_b, expected_b) in zip(
+                versions, versions[1:]
+            ):
+                self.assertEqual(dict(data_a.items()), expected_a)
+                self.assertEqual(
+                    set([key for key, _, _ in data_a.diff(data_b)]),
+                    set(expected_a).symmetric_difference(expected_b).union([
+                        key for key in expected_a
+                        if key in expected_b
+                        and expected_a[key] != expected_b[key]
+                    ])
+                )
+
+    def test_ArrayStorage(self):
+        node = ArrayNode()
+        self.assertTrue(IArrayStorage.providedBy(node))
+        self.assertEqual(node.storage, array.array('d'))
+
+        # append, extend, insert
+        node.append(1)
+        node.extend([2, 3])
+        node.insert(0, 0)
+        self.assertEqual(node.storage, array.array('d', [0., 1., 2., 3.]))
+        with self.assertRaises(TypeError):
+            node.append('a')
+
+        # extend from other array nodes or arrays with different typecode
+        other = ArrayNode()
+        other.extend([4.])
+        node.extend(other)
+        node.extend(array.array('i', [5]))
+        self.assertEqual(list(node), [0., 1., 2., 3., 4., 5.])
+
+        # __getitem__, __setitem__, __delitem__
+        self.assertEqual(node[1], 1.)
+        self.assertEqual(node[1:3], array.array('d', [1., 2.]))
+        node[0] = 6
+        del node[1]
+        self.assertEqual(list(node), [6., 2., 3., 4., 5.])
+
+        # sum
+        self.assertEqual(node.sum(), 20.)
+
+        # equals
+        self.assertTrue(node.equals([6, 2, 3, 4, 5]))
+        self.assertTrue(node.equals(array.array('i', [6, 2, 3, 4, 5])))
+        self.assertFalse(node.equals([6, 2, 3]))
+        self.assertFalse(node.equals(['a']))
+        other = ArrayNode()
+        other.extend(node)
+        self.assertTrue(node.equals(other))
+
+        # extend_from_buffer
+        node.clear()
+        self.assertEqual(len(node), 0)
+        node.extend_from_buffer(array.array('d', [1., 2.]))
+        node.extend_from_buffer(array.array('d', [3.]).tobytes())
+        self.assertEqual(list(node), [1., 2., 3.])
+        with self.assertRaises(ValueError) as arc:
+            node.extend_from_buffer(array.array('i', [1]))
+        self.assertEqual(
+            str(arc.exception),
+            'Buffer format ``i`` does not match typecode ``d``'
+        )
+
+        # buffer
+        view = node.buffer
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(view.tolist(), [1., 2., 3.])
+        with self.assertRaises(BufferError):
+            node.append(4.)
+        view.release()
+        node.append(4.)
+
+        # custom typecode
+        @plumbing(SequenceNode, ArrayStorage)
+        class IntArrayNode(object):
+            storage_typecode = 'q'
+
+        node = IntArrayNode()
+        node.extend(range(3))
+        self.assertEqual(node.storage, array.array('q', [0, 1, 2]))
+        self.assertEqual(node.buffer.itemsize, 8)
+
     def test_BC_imports(self):
         from node.behaviors import Storage
         self.assertTrue(Storage is MappingStorage)
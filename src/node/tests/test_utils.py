@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from node.base import BaseNode
+from node.base import OrderedNode
 from node.tests import NodeTestCase
 from node.utils import AttributeAccess
 from node.utils import debug
@@ -8,6 +9,7 @@ from node.utils import encode
 from node.utils import instance_property
 from node.utils import logger
 from node.utils import node_by_path
+from node.utils import ReadOnlyView
 from node.utils import ReverseMapping
 from node.utils import safe_decode
 from node.utils import safe_encode
@@ -82,6 +84,104 @@ class TestUtils(NodeTestCase):
             ['foo', 'baz', 'x']
         )
 
+    def test_ReadOnlyView(self):
+        class ValueNode(OrderedNode):
+            child_constraints = None
+
+        root = ValueNode(name='root')
+        child = root['child'] = ValueNode()
+        child['sub'] = ValueNode()
+        child['value'] = 1
+
+        view = ReadOnlyView(child)
+        self.assertEqual(repr(view), '<ReadOnlyView of {!r}>'.format(child))
+        self.assertTrue(view)
+        self.assertEqual(view.name, 'child')
+        self.assertEqual(view.path, ['root', 'child'])
+        self.assertEqual(view.keys(), ['sub', 'value'])
+        self.assertEqual(list(view), ['sub', 'value'])
+        self.assertEqual(len(view), 2)
+        self.assertTrue('sub' in view)
+        self.assertEqual(view['value'], 1)
+        self.assertEqual(view.get('missing', 2), 2)
+        self.assertEqual(list(view.iterkeys()), ['sub', 'value'])
+
+        # child nodes are wrapped
+        sub = view['sub']
+        self.assertTrue(isinstance(sub, ReadOnlyView))
+        self.assertTrue(sub.parent is view)
+        self.assertEqual(sub.path, ['root', 'child', 'sub'])
+        self.assertTrue(isinstance(view.parent, ReadOnlyView))
+        self.assertEqual(view.root.name, 'root')
+        self.assertTrue(isinstance(view.values()[0], ReadOnlyView))
+        self.assertTrue(isinstance(view.items()[0][1], ReadOnlyView))
+        self.assertTrue(isinstance(list(view.itervalues())[0], ReadOnlyView))
+        self.assertTrue(isinstance(list(view.iteritems())[0][1], ReadOnlyView))
+
+        # nodes returned by methods are wrapped
+        self.assertTrue(isinstance(view.acquire(ValueNode), ReadOnlyView))
+        self.assertEqual(view.treerepr().split('\n')[0].split(': ')[1], 'child')
+
+        # changes on node are visible
+        child['other'] = ValueNode()
+        self.assertEqual(view.keys(), ['sub', 'value', 'other'])
+
+        # write access raises
+        with self.assertRaises(TypeError) as arc:
+            view['x'] = 1
+        self.assertEqual(
+            str(arc.exception),
+            'Read only view does not support item assignment'
+        )
+        with self.assertRaises(TypeError) as arc:
+            del view['sub']
+        self.assertEqual(
+            str(arc.exception),
+            'Read only view does not support item deletion'
+        )
+        with self.assertRaises(TypeError) as arc:
+            view.__name__ = 'x'
+        self.assertEqual(
+            str(arc.exception),
+            'Read only view does not support attribute assignment'
+        )
+        with self.assertRaises(TypeError) as arc:
+            del view.__name__
+        self.assertEqual(
+            str(arc.exception),
+            'Read only view does not support attribute deletion'
+        )
+        with self.assertRaises(TypeError) as arc:
+            view.clear()
+        self.assertEqual(
+            str(arc.exception),
+            'Read only view does not support ``clear``'
+        )
+        self.assertEqual(child.keys(), ['sub', 'value', 'other'])
+
+        # only allowed attributes and methods are accessible, others may
+        # return mutable containers or change the node
+        for name in [
+            'storage',
+            'nodespaces',
+            'cache',
+            'index',
+            'invalidate',
+            'prefetch',
+            'warm',
+            'reindex',
+            'index_by',
+            'copy',
+        ]:
+            with self.assertRaises(TypeError) as arc:
+                getattr(view, name)
+            self.assertEqual(
+                str(arc.exception),
+                'Read only view does not support ``{}``'.format(name)
+            )
+        with self.assertRaises(AttributeError):
+            view.__deepcopy__
+
     def test_encode(self):
         self.assertEqual(
             encode(
@@ -4,6 +4,7 @@ from node.compat import STR_TYPE
 from node.compat import UNICODE_TYPE
 from node.interfaces import IAttributeAccess
 from node.interfaces import INode
+from node.interfaces import IPathIndex
 from zope.interface import implementer
 from zope.interface.common.mapping import IEnumerableMapping
 import logging
@@ -147,6 +148,151 @@ class AttributeAccess(object):
         del context[name]
 
 
+# attributes and methods of nodes accessible through read only views. Others
+# may return mutable containers of the node, e.g. ``storage``, or change the
+# node, e.g. ``invalidate``.
+READONLY_ALLOWED = set([
+    '__name__',
+    '__parent__',
+    'acquire',
+    'attributes',
+    'attrs',
+    'bisect_left',
+    'bisect_right',
+    'deepcopy',
+    'diff',
+    'first_key',
+    'freeze',
+    'has_key',
+    'irange',
+    'key_at',
+    'last_key',
+    'name',
+    'next_key',
+    'node',
+    'node_by_path',
+    'noderepr',
+    'path',
+    'path_tuple',
+    'position',
+    'prefix_keys',
+    'prev_key',
+    'printtree',
+    'readonly_view',
+    'slice_keys',
+    'treerepr',
+    'uuid',
+])
+
+
+@implementer(IEnumerableMapping)
+class ReadOnlyView(object):
+    """Read only proxy of a node.
+
+    Child nodes and nodes returned by attributes and methods of the proxied
+    node are wrapped in read only views as well. Only attributes and methods
+    listed in ``READONLY_ALLOWED`` are accessible, write access raises
+    ``TypeError``. The proxied node is not copied, thus changes on it are
+    visible through the view.
+    """
+    __slots__ = ('_context', '_parent')
+
+    def __init__(self, context, parent=None):
+        object.__setattr__(self, '_context', context)
+        object.__setattr__(self, '_parent', parent)
+
+    def _wrap(self, value, parent=None):
+        if INode.providedBy(value):
+            return ReadOnlyView(value, parent)
+        return value
+
+    def __getattr__(self, name):
+        if name not in READONLY_ALLOWED:
+            if name.startswith('__'):
+                # protocol lookups like ``__deepcopy__`` expect AttributeError
+                raise AttributeError(name)
+            raise TypeError('Read only view does not support ``{}``'.format(
+                name
+            ))
+        value = getattr(object.__getattribute__(self, '_context'), name)
+        if callable(value) and not INode.providedBy(value):
+            def wrapper(*args, **kw):
+                return self._wrap(value(*args, **kw))
+            return wrapper
+        return self._wrap(value)
+
+    def __setattr__(self, name, value):
+        raise TypeError('Read only view does not support attribute assignment')
+
+    def __delattr__(self, name):
+        raise TypeError('Read only view does not support attribute deletion')
+
+    def __getitem__(self, key):
+        return self._wrap(self._context[key], self)
+
+    def __setitem__(self, key, value):
+        raise TypeError('Read only view does not support item assignment')
+
+    def __delitem__(self, key):
+        raise TypeError('Read only view does not support item deletion')
+
+    def __contains__(self, key):
+        return key in self._context
+
+    def __iter__(self):
+        return iter(self._context)
+
+    def __len__(self):
+        return len(self._context)
+
+    def __nonzero__(self):
+        return True
+
+    __bool__ = __nonzero__
+
+    def __repr__(self):
+        return '<ReadOnlyView of {!r}>'.format(self._context)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._context.keys())
+
+    def values(self):
+        return [self[key] for key in self._context]
+
+    def items(self):
+        return [(key, self[key]) for key in self._context]
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        for key in self._context:
+            yield self[key]
+
+    def iteritems(self):
+        for key in self._context:
+            yield key, self[key]
+
+    @property
+    def parent(self):
+        parent = self._parent
+        if parent is None:
+            parent = self._wrap(self._context.parent)
+        return parent
+
+    @property
+    def root(self):
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root
+
+
 CHARACTER_ENCODING = 'utf-8'
 
 
@@ -258,12 +404,20 @@ def instance_property(func):
 
 
 def node_by_path(root, path):
-    """Return node by path from root."""
+    """Return node by path from root.
+
+    If root provides ``IPathIndex``, the node is looked up in the path index
+    first.
+    """
     if isinstance(path, STR_TYPE):
         path = path.strip('/')
         path = path.split('/') if path else []
     if not path:
         return root
+    if IPathIndex.providedBy(root):
+        node = root.node_by_path(path)
+        if node is not None:
+            return node
     node = root
     for name in path:
         node = node[name]